@@ -1,92 +1,146 @@
 """
 API client for Fountain Pen Companion with pagination support
 """
+import sys
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
 
+# Maximum number of pages fetched at once by fetch_all_collected_inks
+MAX_PAGE_WORKERS = 8
 
-def fetch_all_collected_inks(api_token: str, base_url: str = "https://www.fountainpencompanion.com/api/v1/collected_inks") -> List[Dict]:
+# Shared session so repeated calls (and concurrent page fetches) reuse pooled
+# keep-alive connections instead of paying a TCP + TLS handshake per request
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_PAGE_WORKERS))
+
+
+def _retry_after_seconds(response, attempt: int) -> float:
+    """Seconds to wait after a 429: the Retry-After header if numeric, else 1s, 2s, 4s..."""
+    retry_after = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return 2 ** attempt
+
+
+def _fetch_collected_inks_page(api_token: str, base_url: str, page_number: int, page_size: int) -> Dict:
+    """Fetch a single page of collected inks and return the decoded JSON body."""
+    headers = {"Authorization": f"Bearer {api_token}"}
+    params = {
+        "page[number]": page_number,
+        "page[size]": page_size,
+        "include": "macro_cluster"
+    }
+
+    # Pages are fetched concurrently, so back off on 429 instead of failing
+    # the whole collection fetch on one rate-limited page
+    max_retries = 3
+    for attempt in range(max_retries):
+        response = _session.get(base_url, headers=headers, params=params)
+
+        if response.status_code == 429:
+            if attempt < max_retries - 1:
+                time.sleep(_retry_after_seconds(response, attempt))
+                continue
+
+        response.raise_for_status()
+        break
+
+    return response.json()
+
+
+def _intern(value):
+    """Intern a string value (brands, makers and tags repeat across inks); pass others through."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _flatten_collected_ink(item: Dict) -> Dict:
+    """Flatten one collected ink from a paginated list response."""
+    attrs = item.get("attributes", {})
+
+    # The ink_id attribute corresponds to the macro_cluster ID
+    # (verified by matching with included macro_cluster objects)
+    ink_id = attrs.get("ink_id")
+    macro_cluster_id = str(ink_id) if ink_id else None
+
+    # Intern the tags of a list; any other value passes through unchanged
+    cluster_tags = attrs.get("cluster_tags", [])
+    if isinstance(cluster_tags, list):
+        cluster_tags = [_intern(tag) for tag in cluster_tags]
+
+    return {
+        "id": item.get("id"),
+        "brand_name": _intern(attrs.get("brand_name", "")),
+        "line_name": _intern(attrs.get("line_name", "")),
+        "name": attrs.get("ink_name", ""),  # API uses 'ink_name', we map to 'name'
+        "maker": _intern(attrs.get("maker", "")),
+        "color": attrs.get("color", ""),
+        "cluster_tags": cluster_tags,
+        "kind": _intern(attrs.get("kind", "")),
+        "swabbed": attrs.get("swabbed", False),
+        "used": attrs.get("used", False),
+        "archived": attrs.get("archived", False),
+        "private": attrs.get("private", False),
+        "usage_count": attrs.get("usage", 0),
+        "daily_usage": attrs.get("daily_usage", 0),
+        "last_used_on": attrs.get("last_used_on", ""),
+        "comment": attrs.get("comment", ""),  # Public comment from API
+        "private_comment": attrs.get("private_comment", ""),  # Private comment (where assignments go)
+        "simplified_brand_name": _intern(attrs.get("simplified_brand_name", "")),
+        "simplified_ink_name": attrs.get("simplified_ink_name", ""),
+        "macro_cluster_id": macro_cluster_id,  # ID for linking to FPC cluster page
+    }
+
+
+def fetch_all_collected_inks(
+    api_token: str,
+    base_url: str = "https://www.fountainpencompanion.com/api/v1/collected_inks",
+    max_workers: int = MAX_PAGE_WORKERS
+) -> List[Dict]:
     """
     Fetch all collected inks from the API, handling pagination automatically.
 
+    The first page is fetched on its own to learn the total page count; the
+    remaining pages are then requested concurrently, so wall time is roughly
+    two round trips instead of one per page.
+
     Args:
         api_token: Bearer token for authentication
         base_url: API endpoint URL
+        max_workers: Maximum number of pages to request at once
 
     Returns:
-        List of all ink data dictionaries (flattened from API format)
+        List of all ink data dictionaries (flattened from API format), in page order
 
     Raises:
         requests.HTTPError: If any API request fails
         ValueError: If API returns unexpected format
     """
-    headers = {"Authorization": f"Bearer {api_token}"}
-    all_inks = []
-    current_page = 1
     page_size = 100  # Request 100 items per page for efficiency
 
-    while True:
-        # Make paginated request
-        params = {
-            "page[number]": current_page,
-            "page[size]": page_size,
-            "include": "macro_cluster"
-        }
-
-        response = requests.get(base_url, headers=headers, params=params)
-        response.raise_for_status()
-
-        response_data = response.json()
-
-        # Extract ink data from this page
-        raw_inks = response_data.get("data", [])
-
-        # Flatten the nested structure
-        for item in raw_inks:
-            attrs = item.get("attributes", {})
-
-            # The ink_id attribute corresponds to the macro_cluster ID
-            # (verified by matching with included macro_cluster objects)
-            ink_id = attrs.get("ink_id")
-            macro_cluster_id = str(ink_id) if ink_id else None
-
-            flattened = {
-                "id": item.get("id"),
-                "brand_name": attrs.get("brand_name", ""),
-                "line_name": attrs.get("line_name", ""),
-                "name": attrs.get("ink_name", ""),  # API uses 'ink_name', we map to 'name'
-                "maker": attrs.get("maker", ""),
-                "color": attrs.get("color", ""),
-                "cluster_tags": attrs.get("cluster_tags", []),
-                "kind": attrs.get("kind", ""),
-                "swabbed": attrs.get("swabbed", False),
-                "used": attrs.get("used", False),
-                "archived": attrs.get("archived", False),
-                "private": attrs.get("private", False),
-                "usage_count": attrs.get("usage", 0),
-                "daily_usage": attrs.get("daily_usage", 0),
-                "last_used_on": attrs.get("last_used_on", ""),
-                "comment": attrs.get("comment", ""),  # Public comment from API
-                "private_comment": attrs.get("private_comment", ""),  # Private comment (where assignments go)
-                "simplified_brand_name": attrs.get("simplified_brand_name", ""),
-                "simplified_ink_name": attrs.get("simplified_ink_name", ""),
-                "macro_cluster_id": macro_cluster_id,  # ID for linking to FPC cluster page
-            }
-            all_inks.append(flattened)
-
-        # Check pagination metadata
-        meta = response_data.get("meta", {})
-        pagination = meta.get("pagination", {})
+    first_page = _fetch_collected_inks_page(api_token, base_url, 1, page_size)
+    pages = [first_page]
 
-        total_pages = pagination.get("total_pages", 1)
-        next_page = pagination.get("next_page")
+    # Check pagination metadata
+    pagination = first_page.get("meta", {}).get("pagination", {})
+    total_pages = pagination.get("total_pages", 1) or 1
 
-        # If there's no next page, we're done
-        if next_page is None or current_page >= total_pages:
-            break
+    # If there's no next page, we're done
+    if pagination.get("next_page") is not None and total_pages > 1:
+        remaining = range(2, total_pages + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(remaining)))) as executor:
+            # map() yields results in submission order, keeping inks in page order
+            pages.extend(executor.map(
+                lambda page_number: _fetch_collected_inks_page(api_token, base_url, page_number, page_size),
+                remaining
+            ))
 
-        current_page = next_page
+    all_inks = []
+    for page in pages:
+        all_inks.extend(_flatten_collected_ink(item) for item in page.get("data", []))
 
     return all_inks
 
@@ -148,7 +202,7 @@ def fetch_single_ink(
     url = f"{base_url}/{ink_id}"
     headers = {"Authorization": f"Bearer {api_token}"}
 
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=headers)
     response.raise_for_status()
 
     response_data = response.json()
@@ -193,7 +247,7 @@ def update_ink_private_comment(
 
     max_retries = 3
     for attempt in range(max_retries):
-        response = requests.patch(url, headers=headers, json=payload)
+        response = _session.patch(url, headers=headers, json=payload)
 
         if response.status_code == 429:
             if attempt < max_retries - 1:
@@ -1,5 +1,7 @@
 from shiny import App, ui, render, reactive
 from datetime import datetime
+from functools import lru_cache
+import calendar
 import pandas as pd
 import os
 import logging
@@ -21,7 +23,8 @@ logging.getLogger("api_client").setLevel(logging.DEBUG)
 from dotenv import load_dotenv
 from assignment_logic import (
     create_explicit_assignments_only,
-    get_month_summary,
+    group_assignments_by_month,
+    index_assignments_by_month,
     move_ink_assignment,
     swap_ink_assignments,
     shuffle_month_assignments,
@@ -30,25 +33,29 @@ from assignment_logic import (
     remove_swatch_from_comment,
     get_ink_identifier,
     find_ink_by_macro_cluster_id,
+    build_identifier_to_date,
     assignable_inks,
 )
 from api_client import fetch_all_collected_inks, update_ink_private_comment, fetch_single_ink
-from ink_cache import save_inks_to_cache, load_inks_from_cache, get_cache_info
+from ink_cache import save_inks_to_cache, save_inks_to_cache_async, load_inks_from_cache, get_cache_info
 from app_helpers import (
     parse_session_data,
+    build_session_data,
     get_month_theme,
     prepare_save_data,
     prepare_post_save_updates,
     get_month_dates,
+    format_date_label,
     make_button_id,
     detect_new_click,
+    find_session_date,
 )
 from views import (
     render_calendar_view,
     render_list_view,
     render_ink_collection_view,
 )
-from chat_setup import initialize_chat_session
+from chat_setup import initialize_chat_session, coalesce_stream, batch_stream_writes
 from llm_organizer import list_available_models, DEFAULT_MODELS
 
 # Load environment variables from .env file
@@ -60,6 +67,13 @@ DEFAULT_API_TOKEN = os.getenv("FPC_API_TOKEN", "")
 # Settings file for persisting preferences
 SETTINGS_FILE = "app_settings.json"
 
+# Month names for the month assignment table (index 0 = January)
+MONTH_NAMES = tuple(calendar.month_name)[1:]
+
+# Static input choices, built once at import rather than per UI construction
+INK_FILTER_CHOICES = {"unassigned": "Unassigned", "session": "Session Assigned", "api": "API Assigned"}
+LLM_PROVIDER_CHOICES = ("anthropic", "openai")
+
 def load_settings() -> dict:
     """Load settings from file."""
     if os.path.exists(SETTINGS_FILE):
@@ -135,8 +149,8 @@ app_ui = ui.page_fluid(
                     ui.input_checkbox_group(
                         "ink_filter",
                         "Show:",
-                        choices={"unassigned": "Unassigned", "session": "Session Assigned", "api": "API Assigned"},
-                        selected=["unassigned", "session", "api"],
+                        choices=INK_FILTER_CHOICES,
+                        selected=list(INK_FILTER_CHOICES),
                         inline=True
                     ),
                     class_="ink-filter-controls"
@@ -154,9 +168,18 @@ app_ui = ui.page_fluid(
     )
 )
 
+@lru_cache(maxsize=256)
+def month_label_text(year: int, month: int, fmt: str = "%B %Y") -> str:
+    """Format a month heading (e.g. "March 2026"), cached per (year, month, fmt)."""
+    return datetime(year, month, 1).strftime(fmt)
+
+@lru_cache(maxsize=1024)
 def ink_swatch_svg(color: str, size: str = "sm") -> ui.HTML:
     """Generate an SVG ink swatch with organic watercolor blob shape.
 
+    Cached per (color, size): every calendar/list/picker row renders a swatch,
+    and a collection only has so many distinct colors.
+
     Args:
         color: The ink color (hex or CSS color)
         size: "sm" for small (32x24), "lg" for large (80x50)
@@ -236,7 +259,7 @@ def server(input, output, session):
                             placeholder="Enter your API token"),
             ui.hr(),
             ui.input_select("llm_provider", "LLM Provider",
-                          choices=["anthropic", "openai"],
+                          choices=list(LLM_PROVIDER_CHOICES),
                           selected=provider),
             ui.output_ui("model_selector"),
             ui.input_password("llm_api_key", "LLM API Key",
@@ -326,9 +349,8 @@ def server(input, output, session):
         default_session_path = "session_default.json"
         if os.path.exists(default_session_path):
             try:
-                with open(default_session_path, "r") as f:
-                    loaded = json.load(f)
-                assignments, themes = parse_session_data(loaded)
+                with open(default_session_path, "rb") as f:
+                    assignments, themes = parse_session_data(f.read())
                 session_assignments.set(assignments)
                 session_themes.set(themes)
                 ui.notification_show(
@@ -338,6 +360,17 @@ def server(input, output, session):
             except Exception as e:
                 ui.notification_show(f"Error loading default session: {str(e)}", type="warning")
 
+    # The (ink list, year) whose API assignments a save/delete already patched
+    # next to ink_data.set(). A plain dict, not a reactive dependency; the
+    # sync effect below checks it by identity to skip its full rebuild.
+    api_patched_for = {"inks": None, "year": None}
+
+    def set_inks_and_api_assignments(inks, api, year):
+        """Set ink_data together with API assignments already patched for it."""
+        api_patched_for["inks"], api_patched_for["year"] = inks, year
+        ink_data.set(inks)
+        api_assignments.set(api)
+
     # Update API assignments when ink_data changes (these are protected/read-only)
     @reactive.Effect
     @reactive.event(ink_data)
@@ -348,9 +381,19 @@ def server(input, output, session):
             api_assignments.set({})
             return
 
+        # A save/delete set these inks with their API assignments patched in
+        # place of a rebuild; rescanning every comment would only confirm them
+        if inks is api_patched_for["inks"] and year == api_patched_for["year"]:
+            return
+
         # Get explicit assignments from API cache - these are protected
         explicit = create_explicit_assignments_only(inks, year)
 
+        # Save/delete paths already set the matching API assignments alongside
+        # ink_data; skip the redundant write so dependents don't re-run twice
+        with reactive.isolate():
+            if explicit == api_assignments.get():
+                return
         api_assignments.set(explicit)
 
     # Update API assignments when year changes
@@ -375,7 +418,10 @@ def server(input, output, session):
         # when viewing the correct year. This allows users to navigate between
         # years without losing their work.
 
-    # Helper to get merged assignments (API takes precedence over session)
+    # Merged assignments (API takes precedence over session). A Calc, so the
+    # daily view and the month table share one merged dict per change instead
+    # of each building their own; readers must not mutate it.
+    @reactive.Calc
     def get_merged_assignments_dict():
         """Merge session and API assignments. API assignments take precedence."""
         api = api_assignments.get()
@@ -417,12 +463,7 @@ def server(input, output, session):
         if not assignments and not themes:
             ui.notification_show("No session data to save", type="warning")
             return
-        # Save in new format with both assignments and themes
-        session_data = {
-            "assignments": assignments,
-            "themes": themes
-        }
-        yield json.dumps(session_data, indent=2)
+        yield json.dumps(build_session_data(assignments, themes), indent=2)
 
     # Load session from uploaded file
     @reactive.Effect
@@ -434,9 +475,8 @@ def server(input, output, session):
 
         try:
             file_path = file_info[0]["datapath"]
-            with open(file_path, "r") as f:
-                loaded = json.load(f)
-            assignments, themes = parse_session_data(loaded)
+            with open(file_path, "rb") as f:
+                assignments, themes = parse_session_data(f.read())
             session_assignments.set(assignments)
             session_themes.set(themes)
             ui.notification_show(
@@ -459,7 +499,7 @@ def server(input, output, session):
     def month_label():
         year = input.year()
         month = current_month.get()
-        month_name = datetime(year, month, 1).strftime("%B")
+        month_name = month_label_text(year, month, "%B")
         return ui.span(month_name, class_="month-label")
 
     # Theme label for header
@@ -503,22 +543,27 @@ def server(input, output, session):
             class_="theme-container"
         )
 
+    # Session assignments bucketed by (year, month), rebuilt only when the
+    # session changes, so the month buttons and bulk save read one month
+    # instead of each rescanning the whole session
+    @reactive.Calc
+    def session_by_month():
+        return index_assignments_by_month(session_assignments.get())
+
+    def unsaved_month_dates(year, month):
+        """Session dates in a month that aren't shadowed by an API assignment."""
+        api = api_assignments.get()
+        return [
+            date_str for date_str in session_by_month().get((year, month), {})
+            if date_str not in api
+        ]
+
     # Save All Month button - only shows when there are unsaved session assignments for this month
     @output
     @render.ui
     def save_all_month_btn():
-        year = input.year()
-        month = current_month.get()
-
-        session = session_assignments.get()
-        api = api_assignments.get()
-
         # Count unsaved session assignments for this month
-        month_prefix = f"{year}-{month:02d}"
-        unsaved_count = sum(
-            1 for date_str in session
-            if date_str.startswith(month_prefix) and date_str not in api
-        )
+        unsaved_count = len(unsaved_month_dates(input.year(), current_month.get()))
 
         if unsaved_count == 0:
             return ui.span()  # Return empty span when nothing to save
@@ -541,18 +586,8 @@ def server(input, output, session):
     @output
     @render.ui
     def shuffle_month_btn():
-        year = input.year()
-        month = current_month.get()
-
-        session = session_assignments.get()
-        api = api_assignments.get()
-
         # Count session assignments for this month that are not API-protected
-        month_prefix = f"{year}-{month:02d}"
-        shufflable_count = sum(
-            1 for date_str in session
-            if date_str.startswith(month_prefix) and date_str not in api
-        )
+        shufflable_count = len(unsaved_month_dates(input.year(), current_month.get()))
 
         if shufflable_count < 2:
             return ui.span()  # Nothing to shuffle
@@ -590,6 +625,7 @@ def server(input, output, session):
             year=year,
             month=month,
             inks=inks,
+            month_session=session_by_month().get((year, month), {}),
         )
 
         if result.success:
@@ -605,7 +641,6 @@ def server(input, output, session):
         month = current_month.get()
 
         session = session_assignments.get()
-        api = api_assignments.get()
         inks = ink_data.get()
         themes = session_themes.get()
 
@@ -620,11 +655,9 @@ def server(input, output, session):
             return
 
         # Find all unsaved session assignments for this month
-        month_prefix = f"{year}-{month:02d}"
         to_save = [
             (date_str, session[date_str])
-            for date_str in sorted(session.keys())
-            if date_str.startswith(month_prefix) and date_str not in api
+            for date_str in sorted(unsaved_month_dates(year, month))
         ]
 
         if not to_save:
@@ -688,14 +721,11 @@ def server(input, output, session):
                     updated_comment,
                     date_str,
                     year,
-                    session_assignments.get()
+                    session_assignments.get(),
+                    api_assignments.get()
                 )
 
-                # Apply state updates
-                ink_data.set(updates.updated_inks)
-                save_inks_to_cache(updates.updated_inks)
-                api_assignments.set(updates.new_api_assignments)
-                session_assignments.set(updates.new_session_assignments)
+                apply_post_save_updates(updates, year)
 
                 saved_count += 1
 
@@ -743,7 +773,7 @@ def server(input, output, session):
     # Fetch inks from API with pagination
     @reactive.Effect
     @reactive.event(input.fetch_inks)
-    def fetch_inks():
+    async def fetch_inks():
         try:
             token = input.api_token()
         except Exception:
@@ -758,24 +788,21 @@ def server(input, output, session):
             # Show loading notification
             ui.notification_show("Fetching inks from API...", duration=None, id="fetch_loading", type="message")
 
-            # Fetch all pages of inks
-            inks = fetch_all_collected_inks(token)
+            # Fetch all pages of inks off the event loop so other sessions stay responsive
+            inks = await asyncio.to_thread(fetch_all_collected_inks, token)
 
             # Save to cache FIRST (before setting reactive value)
-            save_inks_to_cache(inks)
+            await save_inks_to_cache_async(inks)
 
             # Then update reactive value
             ink_data.set(inks)
 
-            # Remove loading notification and show success
-            ui.notification_remove("fetch_loading")
-            ui.notification_show(
-                f"Successfully fetched {len(inks)} inks and saved to cache!",
-                type="message"
+            finish_notification(
+                "fetch_loading",
+                f"Successfully fetched {len(inks)} inks and saved to cache!"
             )
         except Exception as e:
-            ui.notification_remove("fetch_loading")
-            ui.notification_show(f"Error fetching inks: {str(e)}", type="error")
+            finish_notification("fetch_loading", f"Error fetching inks: {str(e)}", type="error")
 
     # Get daily assignments for the selected month (merged view)
     @reactive.Calc
@@ -1059,6 +1086,30 @@ def server(input, output, session):
         ui.modal_remove()
         pending_save.set(None)
 
+    # Last (year, month, per-date click counts) seen by each button observer, so
+    # unrelated invalidations (e.g. ink_data churn) skip the per-button diff
+    _observer_fingerprints = {}
+
+    def read_button_clicks(prefix: str, dates: list[str]) -> dict:
+        """Read click counts for per-date buttons, establishing reactive dependencies."""
+        clicks = {}
+        for date_str in dates:
+            try:
+                clicks[date_str] = getattr(input, make_button_id(prefix, date_str), lambda: 0)() or 0
+            except Exception:
+                clicks[date_str] = 0
+        return clicks
+
+    def is_unchanged_fingerprint(name: str, year: int, month: int, clicks: dict) -> bool:
+        """Record the observer fingerprint and report whether it matches the previous run."""
+        # Individual counters, not a sum: a button re-created at 0 while another
+        # goes 0 -> 1 would otherwise leave the total unchanged
+        fingerprint = (year, month, tuple(clicks.items()))
+        if _observer_fingerprints.get(name) == fingerprint:
+            return True
+        _observer_fingerprints[name] = fingerprint
+        return False
+
     # Track button clicks for API delete buttons (list view)
     _api_delete_button_clicks = {}
 
@@ -1075,15 +1126,17 @@ def server(input, output, session):
         with reactive.isolate():
             api = api_assignments.get()
 
-        for date_str in get_month_dates(year, month):
-            # Only process API assignments
-            if date_str not in api:
-                continue
+        # Only API assignments have delete buttons
+        month_api_dates = [d for d in get_month_dates(year, month) if d in api]
+        clicks = read_button_clicks("api_delete", month_api_dates)
+        if is_unchanged_fingerprint("api_delete", year, month, clicks):
+            return
 
+        for date_str in month_api_dates:
             button_id = make_button_id("api_delete", date_str)
 
             try:
-                current_clicks = getattr(input, button_id, lambda: 0)()
+                current_clicks = clicks[date_str]
                 prev_clicks = _api_delete_button_clicks.get(button_id, 0)
 
                 if current_clicks > prev_clicks:
@@ -1099,9 +1152,8 @@ def server(input, output, session):
     def show_api_delete_confirmation_modal(date_str: str, macro_cluster_id: str, ink: dict):
         """Show confirmation dialog before deleting an API assignment."""
         ink_name = f"{ink.get('brand_name', '')} {ink.get('name', '')}"
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        date_display = date_obj.strftime("%B %d, %Y")
-        year = date_obj.year
+        date_display = format_date_label(date_str, "%B %d, %Y")
+        year = int(date_str[:4])
 
         warning_content = ui.div(
             ui.div(
@@ -1179,6 +1231,14 @@ def server(input, output, session):
         ui.modal_remove()
         pending_api_delete.set(None)
 
+    def finish_notification(notification_id: str, message: str, type: str = "message", duration: float = 5):
+        """Replace a loading notification with its outcome.
+
+        Re-showing under the loading notification's id swaps it in place, so the
+        client gets one message instead of a separate remove + show.
+        """
+        ui.notification_show(message, type=type, duration=duration, id=notification_id)
+
     def perform_api_delete(date_str: str, macro_cluster_id: str, ink: dict, year: int):
         """Execute the actual API delete operation."""
         try:
@@ -1201,8 +1261,7 @@ def server(input, output, session):
             try:
                 fresh_ink = fetch_single_ink(token, ink["id"])
             except Exception as e:
-                ui.notification_remove("delete_loading")
-                ui.notification_show(f"Could not fetch ink data: {str(e)}", type="error")
+                finish_notification("delete_loading", f"Could not fetch ink data: {str(e)}", type="error")
                 return
 
             # Build updated comment JSON with swatch data removed
@@ -1218,27 +1277,43 @@ def server(input, output, session):
             inks = ink_data.get()
             result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
             if result:
-                ink_idx, _ = result
-                updated_inks = [i.copy() for i in inks]
-                updated_inks[ink_idx]["private_comment"] = updated_comment
-                ink_data.set(updated_inks)
-                save_inks_to_cache(updated_inks)
-                inks = updated_inks
+                ink_idx, ink = result
+                inks = list(inks)
+                inks[ink_idx] = {**ink, "private_comment": updated_comment}
 
-            # Rebuild API assignments from updated ink data
-            new_api = create_explicit_assignments_only(inks, year)
-            api_assignments.set(new_api)
+            # Drop just the deleted date from API assignments; fall back to a full
+            # rebuild if local state no longer matches what we deleted
+            api = api_assignments.get()
+            if api.get(date_str) == macro_cluster_id:
+                new_api = {d: mid for d, mid in api.items() if d != date_str}
+            else:
+                new_api = create_explicit_assignments_only(inks, year)
+
+            if result:
+                set_inks_and_api_assignments(inks, new_api, year)
+                save_inks_to_cache(inks)
+            else:
+                api_assignments.set(new_api)
 
-            # Show success
-            ui.notification_remove("delete_loading")
-            ui.notification_show(f"Deleted assignment for {ink_name}", type="message", duration=3)
+            # Show success (state updates above are already queued)
+            finish_notification("delete_loading", f"Deleted assignment for {ink_name}", duration=3)
 
         except Exception as e:
-            ui.notification_remove("delete_loading")
             error_msg = str(e)
             if hasattr(e, 'response'):
                 error_msg = f"{e.response.status_code}: {e.response.text[:100]}"
-            ui.notification_show(f"Error deleting: {error_msg}", type="error", duration=7)
+            finish_notification("delete_loading", f"Error deleting: {error_msg}", type="error", duration=7)
+
+    def apply_post_save_updates(updates, year):
+        """Apply post-save state in one block, then persist the cache.
+
+        Shiny queues invalidations until the current observer returns, so keeping
+        the writes together (with no disk I/O in between) lets dependents re-run
+        once against the final, consistent state.
+        """
+        set_inks_and_api_assignments(updates.updated_inks, updates.new_api_assignments, year)
+        session_assignments.set(updates.new_session_assignments)
+        save_inks_to_cache(updates.updated_inks)
 
     def perform_save(date_str: str, macro_cluster_id: str, ink, year: int, new_data):
         """Execute the actual API save operation."""
@@ -1262,8 +1337,7 @@ def server(input, output, session):
                 token = DEFAULT_API_TOKEN
 
             if not token:
-                ui.notification_remove("save_loading")
-                ui.notification_show("API token not found. Please set in Settings.", type="error")
+                finish_notification("save_loading", "API token not found. Please set in Settings.", type="error")
                 return
 
             # Call API
@@ -1276,26 +1350,22 @@ def server(input, output, session):
                 updated_comment,
                 date_str,
                 year,
-                session_assignments.get()
+                session_assignments.get(),
+                # api_assignments tracks the selected year; only patch it in place for that year
+                api_assignments.get() if year == input.year() else None
             )
 
-            # Apply state updates
-            ink_data.set(updates.updated_inks)
-            save_inks_to_cache(updates.updated_inks)
-            api_assignments.set(updates.new_api_assignments)
-            session_assignments.set(updates.new_session_assignments)
+            apply_post_save_updates(updates, year)
 
-            # Show success
-            ui.notification_remove("save_loading")
+            # Show success (state updates above are already queued)
             ink_name = f"{ink.get('brand_name', '')} {ink.get('name', '')}"
-            ui.notification_show(f"Saved {ink_name} to API!", type="message", duration=3)
+            finish_notification("save_loading", f"Saved {ink_name} to API!", duration=3)
 
         except Exception as e:
-            ui.notification_remove("save_loading")
             error_msg = str(e)
             if hasattr(e, 'response'):
                 error_msg = f"{e.response.status_code}: {e.response.text[:100]}"
-            ui.notification_show(f"Error saving: {error_msg}", type="error", duration=7)
+            finish_notification("save_loading", f"Error saving: {error_msg}", type="error", duration=7)
 
     # Track previous date values for ink collection date pickers
     _ink_collection_prev_dates = {}
@@ -1316,14 +1386,16 @@ def server(input, output, session):
         with reactive.isolate():
             daily = get_daily_assignments()
 
-        for date_str in get_month_dates(year, month):
-            # Skip assigned days
-            if date_str in daily:
-                continue
+        # Only unassigned days have assign buttons
+        unassigned_dates = [d for d in get_month_dates(year, month) if d not in daily]
+        clicks = read_button_clicks("assign", unassigned_dates)
+        if is_unchanged_fingerprint("assign", year, month, clicks):
+            return
 
+        for date_str in unassigned_dates:
             button_id = make_button_id("assign", date_str)
             try:
-                current_clicks = getattr(input, button_id, lambda: 0)()
+                current_clicks = clicks[date_str]
                 prev_clicks = _assign_button_clicks.get(button_id, 0)
 
                 if detect_new_click(current_clicks, prev_clicks):
@@ -1342,8 +1414,7 @@ def server(input, output, session):
         # Reset search when opening modal
         ink_picker_search.set("")
 
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-        date_display = date_obj.strftime("%B %d, %Y")
+        date_display = format_date_label(date_str, "%B %d, %Y")
 
         m = ui.modal(
             ui.p(f"Assign ink to {date_display}:", class_="ink-picker-subtitle"),
@@ -1377,17 +1448,19 @@ def server(input, output, session):
         except Exception:
             pass
 
-    # Render the filtered ink list for the picker modal
-    @output
-    @render.ui
-    def ink_picker_list():
-        date_str = ink_picker_date.get()
-        if not date_str:
-            return ui.div()
-
+    # Build the picker rows for the current search. Kept separate from the render
+    # (and independent of the target date) so reopening the modal with the same
+    # search and assignments reuses the cached rows instead of rebuilding them.
+    @reactive.Calc
+    def ink_picker_items():
         inks = ink_data.get()
         if not inks:
-            return ui.p("No inks loaded.")
+            return None
+
+        # Bind UI constructors as locals - this loop can run over the whole collection
+        _div = ui.div
+        _span = ui.span
+        _swatch = ink_swatch_svg
 
         # Archived inks remain in ink_data for display, but aren't pickable
         inks = assignable_inks(inks)
@@ -1436,22 +1509,21 @@ def server(input, output, session):
             # Build the item
             session_date = session_macro_to_date.get(ink_identifier) if ink_identifier else None
             if session_date:
-                date_obj = datetime.strptime(session_date, "%Y-%m-%d")
-                date_label = ui.span(
-                    f"(assigned to {date_obj.strftime('%b %d')})",
+                date_label = _span(
+                    f"(assigned to {format_date_label(session_date, '%b %d')})",
                     class_="ink-picker-date-label"
                 )
             else:
                 date_label = None
 
-            item = ui.div(
-                ui.div(
-                    ink_swatch_svg(color, "sm"),
+            item = _div(
+                _div(
+                    _swatch(color, "sm"),
                     class_="ink-picker-swatch"
                 ),
-                ui.div(
-                    ui.span(brand, class_="ink-picker-brand"),
-                    ui.span(name, class_="ink-picker-name"),
+                _div(
+                    _span(brand, class_="ink-picker-brand"),
+                    _span(name, class_="ink-picker-name"),
                     date_label if date_label else "",
                     class_="ink-picker-info"
                 ),
@@ -1464,6 +1536,20 @@ def server(input, output, session):
             )
             ink_items.append(item)
 
+        return tuple(ink_items)
+
+    # Render the filtered ink list for the picker modal
+    @output
+    @render.ui
+    def ink_picker_list():
+        date_str = ink_picker_date.get()
+        if not date_str:
+            return ui.div()
+
+        ink_items = ink_picker_items()
+        if ink_items is None:
+            return ui.p("No inks loaded.")
+
         if not ink_items:
             return ui.div(
                 ui.p("No inks match your search.", class_="ink-picker-no-results"),
@@ -1508,8 +1594,7 @@ def server(input, output, session):
             return
 
         # Check if this ink is already session-assigned (moving it)
-        session_macro_to_date = {macro_id: d for d, macro_id in session.items() if d not in api}
-        from_date = session_macro_to_date.get(ink_identifier)
+        from_date = find_session_date(session, api, ink_identifier)
 
         new_session, result = move_ink_assignment(
             session=session,
@@ -1600,7 +1685,7 @@ def server(input, output, session):
         year = input.year()
         month = current_month.get()
         month_key = f"{year}-{month:02d}"
-        month_name = datetime(year, month, 1).strftime("%B %Y")
+        month_name = month_label_text(year, month)
 
         # Get existing theme if any
         themes = session_themes.get()
@@ -1658,7 +1743,7 @@ def server(input, output, session):
         session_themes.set(themes)
 
         ui.modal_remove()
-        ui.notification_show(f"Theme saved for {datetime(year, month, 1).strftime('%B')}",
+        ui.notification_show(f"Theme saved for {month_label_text(year, month, '%B')}",
                             type="message", duration=2)
 
     @reactive.Effect
@@ -1682,7 +1767,7 @@ def server(input, output, session):
             session_themes.set(themes)
 
         ui.modal_remove()
-        ui.notification_show(f"Theme cleared for {datetime(year, month, 1).strftime('%B')}",
+        ui.notification_show(f"Theme cleared for {month_label_text(year, month, '%B')}",
                             type="message", duration=2)
 
     # Track previous date values for inline date pickers (use dict, not reactive)
@@ -1719,10 +1804,12 @@ def server(input, output, session):
             if date_str not in session or date_str in api:
                 continue
 
-            date_input_id = f"date_{date_str.replace('-', '_')}"
+            date_input_id = make_button_id("date", date_str)
 
             try:
-                new_date_str = new_date_value.strftime("%Y-%m-%d")
+                # input_date yields datetime.date; isoformat() is YYYY-MM-DD
+                # without going through strftime
+                new_date_str = new_date_value.isoformat()
                 prev_value = _prev_date_values.get(date_str)
 
                 # Check if date actually changed (not just initial render)
@@ -1773,11 +1860,11 @@ def server(input, output, session):
 
         # Use isolate to read without creating dependency (prevents infinite loop)
         with reactive.isolate():
-            daily = get_daily_assignments()
             api = api_assignments.get()
             session = session_assignments.get()
-        # Build reverse lookup: macro_cluster_id -> date_str
-        macro_to_date = {macro_id: date_str for date_str, macro_id in daily.items()}
+        # Build reverse lookup: macro_cluster_id -> date_str (merged view, API
+        # wins); also handed to move_ink_assignment so assigns skip a rescan
+        macro_to_date = build_identifier_to_date(session, api)
 
         # PHASE 1: Read ALL inputs to establish reactive dependencies
         input_values = {}
@@ -1835,7 +1922,7 @@ def server(input, output, session):
                 new_date_value = input_values.get(idx)
                 prev_info = _ink_collection_prev_dates.get(idx)
 
-                new_val = new_date_value.strftime("%Y-%m-%d") if new_date_value else ""
+                new_val = new_date_value.isoformat() if new_date_value else ""
 
                 # First observation - just record, don't act
                 if prev_info is None:
@@ -1871,7 +1958,8 @@ def server(input, output, session):
                         from_date=current_date,  # None for new assignment
                         to_date=new_date_str,
                         macro_cluster_id=ink_identifier if current_date is None else None,
-                        inks=inks
+                        inks=inks,
+                        identifier_to_date=macro_to_date
                     )
 
                     if not result.success:
@@ -1912,7 +2000,10 @@ def server(input, output, session):
         else:
             return calendar_view()
     
-    # Calendar view - delegates to views.py
+    # Calendar view - delegates to views.py. As a Calc, the built UI is reused
+    # when main_view re-runs for an unrelated reason (e.g. toggling list view
+    # and back) and only rebuilt when its own inputs change.
+    @reactive.Calc
     def calendar_view():
         return render_calendar_view(
             inks=ink_data.get(),
@@ -1924,7 +2015,8 @@ def server(input, output, session):
             ink_swatch_fn=ink_swatch_svg
         )
     
-    # List view - delegates to views.py
+    # List view - delegates to views.py (cached the same way as calendar_view)
+    @reactive.Calc
     def list_view():
         return render_list_view(
             inks=ink_data.get(),
@@ -1989,10 +2081,23 @@ def server(input, output, session):
             collection_sort_field.set(field)
             collection_sort_direction.set("asc")
     
-    # Month assignment table
-    @output
-    @render.data_frame
-    def month_assignment():
+    # "Brand - Name" labels keyed by ink identifier, rebuilt only when ink_data changes
+    @reactive.Calc
+    def ink_labels():
+        labels = {}
+        for ink in ink_data.get():
+            label = f"{ink.get('brand_name', '')} - {ink.get('name', '')}"
+            # First ink wins, matching find_ink_by_identifier
+            if ink.get("macro_cluster_id"):
+                labels.setdefault(f"macro:{ink['macro_cluster_id']}", label)
+            if ink.get("id"):
+                labels.setdefault(f"id:{ink['id']}", label)
+        return labels
+
+    # Month assignment table. The DataFrame is built in a Calc so the grid
+    # output gets the cached frame back unless inks, assignments or year change.
+    @reactive.Calc
+    def month_assignment_df():
         inks = ink_data.get()
         current_assignments = get_merged_assignments_dict()
         year = input.year()
@@ -2000,25 +2105,32 @@ def server(input, output, session):
         if not inks or not current_assignments:
             return pd.DataFrame()
 
-        # Group assignments by month using tested function
-        rows = []
+        labels = ink_labels()
+
+        # Group assignments by month in one pass using tested function
+        by_month = group_assignments_by_month(current_assignments, year)
+
+        # Build columns directly rather than a list of per-row dicts
+        counts = []
+        previews = []
         for month_num in range(1, 13):
-            month_name = datetime(2000, month_num, 1).strftime("%B")
-            ink_identifiers = get_month_summary(current_assignments, year, month_num)
-            ink_names = []
-            for identifier in ink_identifiers:
-                result = find_ink_by_macro_cluster_id(identifier, inks)
-                if result is not None:
-                    _, ink = result
-                    ink_names.append(f"{ink.get('brand_name', '')} - {ink.get('name', '')}")
-
-            rows.append({
-                "Month": month_name,
-                "Number of Inks": len(ink_names),
-                "Inks": ", ".join(ink_names[:3]) + ("..." if len(ink_names) > 3 else "")
-            })
-
-        df = pd.DataFrame(rows)
+            ink_identifiers = by_month[month_num]
+            ink_names = [labels[identifier] for identifier in ink_identifiers if identifier in labels]
+            counts.append(len(ink_names))
+            previews.append(", ".join(ink_names[:3]) + ("..." if len(ink_names) > 3 else ""))
+
+        return pd.DataFrame({
+            "Month": MONTH_NAMES,
+            "Number of Inks": counts,
+            "Inks": previews,
+        })
+
+    @output
+    @render.data_frame
+    def month_assignment():
+        df = month_assignment_df()
+        if df.empty:
+            return df
         return render.DataGrid(df, width="100%")
 
     def initialize_chat():
@@ -2085,7 +2197,11 @@ def server(input, output, session):
             snapshot_updater()
             # Use stream_async with content="all" to show tool calls in the chat UI
             response = await chat_obj.stream_async(user_input, content="all")
-            await chat.append_message_stream(response)
+            # Tools run while the stream is consumed; their writes reach the
+            # calendar once, when the turn ends
+            await chat.append_message_stream(
+                coalesce_stream(batch_stream_writes(response, snapshot_updater.batch_writes))
+            )
 
         except Exception as e:
             error_msg = f"❌ Error: {str(e)}"
@@ -6,34 +6,70 @@ the Shiny reactive framework.
 """
 from calendar import monthrange
 from datetime import datetime
-from typing import NamedTuple, Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional, Union
+import json
+import sys
 
 from assignment_logic import (
     create_explicit_assignments_only,
+    update_explicit_assignments,
     parse_theme_from_comment,
     find_ink_by_macro_cluster_id,
+    build_identifier_lookup,
 )
 
+try:
+    # Session files can hold a year of assignments; parse raw bytes with
+    # orjson when present and fall back to the stdlib
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # =============================================================================
 # Date and Button ID Utilities
 # =============================================================================
 
-def get_month_dates(year: int, month: int) -> list[str]:
+@lru_cache(maxsize=256)
+def get_month_dates(year: int, month: int) -> tuple[str, ...]:
     """
     Get all date strings for a month.
 
+    Cached, since every calendar/list render and button observer asks for the
+    same few months; returns a tuple so the shared result can't be mutated.
+
     Args:
         year: Year (e.g., 2026)
         month: Month number (1-12)
 
     Returns:
-        List of date strings in YYYY-MM-DD format
+        Tuple of date strings in YYYY-MM-DD format
     """
     num_days = monthrange(year, month)[1]
-    return [f"{year}-{month:02d}-{day:02d}" for day in range(1, num_days + 1)]
+    return tuple(f"{year}-{month:02d}-{day:02d}" for day in range(1, num_days + 1))
+
+
+@lru_cache(maxsize=2048)
+def format_date_label(date_str: str, fmt: str = "%b %d, %Y") -> str:
+    """
+    Format a YYYY-MM-DD date string for display (e.g. "Mar 05, 2026").
+
+    Cached per (date_str, fmt): list, collection and picker rows re-render the
+    same assigned dates on every refresh.
+
+    Args:
+        date_str: Date in YYYY-MM-DD format
+        fmt: strftime format for the label
+
+    Returns:
+        Formatted date label
+    """
+    return datetime.fromisoformat(date_str).strftime(fmt)
 
 
+@lru_cache(maxsize=4096)
 def make_button_id(prefix: str, date_str: str) -> str:
     """
     Generate a button ID from a prefix and date string.
@@ -64,21 +100,46 @@ def detect_new_click(current_clicks: int, prev_clicks: int) -> bool:
     return current_clicks > prev_clicks
 
 
+def find_session_date(session: dict, api: dict, ink_identifier: str) -> Optional[str]:
+    """
+    Find the session-only date an ink is assigned to, if any.
+
+    Single pass over the session, for callers that need one lookup rather
+    than a full identifier -> date reverse map.
+
+    Args:
+        session: Session assignments {date_str: macro_cluster_id}
+        api: API assignments {date_str: macro_cluster_id} (dates here are skipped)
+        ink_identifier: Prefixed ink identifier to look for
+
+    Returns:
+        Date string in YYYY-MM-DD format, or None if not session-assigned
+    """
+    return next(
+        (d for d, macro_id in session.items() if macro_id == ink_identifier and d not in api),
+        None
+    )
+
+
 # =============================================================================
 # Cell Data Preparation (for calendar/list views)
 # =============================================================================
 
 class CellData(NamedTuple):
-    """Data for rendering a calendar or list cell."""
+    """Data for rendering a calendar or list cell.
+
+    Ink fields default to an empty cell, so unassigned days are built from
+    just (date_str, day).
+    """
     date_str: str
     day: int
-    has_ink: bool
-    macro_cluster_id: Optional[str]
-    ink_name: str
-    ink_brand: str
-    ink_color: str
-    can_edit: bool  # Session assignment, not API protected
-    is_api: bool    # From API (protected)
+    has_ink: bool = False
+    macro_cluster_id: Optional[str] = None
+    ink_name: str = ""
+    ink_brand: str = ""
+    ink_color: str = ""
+    can_edit: bool = False  # Session assignment, not API protected
+    is_api: bool = False    # From API (protected)
 
 
 def prepare_cell_data(
@@ -105,10 +166,24 @@ def prepare_cell_data(
     """
     macro_cluster_id = daily_assignments.get(date_str)
     result = find_ink_by_macro_cluster_id(macro_cluster_id, inks) if macro_cluster_id else None
-    has_ink = result is not None
+    return _build_cell_data(
+        date_str, day, macro_cluster_id, result,
+        session_assignments, api_assignments
+    )
+
 
-    if has_ink:
+def _build_cell_data(
+    date_str: str,
+    day: int,
+    macro_cluster_id: Optional[str],
+    result: Optional[tuple],
+    session_assignments: dict,
+    api_assignments: dict
+) -> CellData:
+    """Build CellData from an already-resolved (index, ink) lookup result."""
+    if result is not None:
         _, ink = result
+        is_api = date_str in api_assignments
         return CellData(
             date_str=date_str,
             day=day,
@@ -117,21 +192,10 @@ def prepare_cell_data(
             ink_name=ink.get("name", "Unknown"),
             ink_brand=ink.get("brand_name", ""),
             ink_color=ink.get("color", "#cccccc"),
-            can_edit=date_str in session_assignments and date_str not in api_assignments,
-            is_api=date_str in api_assignments
-        )
-    else:
-        return CellData(
-            date_str=date_str,
-            day=day,
-            has_ink=False,
-            macro_cluster_id=None,
-            ink_name="",
-            ink_brand="",
-            ink_color="",
-            can_edit=False,
-            is_api=False
+            can_edit=not is_api and date_str in session_assignments,
+            is_api=is_api
         )
+    return CellData(date_str, day)
 
 
 def prepare_month_cells(
@@ -157,31 +221,27 @@ def prepare_month_cells(
         List of CellData for each day of the month
     """
     dates = get_month_dates(year, month)
-    return [
-        prepare_cell_data(
-            date_str, day + 1, inks,
-            daily_assignments, session_assignments, api_assignments
-        )
-        for day, date_str in enumerate(dates)
-    ]
+    # Resolve identifiers once for the whole month rather than scanning inks per day
+    lookup = build_identifier_lookup(inks)
+    cells = []
+    for day, date_str in enumerate(dates, start=1):
+        macro_cluster_id = daily_assignments.get(date_str)
+        result = lookup.get(macro_cluster_id) if macro_cluster_id else None
+        cells.append(_build_cell_data(
+            date_str, day, macro_cluster_id, result,
+            session_assignments, api_assignments
+        ))
+    return cells
 
 
 # =============================================================================
 # Chat System Prompt
 # =============================================================================
 
-def get_chat_system_prompt(num_inks: int, year: int) -> str:
-    """
-    Get the system prompt for the LLM chat assistant.
-
-    Args:
-        num_inks: Number of inks in the collection
-        year: Year being organized
-
-    Returns:
-        System prompt string
-    """
-    return f"""You are an expert fountain pen ink curator helping organize a collection of {num_inks} inks for the year {year}.
+# Invariant instructions. Kept ahead of the per-session context so the start
+# of the system prompt is byte-identical across sessions, which lets provider
+# prompt caching reuse it.
+CHAT_SYSTEM_PROMPT_STATIC = """You are an expert fountain pen ink curator helping organize an ink collection across a calendar year.
 
 When analyzing an ink collection, consider:
 - Color families and harmonies
@@ -231,29 +291,81 @@ When you move or reassign inks from one month to another, this often creates gap
 Help the user organize their inks by suggesting themes, using tools to make assignments, and being flexible based on feedback."""
 
 
+@lru_cache(maxsize=32)
+def get_chat_system_prompt(num_inks: int, year: int) -> str:
+    """
+    Get the system prompt for the LLM chat assistant.
+
+    Args:
+        num_inks: Number of inks in the collection
+        year: Year being organized
+
+    Returns:
+        System prompt string
+    """
+    return f"""{CHAT_SYSTEM_PROMPT_STATIC}
+
+CURRENT COLLECTION:
+You are organizing a collection of {num_inks} inks for the year {year}."""
+
+
 # =============================================================================
 # Session Format Helpers
 # =============================================================================
 
-def parse_session_data(loaded_data: dict) -> tuple[dict, dict]:
+SESSION_FORMAT_VERSION = 2
+
+
+def build_session_data(assignments: dict, themes: dict) -> dict:
+    """
+    Build the session file payload in the current (versioned) format.
+
+    Args:
+        assignments: Session assignments {date: macro_cluster_id}
+        themes: Session themes {month_key: {theme, description}}
+
+    Returns:
+        Dict ready to serialize as JSON
+    """
+    return {
+        "version": SESSION_FORMAT_VERSION,
+        "assignments": assignments,
+        "themes": themes
+    }
+
+
+def parse_session_data(loaded_data: Union[dict, bytes, str]) -> tuple[dict, dict]:
     """
-    Parse session data, supporting both old and new formats.
+    Parse session data, supporting current and older formats.
 
+    Current format: {"version": 2, "assignments": {...}, "themes": {...}}
+    Unversioned format: {"assignments": {...}, "themes": {...}}
     Old format: flat dict {"2026-01-01": 0, ...}
-    New format: {"assignments": {...}, "themes": {...}}
 
     Args:
-        loaded_data: Loaded JSON data from session file
+        loaded_data: Loaded JSON data from session file, or the raw file
+                     contents (bytes/str), which are parsed here
 
     Returns:
         (assignments_dict, themes_dict) tuple
+
+    Raises:
+        ValueError: If the contents aren't valid JSON (raised by the parser)
+                    or aren't a session object
     """
-    if "assignments" in loaded_data:
-        # New format
-        return (
-            loaded_data.get("assignments", {}),
-            loaded_data.get("themes", {})
-        )
+    if isinstance(loaded_data, (bytes, str)):
+        loaded_data = _json_loads(loaded_data)
+
+    if not isinstance(loaded_data, dict):
+        raise ValueError("Session file must contain a JSON object")
+
+    if "assignments" in loaded_data or loaded_data.get("version") == SESSION_FORMAT_VERSION:
+        # Current or unversioned format; either section may be missing
+        assignments = loaded_data.get("assignments", {})
+        themes = loaded_data.get("themes", {})
+        if not isinstance(assignments, dict) or not isinstance(themes, dict):
+            raise ValueError("Session assignments and themes must be JSON objects")
+        return assignments, _intern_theme_names(themes)
     else:
         # Old format - flat dict of assignments
         return loaded_data, {}
@@ -263,6 +375,15 @@ def parse_session_data(loaded_data: dict) -> tuple[dict, dict]:
 # Theme Extraction Helpers
 # =============================================================================
 
+def _intern_theme_names(themes: dict) -> dict:
+    """Intern theme names in place; the same theme is often reused across months."""
+    for theme_data in themes.values():
+        name = theme_data.get("theme") if isinstance(theme_data, dict) else None
+        if isinstance(name, str):
+            theme_data["theme"] = sys.intern(name)
+    return themes
+
+
 class ThemeInfo(NamedTuple):
     """Theme information with source tracking."""
     theme: str
@@ -270,6 +391,22 @@ class ThemeInfo(NamedTuple):
     source: str  # "session" | "api" | "none"
 
 
+_NO_THEME = ThemeInfo("", "", "none")
+
+
+@lru_cache(maxsize=1024)
+def _api_theme_info(private_comment: str, year: int) -> ThemeInfo:
+    """ThemeInfo parsed from an ink comment, cached since every render asks again."""
+    theme_info = parse_theme_from_comment(private_comment, year)
+    if not theme_info:
+        return _NO_THEME
+    return ThemeInfo(
+        sys.intern(theme_info["theme"]),
+        theme_info["theme_description"],
+        "api"
+    )
+
+
 def get_month_theme(
     year: int,
     month: int,
@@ -298,39 +435,26 @@ def get_month_theme(
     month_key = f"{year}-{month:02d}"
 
     # Check session themes first
-    if month_key in session_themes:
-        theme_data = session_themes[month_key]
+    theme_data = session_themes.get(month_key)
+    if theme_data:
         theme_name = theme_data.get("theme", "")
-        theme_desc = theme_data.get("description", "")
         if theme_name:
-            return ThemeInfo(theme_name, theme_desc, "session")
+            return ThemeInfo(theme_name, theme_data.get("description", ""), "session")
 
     # Fall back to API ink comments
     if not inks:
-        return ThemeInfo("", "", "none")
+        return _NO_THEME
 
-    first_day_str = f"{year}-{month:02d}-01"
-    first_day_macro_id = daily_assignments.get(first_day_str)
+    first_day_macro_id = daily_assignments.get(f"{month_key}-01")
 
     if not first_day_macro_id:
-        return ThemeInfo("", "", "none")
+        return _NO_THEME
 
     result = find_ink_by_macro_cluster_id(first_day_macro_id, inks)
     if not result:
-        return ThemeInfo("", "", "none")
-
-    _, first_day_ink = result
-    private_comment = first_day_ink.get("private_comment", "")
-    theme_info = parse_theme_from_comment(private_comment, year)
-
-    if not theme_info:
-        return ThemeInfo("", "", "none")
+        return _NO_THEME
 
-    return ThemeInfo(
-        theme_info["theme"],
-        theme_info["theme_description"],
-        "api"
-    )
+    return _api_theme_info(result[1].get("private_comment", ""), year)
 
 
 # =============================================================================
@@ -357,8 +481,7 @@ def prepare_save_data(date_str: str, year: int, themes: dict) -> SaveData:
     Returns:
         SaveData with date, theme, description, and month_key
     """
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    month_key = f"{year}-{date_obj.month:02d}"
+    month_key = f"{year}-{date_str[5:7]}"
     theme_data = themes.get(month_key, {})
 
     return SaveData(
@@ -382,7 +505,8 @@ def prepare_post_save_updates(
     updated_comment: str,
     date_str: str,
     year: int,
-    current_session: dict
+    current_session: dict,
+    current_api: Optional[dict] = None
 ) -> PostSaveUpdates:
     """
     Prepare state updates after successful API save.
@@ -399,21 +523,30 @@ def prepare_post_save_updates(
         date_str: Date that was saved
         year: Year for assignment parsing
         current_session: Current session assignments
+        current_api: Current API assignments for year, if known; lets the
+                     rebuild patch just the saved ink instead of rescanning
 
     Returns:
         PostSaveUpdates with all coordinated changes
     """
-    # 1. Update local ink data (create new list to avoid mutation)
-    updated_inks = [ink.copy() for ink in inks]
+    # 1. Update local ink data. New list, but only the saved ink is copied;
+    # unchanged ink dicts are shared with the original list (never mutated).
+    updated_inks = list(inks)
 
     # Find the ink by macro_cluster_id and update it
     result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
     if result:
-        ink_idx, _ = result
-        updated_inks[ink_idx]["private_comment"] = updated_comment
+        ink_idx, ink = result
+        updated_inks[ink_idx] = {**ink, "private_comment": updated_comment}
 
     # 2. Re-parse API assignments
-    new_api_assignments = create_explicit_assignments_only(updated_inks, year)
+    if result and current_api is not None:
+        new_api_assignments = update_explicit_assignments(
+            current_api, updated_inks, ink_idx,
+            ink.get("private_comment"), updated_comment, year
+        )
+    else:
+        new_api_assignments = create_explicit_assignments_only(updated_inks, year)
 
     # 3. Remove from session (now in API)
     new_session = current_session.copy()
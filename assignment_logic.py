@@ -1,10 +1,21 @@
 """
 Core ink assignment logic - pure functions for easy testing
 """
-from datetime import datetime
-from typing import List, Dict, Optional
+from calendar import monthrange
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, NamedTuple, Optional
 import json
 import random
+import sys
+
+try:
+    # Comments are parsed per ink on every rebuild, so use orjson's native
+    # parser; the stdlib fallback keeps the pure logic importable without it
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 def normalize_apostrophes(text: str) -> str:
@@ -90,19 +101,20 @@ def extract_ink_info(ink: dict, idx: int) -> dict:
     Returns:
         Dictionary with standardized ink information
     """
+    get = ink.get
     return {
         "index": idx,
-        "macro_cluster_id": ink.get("macro_cluster_id", ""),
-        "brand": ink.get("brand_name", "Unknown"),
-        "name": ink.get("name", "Unknown"),
-        "ink_cluster_tags": ink.get("cluster_tags", []),
-        "color": ink.get("color", ""),
-        "line_name": ink.get("line_name", ""),
-        "kind": ink.get("kind", ""),
-        "used": ink.get("used", False),
-        "usage_count": ink.get("usage_count", 0),
-        "last_used_on": ink.get("last_used_on", ""),
-        "comment": ink.get("comment", ""),
+        "macro_cluster_id": get("macro_cluster_id", ""),
+        "brand": get("brand_name", "Unknown"),
+        "name": get("name", "Unknown"),
+        "ink_cluster_tags": get("cluster_tags", []),
+        "color": get("color", ""),
+        "line_name": get("line_name", ""),
+        "kind": get("kind", ""),
+        "used": get("used", False),
+        "usage_count": get("usage_count", 0),
+        "last_used_on": get("last_used_on", ""),
+        "comment": get("comment", ""),
     }
 
 
@@ -167,6 +179,52 @@ def build_macro_cluster_lookup(inks: List[Dict]) -> Dict[str, Dict]:
     return lookup
 
 
+def build_identifier_lookup(inks: List[Dict]) -> Dict[str, tuple]:
+    """
+    Build a lookup from prefixed identifier to (index, ink).
+
+    Resolves identifiers the same way find_ink_by_identifier() does (first
+    matching ink wins), so callers resolving many identifiers against the same
+    ink list can pay for one pass instead of one scan per identifier.
+
+    Args:
+        inks: List of ink dictionaries
+
+    Returns:
+        Dictionary mapping "macro:..." and "id:..." identifiers to (index, ink) tuples
+    """
+    lookup = {}
+    for idx, ink in enumerate(inks):
+        macro_id = ink.get("macro_cluster_id")
+        if macro_id:
+            lookup.setdefault(f"macro:{macro_id}", (idx, ink))
+        ink_id = ink.get("id")
+        if ink_id:
+            lookup.setdefault(f"id:{ink_id}", (idx, ink))
+    return lookup
+
+
+def build_identifier_to_date(session: Dict[str, str], api: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build a reverse index from ink identifier to its assigned date.
+
+    Mirrors the merged view used by move_ink_assignment() (API wins on
+    conflicting dates; first date wins for an ink assigned twice), so callers
+    making repeated assign calls can build it once and pass it in.
+
+    Args:
+        session: Session assignments {date_str: identifier}
+        api: API assignments {date_str: identifier}
+
+    Returns:
+        Dictionary mapping identifier to date string
+    """
+    identifier_to_date = {}
+    for date_str, identifier in {**session, **api}.items():
+        identifier_to_date.setdefault(identifier, date_str)
+    return identifier_to_date
+
+
 def find_ink_by_identifier(identifier: str, inks: List[Dict]) -> Optional[tuple]:
     """
     Find an ink by its prefixed identifier.
@@ -211,12 +269,85 @@ def parse_comment_json(comment: Optional[str]) -> Dict:
     """
     if not comment:
         return {}
+    # Most comments are free-text notes; only an object can hold swatch data,
+    # so reject anything else without raising and catching a decode error
+    if isinstance(comment, str) and comment.lstrip()[:1] != "{":
+        return {}
     try:
-        return json.loads(comment)
-    except (json.JSONDecodeError, TypeError):
+        return _json_loads(comment)
+    except (ValueError, TypeError):
         return {}
 
 
+@lru_cache(maxsize=16)
+def _swatch_key(year: int) -> str:
+    """Return the private_comment key holding swatch data for a year."""
+    return f"swatch{year}"
+
+
+@lru_cache(maxsize=8)
+def _valid_dates_in_year(year: int) -> frozenset:
+    """Return every YYYY-MM-DD date string in a year."""
+    return frozenset(
+        f"{year:04d}-{month:02d}-{day:02d}"
+        for month in range(1, 13)
+        for day in range(1, monthrange(year, month)[1] + 1)
+    )
+
+
+def _is_valid_date_str(date_str) -> bool:
+    """
+    Check for a real YYYY-MM-DD date without going through strptime.
+
+    Only the zero-padded form is accepted. strptime also took forms like
+    "2026-1-5", but session and API dates are matched as exact strings (the
+    calendar, month buckets and API assignments all use the padded form), so
+    an unpadded date would be stored but never shown.
+    """
+    if not isinstance(date_str, str) or len(date_str) != 10 or not date_str[:4].isdigit():
+        return False
+    year = int(date_str[:4])
+    return year >= 1 and date_str in _valid_dates_in_year(year)
+
+
+@lru_cache(maxsize=4096)
+def _parse_comment_cached(comment: str) -> Dict:
+    """
+    parse_comment_json() memoized by comment string (shared, do not mutate).
+
+    A comment holding several years of swatch data is looked up once per
+    year; this keeps that to a single decode.
+    """
+    return parse_comment_json(comment)
+
+
+@lru_cache(maxsize=4096)
+def _parse_swatch_data(comment: str, year: int) -> Optional[Dict]:
+    """Parse one year's swatch data from a comment string (cached, do not mutate)."""
+    data = _parse_comment_cached(comment)
+    swatch_data = data.get(_swatch_key(year)) if isinstance(data, dict) else None
+    if isinstance(swatch_data, dict):
+        return swatch_data
+    return None
+
+
+def _shared_swatch_data(comment: Optional[str], year: int) -> Optional[Dict]:
+    """
+    Read-only swatch lookup for internal callers.
+
+    The same comment is looked up several times per render (dates, themes,
+    conflict checks), so parses are memoized by comment string. The returned
+    dict is shared with the cache and must not be mutated.
+    """
+    if not comment or not isinstance(comment, str):
+        return None
+    # A substring scan is far cheaper than a parse (or even a cache lookup,
+    # which hashes the whole comment) and rules out most comments
+    if _swatch_key(year) not in comment:
+        return None
+    return _parse_swatch_data(comment, year)
+
+
 def get_swatch_data(comment: Optional[str], year: int) -> Optional[Dict]:
     """
     Get the swatch data for a given year from a comment.
@@ -228,12 +359,9 @@ def get_swatch_data(comment: Optional[str], year: int) -> Optional[Dict]:
     Returns:
         The swatch data dict if found, None otherwise
     """
-    data = parse_comment_json(comment)
-    swatch_key = f"swatch{year}"
-    swatch_data = data.get(swatch_key)
-    if isinstance(swatch_data, dict):
-        return swatch_data
-    return None
+    swatch_data = _shared_swatch_data(comment, year)
+    # Hand out a copy so callers can't modify the cached parse
+    return dict(swatch_data) if swatch_data is not None else None
 
 
 def parse_swatch_date_from_comment(comment: str, year: int) -> Optional[str]:
@@ -247,17 +375,15 @@ def parse_swatch_date_from_comment(comment: str, year: int) -> Optional[str]:
     Returns:
         Date string in YYYY-MM-DD format if found, None otherwise
     """
-    swatch_data = get_swatch_data(comment, year)
-    if not swatch_data or "date" not in swatch_data:
+    swatch_data = _shared_swatch_data(comment, year)
+    if not swatch_data:
         return None
 
-    date_str = swatch_data["date"]
-    try:
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        if date.year == year:
-            return date_str
-    except ValueError:
-        pass
+    # Membership in the year's date set checks format, calendar validity and
+    # year at once, with no datetime built
+    date_str = swatch_data.get("date")
+    if isinstance(date_str, str) and date_str in _valid_dates_in_year(year):
+        return date_str
     return None
 
 
@@ -272,7 +398,7 @@ def parse_theme_from_comment(comment: str, year: int) -> Optional[Dict[str, str]
     Returns:
         Dictionary with 'theme' and 'theme_description' if found, None otherwise
     """
-    swatch_data = get_swatch_data(comment, year)
+    swatch_data = _shared_swatch_data(comment, year)
     if not swatch_data:
         return None
 
@@ -303,7 +429,7 @@ def check_overwrite_conflict(ink: Dict, year: int) -> Optional[Dict]:
             "existing_theme_description": str or None
         }
     """
-    existing_swatch = get_swatch_data(ink.get("private_comment"), year)
+    existing_swatch = _shared_swatch_data(ink.get("private_comment"), year)
     if not existing_swatch:
         return None
 
@@ -345,7 +471,7 @@ def build_swatch_comment_json(
     data = parse_comment_json(existing_comment)
 
     # Build new swatch data
-    swatch_key = f"swatch{year}"
+    swatch_key = _swatch_key(year)
     swatch_data = {"date": date}
 
     # Only include theme fields if they have values
@@ -377,7 +503,7 @@ def remove_swatch_from_comment(existing_comment: Optional[str], year: int) -> st
     data = parse_comment_json(existing_comment)
 
     # Remove the swatch key for this year
-    swatch_key = f"swatch{year}"
+    swatch_key = _swatch_key(year)
     if swatch_key in data:
         del data[swatch_key]
 
@@ -385,6 +511,30 @@ def remove_swatch_from_comment(existing_comment: Optional[str], year: int) -> st
     return json.dumps(data) if data else "{}"
 
 
+def build_swatch_index(inks: List[Dict], year: int) -> List[Optional[Dict]]:
+    """
+    Look up every ink's swatch data for a year in one pass.
+
+    Args:
+        inks: List of ink dictionaries with 'private_comment' field
+        year: The year to read swatch data for
+
+    Returns:
+        List parallel to inks: the swatch dict for that year, or None. The
+        dicts are shared with the parse cache and must not be mutated.
+    """
+    swatch_key = _swatch_key(year)
+    index = []
+    for ink in inks:
+        private_comment = ink.get("private_comment", "")
+        # Most inks have no swatch data for this year; skip the lookup for them
+        if not private_comment or not isinstance(private_comment, str) or swatch_key not in private_comment:
+            index.append(None)
+        else:
+            index.append(_parse_swatch_data(private_comment, year))
+    return index
+
+
 def create_explicit_assignments_only(inks: List[Dict], year: int) -> Dict[str, str]:
     """
     Create assignments only for inks with explicit date assignments in private_comment.
@@ -400,21 +550,72 @@ def create_explicit_assignments_only(inks: List[Dict], year: int) -> Dict[str, s
         return {}
 
     assignments = {}
-    assigned_dates = set()
+    valid_dates = _valid_dates_in_year(year)
 
-    # Check private_comment for assignments (this is where all assignments go)
-    for ink in inks:
-        private_comment = ink.get("private_comment", "")
-        explicit_date = parse_swatch_date_from_comment(private_comment, year)
+    # Check private_comment for assignments (this is where all assignments go).
+    # Parses are memoized per comment, so rebuilding after an unrelated change
+    # doesn't re-run json.loads.
+    for ink, swatch_data in zip(inks, build_swatch_index(inks, year)):
+        if swatch_data is None:
+            continue
+        explicit_date = swatch_data.get("date")
+        if not isinstance(explicit_date, str) or explicit_date not in valid_dates or explicit_date in assignments:
+            continue
         ink_identifier = get_ink_identifier(ink)
-        if explicit_date and ink_identifier:
-            if explicit_date not in assigned_dates:
-                assignments[explicit_date] = ink_identifier
-                assigned_dates.add(explicit_date)
+        if ink_identifier:
+            assignments[explicit_date] = ink_identifier
 
     return assignments
 
 
+def update_explicit_assignments(
+    prev: Dict[str, str],
+    inks: List[Dict],
+    ink_idx: int,
+    old_comment: Optional[str],
+    new_comment: Optional[str],
+    year: int
+) -> Dict[str, str]:
+    """
+    Patch explicit assignments after one ink's private_comment changed.
+
+    Equivalent to create_explicit_assignments_only(inks, year) when prev was
+    built from the same inks before the change, but only touches the changed
+    ink in the common case. Falls back to a full rebuild whenever the change
+    could alter which ink wins a contested date.
+
+    Args:
+        prev: Explicit assignments before the change {date_str: identifier}
+        inks: Ink list after the change
+        ink_idx: Index of the changed ink
+        old_comment: The ink's private_comment before the change
+        new_comment: The ink's private_comment after the change
+        year: The year the assignments are for
+
+    Returns:
+        Updated assignments dict (prev itself if nothing changed for this year)
+    """
+    old_date = parse_swatch_date_from_comment(old_comment, year)
+    new_date = parse_swatch_date_from_comment(new_comment, year)
+    if old_date == new_date:
+        return prev
+
+    identifier = get_ink_identifier(inks[ink_idx])
+    # A vacated date may have been shadowed by another ink, and an occupied
+    # date may be won by whichever ink comes first; only a rescan knows.
+    if not identifier or old_date or new_date in prev:
+        return create_explicit_assignments_only(inks, year)
+
+    # Only remaining case: the ink gained a date nobody else holds
+    updated = prev.copy()
+    updated[new_date] = identifier
+    return updated
+
+
+_MONTH_KEYS = tuple(f"{month:02d}" for month in range(1, 13))
+_MONTH_NUMBERS = {key: month for month, key in enumerate(_MONTH_KEYS, start=1)}
+
+
 def get_month_summary(assignments: Dict[str, str], year: int, month: int) -> List[str]:
     """
     Get all macro_cluster_ids assigned to a specific month.
@@ -427,13 +628,108 @@ def get_month_summary(assignments: Dict[str, str], year: int, month: int) -> Lis
     Returns:
         List of macro_cluster_ids assigned to days in that month
     """
-    month_inks = []
+    # Plain prefix comparison; no datetime is built per assignment
+    month_prefix = f"{year:04d}-{month:02d}-"
+    return [
+        macro_cluster_id
+        for date_str, macro_cluster_id in assignments.items()
+        if date_str.startswith(month_prefix)
+    ]
+
+
+def group_assignments_by_month(assignments: Dict[str, str], year: int) -> Dict[int, List[str]]:
+    """
+    Group assignments for a year by month in a single pass.
+
+    Equivalent to calling get_month_summary() for each of the 12 months,
+    without rescanning the assignments once per month.
+
+    Args:
+        assignments: Dictionary mapping date strings to macro_cluster_ids
+        year: Year to filter by
+
+    Returns:
+        Dictionary mapping every month (1-12) to the list of macro_cluster_ids
+        assigned to days in that month, in assignment order
+    """
+    # Bucket on the "MM" slice itself: no int() per assignment, and a
+    # malformed month simply misses instead of raising
+    buckets = {key: [] for key in _MONTH_KEYS}
+    year_prefix = f"{year:04d}-"
     for date_str, macro_cluster_id in assignments.items():
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        if date.year == year and date.month == month:
+        if not date_str.startswith(year_prefix):
+            continue
+        month_inks = buckets.get(date_str[5:7])
+        if month_inks is not None:
             month_inks.append(macro_cluster_id)
 
-    return month_inks
+    return {month: buckets[key] for month, key in enumerate(_MONTH_KEYS, start=1)}
+
+
+def index_assignments_by_month(assignments: Dict[str, str]) -> Dict[tuple, Dict[str, str]]:
+    """
+    Bucket assignments by (year, month) in a single pass.
+
+    Lets month-scoped lookups touch at most one month of dates instead of
+    prefix-testing every assignment on each call.
+
+    Args:
+        assignments: Dictionary mapping date strings to macro_cluster_ids
+
+    Returns:
+        Dictionary mapping (year, month) to {date_str: macro_cluster_id} for
+        that month, in assignment order. Keys without a valid YYYY-MM- prefix
+        are skipped.
+    """
+    # Group on the raw "YYYY-MM-" slice, then parse each distinct prefix once
+    # rather than int()-parsing every date
+    by_prefix = {}
+    for date_str, macro_cluster_id in assignments.items():
+        prefix = date_str[:8]
+        month_dates = by_prefix.get(prefix)
+        if month_dates is None:
+            month_dates = by_prefix[prefix] = {}
+        month_dates[date_str] = macro_cluster_id
+
+    buckets = {}
+    for prefix, month_dates in by_prefix.items():
+        month = _MONTH_NUMBERS.get(prefix[5:7])
+        if month is None or not prefix[:4].isdigit() or prefix[4] != "-" or prefix[7:8] != "-":
+            continue
+        buckets[(int(prefix[:4]), month)] = month_dates
+    return buckets
+
+
+def update_month_index(buckets: Dict[tuple, Dict[str, str]],
+                       assignments: Dict[str, str],
+                       changed_dates) -> Dict[tuple, Dict[str, str]]:
+    """
+    Update an index_assignments_by_month() result after some dates changed.
+
+    Only the months containing changed dates are rebuilt; the returned index
+    shares every other month's dict with the original, which is left as is.
+
+    Args:
+        buckets: Index built for the previous assignments
+        assignments: New assignments dictionary
+        changed_dates: Dates whose assignment was added, changed or removed
+
+    Returns:
+        Index equal to index_assignments_by_month(assignments)
+    """
+    updated = dict(buckets)
+    for key, month_changes in index_assignments_by_month(dict.fromkeys(changed_dates)).items():
+        month_dates = dict(updated.get(key, {}))
+        for date_str in month_changes:
+            if date_str in assignments:
+                month_dates[date_str] = assignments[date_str]
+            else:
+                month_dates.pop(date_str, None)
+        if month_dates:
+            updated[key] = month_dates
+        else:
+            updated.pop(key, None)
+    return updated
 
 
 def has_assignment(ink: Dict, year: int) -> bool:
@@ -447,10 +743,125 @@ def has_assignment(ink: Dict, year: int) -> bool:
     Returns:
         True if ink has a date assignment for this year
     """
-    swatch_data = get_swatch_data(ink.get("private_comment"), year)
+    swatch_data = _shared_swatch_data(ink.get("private_comment"), year)
     return swatch_data is not None and "date" in swatch_data
 
 
+class InkSearchIndex(NamedTuple):
+    """Search fields for an ink list, normalized once (apostrophes + lowercase)."""
+    inks: List[Dict]
+    names: tuple
+    brands: tuple
+    full_names: tuple
+    color_tags: tuple
+    comments: List[str]  # lowercased private_comment, filled on first use by get_search_comments()
+    active_positions: tuple  # indices of non-archived inks, in list order
+    identifiers: tuple  # get_ink_identifier() per ink ("" when it has none)
+    exact_matches: Dict[str, int]  # normalized name or "brand name" -> first ink index
+    substring_matches: Dict[str, Optional[int]]  # memo of find_ink_by_name fallbacks
+
+
+# Indices for recently searched ink lists, keyed by list identity (each entry
+# holds its list, so the id can't be reused while it is cached). Several
+# sessions' collections fit side by side instead of evicting each other on
+# every call, and a closed session's index ages out of the bounded cache.
+_SEARCH_INDEX_CACHE_SIZE = 8
+
+# Distinct fallback queries remembered per index by find_ink_by_name; the
+# oldest is dropped once full (the memo also goes away with its index)
+_SUBSTRING_MEMO_SIZE = 256
+_search_indices: "OrderedDict[int, InkSearchIndex]" = OrderedDict()
+
+
+def get_ink_search_index(inks: List[Dict]) -> InkSearchIndex:
+    """
+    Get the normalized search index for an ink list.
+
+    Ink lists are replaced rather than mutated when the collection changes,
+    so an index is reused for as long as the same list object is being
+    searched. Indices for the most recently used lists are kept.
+
+    Args:
+        inks: List of ink dictionaries
+
+    Returns:
+        InkSearchIndex with one entry per ink, in list order
+    """
+    key = id(inks)
+    cached = _search_indices.get(key)
+    if cached is not None and cached.inks is inks and len(cached.names) == len(inks):
+        _search_indices.move_to_end(key)
+        return cached
+
+    # After a save the new list shares every unchanged ink dict with the old
+    # one, so carry over normalized fields for inks still at the same position
+    # in the most recently used index (entries are only reused on identity)
+    prev = next(reversed(_search_indices.values()), None) if _search_indices else None
+    if prev is not None and prev.inks is inks:
+        prev = None
+    prev_inks = prev.inks if prev is not None and len(prev.inks) == len(prev.names) else ()
+    names = []
+    brands = []
+    color_tags = []
+    identifiers = []
+    for idx, ink in enumerate(inks):
+        if idx < len(prev_inks) and prev_inks[idx] is ink:
+            names.append(prev.names[idx])
+            brands.append(prev.brands[idx])
+            color_tags.append(prev.color_tags[idx])
+            identifiers.append(prev.identifiers[idx])
+            continue
+        names.append(normalize_apostrophes(ink.get("name", "")).lower())
+        # Brands repeat heavily across a collection; intern so repeats share one string
+        brands.append(sys.intern(normalize_apostrophes(ink.get("brand_name", "")).lower()))
+        # The API can send "cluster_tags": null, so a .get default is not enough
+        color_tags.append(frozenset(tag.lower() for tag in ink.get("cluster_tags") or ()))
+        identifiers.append(get_ink_identifier(ink) or "")
+    names = tuple(names)
+    brands = tuple(brands)
+    full_names = tuple(f"{brand} {name}" for brand, name in zip(brands, names))
+
+    exact_matches = {}
+    for idx, (name, full_name) in enumerate(zip(names, full_names)):
+        exact_matches.setdefault(full_name, idx)
+        exact_matches.setdefault(name, idx)
+
+    index = InkSearchIndex(
+        inks=inks,
+        names=names,
+        brands=brands,
+        full_names=full_names,
+        color_tags=tuple(color_tags),
+        comments=[],
+        active_positions=tuple(idx for idx, ink in enumerate(inks) if not ink.get("archived", False)),
+        identifiers=tuple(identifiers),
+        exact_matches=exact_matches,
+        substring_matches={},
+    )
+    _search_indices.pop(key, None)
+    _search_indices[key] = index
+    if len(_search_indices) > _SEARCH_INDEX_CACHE_SIZE:
+        _search_indices.popitem(last=False)
+    return index
+
+
+def get_search_comments(index: InkSearchIndex) -> List[str]:
+    """
+    Lowercased private comments for an index, built the first time they're needed.
+
+    Only comment queries read them, so the column isn't kept for indices that
+    never search comments. A comment that lowercasing leaves unchanged is
+    shared rather than copied.
+    """
+    comments = index.comments
+    if not comments and index.inks:
+        for ink in index.inks:
+            comment = ink.get("private_comment") or ""
+            lowered = comment.lower()
+            comments.append(comment if lowered == comment else lowered)
+    return comments
+
+
 def find_ink_by_name(ink_name: str, inks: List[Dict]) -> Optional[tuple]:
     """
     Find an ink by name using case-insensitive substring matching.
@@ -468,32 +879,36 @@ def find_ink_by_name(ink_name: str, inks: List[Dict]) -> Optional[tuple]:
     """
     # Normalize apostrophes in search query (LLMs often use curly quotes)
     ink_name_lower = normalize_apostrophes(ink_name).lower()
-
-    # First try exact match
-    for idx, ink in enumerate(inks):
-        brand = normalize_apostrophes(ink.get("brand_name", "")).lower()
-        name = normalize_apostrophes(ink.get("name", "")).lower()
-        full_name = f"{brand} {name}"
-
-        if ink_name_lower == full_name or ink_name_lower == name:
-            return (idx, ink)
-
-    # Then try substring match
-    candidates = []
-    for idx, ink in enumerate(inks):
-        brand = normalize_apostrophes(ink.get("brand_name", "")).lower()
-        name = normalize_apostrophes(ink.get("name", "")).lower()
-        full_name = f"{brand} {name}"
-
-        if ink_name_lower in full_name or ink_name_lower in name:
-            candidates.append((idx, ink))
-
-    if len(candidates) == 1:
-        return candidates[0]
-    elif len(candidates) > 1:
-        # Return best match (shortest name that contains the query)
-        candidates.sort(key=lambda x: len(x[1].get("name", "")))
-        return candidates[0]
+    index = get_ink_search_index(inks)
+
+    # First try exact match (full name or bare name, first ink wins)
+    idx = index.exact_matches.get(ink_name_lower)
+    if idx is not None:
+        return (idx, inks[idx])
+
+    # Then try substring match, tracking the best hit in the same pass
+    # (shortest name that contains the query; first wins ties). The full name
+    # ends with the name, so testing it alone covers both. The result only
+    # depends on the index, so repeat queries (e.g. across a bulk assign or
+    # several tool calls) skip the scan.
+    memo = index.substring_matches
+    if ink_name_lower in memo:
+        best_idx = memo[ink_name_lower]
+    else:
+        best_idx = None
+        best_len = 0
+        for idx, full_name in enumerate(index.full_names):
+            if ink_name_lower in full_name:
+                name_len = len(inks[idx].get("name", ""))
+                if best_idx is None or name_len < best_len:
+                    best_idx = idx
+                    best_len = name_len
+        if len(memo) >= _SUBSTRING_MEMO_SIZE:
+            del memo[next(iter(memo))]
+        memo[ink_name_lower] = best_idx
+
+    if best_idx is not None:
+        return (best_idx, inks[best_idx])
 
     return None
 
@@ -521,7 +936,8 @@ def search_inks(inks: List[Dict], year: int,
                 query: Optional[str] = None,
                 color: Optional[str] = None,
                 brand: Optional[str] = None,
-                include_archived: bool = False) -> List[Dict]:
+                include_archived: bool = False,
+                assigned_identifiers: Optional[set] = None) -> List[Dict]:
     """
     Search inks by name, color tag, or brand.
 
@@ -536,34 +952,41 @@ def search_inks(inks: List[Dict], year: int,
         color: Optional color tag to filter by
         brand: Optional brand name to filter by
         include_archived: Include archived inks in results (default False)
+        assigned_identifiers: Optional set of identifiers currently assigned
+                              (e.g. the merged session + API view). When given,
+                              already_assigned is a set lookup on it instead of
+                              reading each match's private_comment
 
     Returns:
         List of matching ink info dictionaries
     """
     matches = []
-
-    for idx, ink in enumerate(inks):
-        if not include_archived and ink.get("archived", False):
+    index = get_ink_search_index(inks)
+
+    # Normalize filters once (apostrophes for LLM compatibility)
+    query_lower = normalize_apostrophes(query).lower() if query else None
+    color_lower = color.lower() if color else None
+    brand_lower = normalize_apostrophes(brand).lower() if brand else None
+
+    # Cheapest rejections first: a frozenset lookup for color, then the
+    # short brand substring, then the longer full-name substring
+    positions = range(len(inks)) if include_archived else index.active_positions
+    for idx in positions:
+        if color_lower and color_lower not in index.color_tags[idx]:
             continue
 
-        # Apply filters (normalize apostrophes for LLM compatibility)
-        if query:
-            full_name = normalize_apostrophes(f"{ink.get('brand_name', '')} {ink.get('name', '')}").lower()
-            if normalize_apostrophes(query).lower() not in full_name:
-                continue
-
-        if color:
-            color_tags = [tag.lower() for tag in ink.get("cluster_tags", [])]
-            if color.lower() not in color_tags:
-                continue
+        if brand_lower and brand_lower not in index.brands[idx]:
+            continue
 
-        if brand:
-            ink_brand = normalize_apostrophes(ink.get("brand_name", "")).lower()
-            if normalize_apostrophes(brand).lower() not in ink_brand:
-                continue
+        if query_lower and query_lower not in index.full_names[idx]:
+            continue
 
+        ink = inks[idx]
         ink_info = extract_ink_info(ink, idx)
-        ink_info["already_assigned"] = has_assignment(ink, year)
+        if assigned_identifiers is None:
+            ink_info["already_assigned"] = has_assignment(ink, year)
+        else:
+            ink_info["already_assigned"] = index.identifiers[idx] in assigned_identifiers
         matches.append(ink_info)
 
     return matches
@@ -575,6 +998,8 @@ def search_inks(inks: List[Dict], year: int,
 
 class MoveResult:
     """Result of a move_ink_assignment operation."""
+    __slots__ = ("success", "message", "data")
+
     def __init__(self, success: bool, message: str, **kwargs):
         self.success = success
         self.message = message
@@ -584,13 +1009,20 @@ class MoveResult:
         return {"success": self.success, "message": self.message, **self.data}
 
 
+# Failures that carry no per-call details are shared rather than rebuilt on
+# every rejected call; like any MoveResult they are treated as read-only
+_ERR_MISSING_DATES = MoveResult(False, "Must specify from_date or to_date")
+_ERR_MISSING_IDENTIFIER = MoveResult(False, "macro_cluster_id is required for assign operations")
+
+
 def move_ink_assignment(
     session: Dict[str, str],
     api: Dict[str, str],
     from_date: Optional[str],
     to_date: Optional[str],
     macro_cluster_id: Optional[str] = None,
-    inks: Optional[List[Dict]] = None
+    inks: Optional[List[Dict]] = None,
+    identifier_to_date: Optional[Dict[str, str]] = None
 ) -> tuple:
     """
     Unified function for all session assignment mutations.
@@ -611,23 +1043,67 @@ def move_ink_assignment(
         macro_cluster_id: Macro cluster ID of ink to assign. Required for assign, optional for unassign/move
                           (will be derived from session[from_date] if not provided)
         inks: Optional ink list for including ink info in result
+        identifier_to_date: Optional reverse index from build_identifier_to_date()
+                            for the same session/api; avoids rescanning them on assign
 
     Returns:
         (new_session, MoveResult) tuple
         - new_session: Updated session dict (or original if failed)
         - MoveResult: Result object with success, message, and metadata
     """
+    return _move_ink_assignment(
+        session, api, from_date, to_date, macro_cluster_id, inks, identifier_to_date, copy_session=True
+    )
+
+
+def _move_ink_info(
+    macro_cluster_id: str,
+    inks: Optional[List[Dict]],
+    ink_lookup: Optional[tuple] = None
+) -> Dict:
+    """
+    Ink fields for a successful MoveResult.
+
+    Only built on success paths; error results carry just the identifier, so
+    rejected moves skip the ink lookup entirely.
+    """
+    if not inks:
+        return {}
+    if ink_lookup is None:
+        ink_lookup = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
+        if not ink_lookup:
+            return {"macro_cluster_id": macro_cluster_id}
+    idx, ink = ink_lookup
+    return {
+        "macro_cluster_id": macro_cluster_id,
+        "ink_idx": idx,
+        "ink_brand": ink.get("brand_name", "Unknown"),
+        "ink_name": ink.get("name", "Unknown")
+    }
+
+
+def _move_ink_assignment(
+    session: Dict[str, str],
+    api: Dict[str, str],
+    from_date: Optional[str],
+    to_date: Optional[str],
+    macro_cluster_id: Optional[str],
+    inks: Optional[List[Dict]],
+    identifier_to_date: Optional[Dict[str, str]],
+    copy_session: bool,
+    validate_dates: bool = True
+) -> tuple:
+    """Implementation of move_ink_assignment(); mutates session in place when copy_session is False."""
     # Validate: must have at least one of from_date or to_date
     if from_date is None and to_date is None:
-        return session, MoveResult(False, "Must specify from_date or to_date")
+        return session, _ERR_MISSING_DATES
 
-    # Validate date formats
-    for date_str, label in [(from_date, "from_date"), (to_date, "to_date")]:
-        if date_str is not None:
-            try:
-                datetime.strptime(date_str, "%Y-%m-%d")
-            except ValueError:
-                return session, MoveResult(False, f"Invalid {label} format: {date_str}. Use YYYY-MM-DD.")
+    # Validate date formats (skipped for batches whose dates were generated internally)
+    if validate_dates:
+        if from_date is not None and not _is_valid_date_str(from_date):
+            return session, MoveResult(False, f"Invalid from_date format: {from_date}. Use YYYY-MM-DD.")
+        if to_date is not None and not _is_valid_date_str(to_date):
+            return session, MoveResult(False, f"Invalid to_date format: {to_date}. Use YYYY-MM-DD.")
 
     # For unassign/move operations, derive macro_cluster_id from session if not provided
     if from_date is not None:
@@ -639,8 +1115,10 @@ def move_ink_assignment(
                 protected=True, from_date=from_date
             )
 
-        # Check if from_date has a session assignment
-        if from_date not in session:
+        # Check if from_date has a session assignment (one lookup serves
+        # both the membership check and the value)
+        session_macro_id = session.get(from_date)
+        if session_macro_id is None:
             return session, MoveResult(
                 False,
                 f"No session assignment found for {from_date}",
@@ -648,7 +1126,6 @@ def move_ink_assignment(
             )
 
         # Derive or validate macro_cluster_id
-        session_macro_id = session[from_date]
         if macro_cluster_id is None:
             macro_cluster_id = session_macro_id
         elif macro_cluster_id != session_macro_id:
@@ -660,78 +1137,66 @@ def move_ink_assignment(
 
     # For assign operations, macro_cluster_id is required
     if from_date is None and macro_cluster_id is None:
-        return session, MoveResult(False, "macro_cluster_id is required for assign operations")
-
-    # Get ink info now that we have macro_cluster_id resolved
-    ink_info = {}
-    if inks and macro_cluster_id:
-        result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
-        if result:
-            idx, ink = result
-            ink_info = {
-                "macro_cluster_id": macro_cluster_id,
-                "ink_idx": idx,
-                "ink_brand": ink.get("brand_name", "Unknown"),
-                "ink_name": ink.get("name", "Unknown")
-            }
-        else:
-            ink_info = {"macro_cluster_id": macro_cluster_id}
-
-    # Merge for checking what's currently assigned
-    merged = {**session, **api}
+        return session, _ERR_MISSING_IDENTIFIER
 
     # === UNASSIGN (from_date set, to_date None) ===
     if to_date is None:
 
         # Perform unassign
-        new_session = session.copy()
+        new_session = session.copy() if copy_session else session
         del new_session[from_date]
         return new_session, MoveResult(
             True,
             f"Removed assignment from {from_date}",
-            operation="unassign", from_date=from_date, **ink_info
+            operation="unassign", from_date=from_date, **_move_ink_info(macro_cluster_id, inks)
         )
 
     # === ASSIGN (from_date None, to_date set) ===
     if from_date is None:
+        ink_lookup = find_ink_by_macro_cluster_id(macro_cluster_id, inks) if inks else None
+
         # Refuse to assign archived inks to a new date. They remain in the
         # dataset for display, but new assignments must come from the
         # active/non-archived pool.
-        if inks:
-            lookup = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
-            if lookup and lookup[1].get("archived", False):
-                return session, MoveResult(
-                    False,
-                    f"Cannot assign archived ink to {to_date}.",
-                    archived=True, to_date=to_date, **ink_info
-                )
+        if ink_lookup and ink_lookup[1].get("archived", False):
+            return session, MoveResult(
+                False,
+                f"Cannot assign archived ink to {to_date}.",
+                archived=True, to_date=to_date, macro_cluster_id=macro_cluster_id, ink_idx=ink_lookup[0]
+            )
 
         # Check if to_date is API-protected
         if to_date in api:
             return session, MoveResult(
                 False,
                 f"Date {to_date} has a protected API assignment and cannot be modified.",
-                protected=True, to_date=to_date, **ink_info
+                protected=True, to_date=to_date, macro_cluster_id=macro_cluster_id
             )
 
-        # Check if ink is already assigned somewhere
-        if macro_cluster_id in merged.values():
-            # Find where it's assigned
-            assigned_date = next((d for d, mid in merged.items() if mid == macro_cluster_id), None)
+        # Check if ink is already assigned somewhere (single lookup or single pass)
+        if identifier_to_date is not None:
+            assigned_date = identifier_to_date.get(macro_cluster_id)
+        else:
+            # API entries win on shared dates, so skip session dates shadowed by api
+            assigned_date = next(
+                (d for d, mid in session.items() if mid == macro_cluster_id and d not in api),
+                None
+            ) or next((d for d, mid in api.items() if mid == macro_cluster_id), None)
+        if assigned_date is not None:
             return session, MoveResult(
                 False,
                 f"Ink is already assigned to {assigned_date}",
-                already_assigned=True, assigned_date=assigned_date, **ink_info
+                already_assigned=True, assigned_date=assigned_date, macro_cluster_id=macro_cluster_id
             )
 
         # Check if to_date already has a session assignment (will be overwritten)
         displaced_macro_id = session.get(to_date)
 
         # Perform assign
-        new_session = session.copy()
+        new_session = session.copy() if copy_session else session
         new_session[to_date] = macro_cluster_id
 
-        result_data = {"operation": "assign", "to_date": to_date, **ink_info}
+        result_data = {"operation": "assign", "to_date": to_date, **_move_ink_info(macro_cluster_id, inks, ink_lookup)}
         if displaced_macro_id is not None:
             result_data["displaced_macro_cluster_id"] = displaced_macro_id
 
@@ -749,18 +1214,21 @@ def move_ink_assignment(
         return session, MoveResult(
             False,
             f"Date {to_date} has a protected API assignment and cannot be used as destination.",
-            protected=True, to_date=to_date, **ink_info
+            protected=True, to_date=to_date, macro_cluster_id=macro_cluster_id
         )
 
     # Check if to_date already has a session assignment (will be displaced)
     displaced_macro_id = session.get(to_date)
 
     # Perform move (atomic: delete from source, add to target)
-    new_session = session.copy()
+    new_session = session.copy() if copy_session else session
     del new_session[from_date]
     new_session[to_date] = macro_cluster_id
 
-    result_data = {"operation": "move", "from_date": from_date, "to_date": to_date, **ink_info}
+    result_data = {
+        "operation": "move", "from_date": from_date, "to_date": to_date,
+        **_move_ink_info(macro_cluster_id, inks)
+    }
     if displaced_macro_id is not None:
         result_data["displaced_macro_cluster_id"] = displaced_macro_id
 
@@ -771,6 +1239,82 @@ def move_ink_assignment(
     )
 
 
+def _reindex_identifier(identifier_to_date: Dict[str, str], identifier: str,
+                        session: Dict[str, str], api: Dict[str, str]) -> None:
+    """Recompute one identifier's entry the way build_identifier_to_date() would."""
+    for date_str, assigned in session.items():
+        if api.get(date_str, assigned) == identifier:
+            identifier_to_date[identifier] = date_str
+            return
+    for date_str, assigned in api.items():
+        if assigned == identifier and date_str not in session:
+            identifier_to_date[identifier] = date_str
+            return
+    identifier_to_date.pop(identifier, None)
+
+
+def bulk_move_ink_assignments(
+    session: Dict[str, str],
+    api: Dict[str, str],
+    ops: List[tuple],
+    inks: Optional[List[Dict]] = None,
+    validate_dates: bool = True
+) -> tuple:
+    """
+    Apply a sequence of session assignment mutations in one pass.
+
+    Each op is a (from_date, to_date, macro_cluster_id) tuple with the same
+    meaning as the matching move_ink_assignment() arguments. Ops run in order
+    against a single working copy of the session (later ops see earlier
+    results), and the already-assigned check uses a reverse index that is
+    kept current as ops succeed. A failed op leaves the working copy as it was.
+    The copy is only taken by the first successful op, so a batch where
+    every op fails allocates no session dict.
+
+    Args:
+        session: Current session assignments {date_str: macro_cluster_id}
+        api: API assignments {date_str: macro_cluster_id} (read-only, for protection checks)
+        ops: List of (from_date, to_date, macro_cluster_id) tuples
+        inks: Optional ink list for including ink info in results
+        validate_dates: Set False only when every op date was generated as a
+                        valid YYYY-MM-DD string (e.g. from a calendar); API
+                        protection and collision checks always run
+
+    Returns:
+        (new_session, results) tuple
+        - new_session: Session after all successful ops (the input session
+          itself when no op succeeded)
+        - results: One MoveResult per op, in order
+    """
+    working = session
+    identifier_to_date = build_identifier_to_date(working, api)
+    results = []
+
+    for from_date, to_date, macro_cluster_id in ops:
+        moved_id = working.get(from_date, macro_cluster_id) if from_date is not None else macro_cluster_id
+        displaced_id = working.get(to_date) if to_date is not None else None
+
+        # Copy on the first success only; later ops mutate that copy
+        working, result = _move_ink_assignment(
+            working, api, from_date, to_date, macro_cluster_id, inks, identifier_to_date,
+            copy_session=working is session, validate_dates=validate_dates
+        )
+        results.append(result)
+        if not result.success:
+            continue
+
+        # Keep the reverse index in step with the working session; an ink losing
+        # its indexed date falls back to any other date it still holds (e.g. API)
+        if from_date is not None and identifier_to_date.get(moved_id) == from_date:
+            _reindex_identifier(identifier_to_date, moved_id, working, api)
+        if displaced_id is not None and identifier_to_date.get(displaced_id) == to_date:
+            _reindex_identifier(identifier_to_date, displaced_id, working, api)
+        if to_date is not None:
+            identifier_to_date[moved_id] = to_date
+
+    return working, results
+
+
 def swap_ink_assignments(
     session: Dict[str, str],
     api: Dict[str, str],
@@ -795,11 +1339,10 @@ def swap_ink_assignments(
         (new_session, MoveResult) tuple
     """
     # Validate date formats
-    for date_str, label in [(date1, "date1"), (date2, "date2")]:
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            return session, MoveResult(False, f"Invalid {label} format: {date_str}. Use YYYY-MM-DD.")
+    if not _is_valid_date_str(date1):
+        return session, MoveResult(False, f"Invalid date1 format: {date1}. Use YYYY-MM-DD.")
+    if not _is_valid_date_str(date2):
+        return session, MoveResult(False, f"Invalid date2 format: {date2}. Use YYYY-MM-DD.")
 
     # Check if either date is API-protected
     if date1 in api:
@@ -815,10 +1358,9 @@ def swap_ink_assignments(
             protected=True, date=date2
         )
 
-    # Get macro_cluster_ids from merged assignments
-    merged = {**session, **api}
-    macro_id1 = merged.get(date1)
-    macro_id2 = merged.get(date2)
+    # Neither date is in api (checked above), so the session holds both ids
+    macro_id1 = session.get(date1)
+    macro_id2 = session.get(date2)
 
     if macro_id1 is None:
         return session, MoveResult(False, f"No assignment found for {date1}")
@@ -860,6 +1402,7 @@ def shuffle_month_assignments(
     month: int,
     inks: Optional[List[Dict]] = None,
     rng: Optional[random.Random] = None,
+    month_session: Optional[Dict[str, str]] = None,
 ) -> tuple:
     """
     Randomly shuffle ink assignments among session-assigned dates within a month.
@@ -877,6 +1420,9 @@ def shuffle_month_assignments(
         month: Month to shuffle (1-12)
         inks: Optional ink list for including ink info in result
         rng: Optional random.Random instance for deterministic shuffling
+        month_session: Optional session entries already bucketed for this
+                       month (e.g. from index_assignments_by_month()); when
+                       given, only these dates are scanned, not the whole session
 
     Returns:
         (new_session, MoveResult) tuple
@@ -887,17 +1433,15 @@ def shuffle_month_assignments(
     if rng is None:
         rng = random.Random()
 
-    # Collect session-assigned dates within this month (excluding API-protected)
-    month_dates = []
-    for date_str in session:
-        if date_str in api:
-            continue
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            continue
-        if dt.year == year and dt.month == month:
-            month_dates.append(date_str)
+    # Collect session-assigned dates within this month (excluding API-protected).
+    # The prefix check rejects other months; candidates are validated against
+    # the year's date set rather than with strptime.
+    month_prefix = f"{year:04d}-{month:02d}-"
+    valid_dates = _valid_dates_in_year(year)
+    month_dates = [
+        date_str for date_str in (session if month_session is None else month_session)
+        if date_str.startswith(month_prefix) and date_str in valid_dates and date_str not in api
+    ]
 
     if len(month_dates) < 2:
         return session, MoveResult(
@@ -3,10 +3,11 @@ Chat initialization helpers for the ink scheduler app.
 
 These functions set up the LLM chat with tools and context.
 """
+import asyncio
 import traceback
 
 from llm_organizer import create_llm_chat
-from chat_tools import create_tool_functions
+from chat_tools import as_async_tool, create_tool_functions
 from app_helpers import get_chat_system_prompt
 
 
@@ -53,11 +54,78 @@ def initialize_chat_session(
             api_assignments_reactive,
             session_themes_reactive
         )
+        # Registered as coroutines; the app drives the chat with stream_async()
         for tool_func in tool_functions:
-            chat_obj.register_tool(tool_func)
+            chat_obj.register_tool(as_async_tool(tool_func))
 
         return chat_obj, snapshot_updater
 
     except Exception as e:
         print(f"Chat initialization error: {traceback.format_exc()}")
         return None
+
+
+async def coalesce_stream(stream, max_chars: int = 8192, max_interval: float = 0.025):
+    """
+    Coalesce a streamed LLM response into fewer, larger text chunks.
+
+    Text chunks are buffered and emitted once the buffer reaches max_chars or
+    max_interval seconds have passed since the last emit, cutting per-token
+    message framing in the chat UI. Non-text content (tool requests/results
+    from content="all") flushes the buffer and passes through unchanged so
+    ordering is preserved.
+
+    Args:
+        stream: Async iterator of response chunks (e.g. from stream_async())
+        max_chars: Buffered text size that forces an emit
+        max_interval: Seconds since the last emit that force an emit
+
+    Yields:
+        Joined text chunks and non-text content items, in stream order
+    """
+    loop = asyncio.get_running_loop()
+    buffer = []
+    buffered_chars = 0
+    last_emit = loop.time()
+
+    async for chunk in stream:
+        if not isinstance(chunk, str):
+            if buffer:
+                yield "".join(buffer)
+                buffer, buffered_chars = [], 0
+            yield chunk
+            last_emit = loop.time()
+            continue
+
+        buffer.append(chunk)
+        buffered_chars += len(chunk)
+        now = loop.time()
+        if buffered_chars >= max_chars or now - last_emit >= max_interval:
+            yield "".join(buffer)
+            buffer, buffered_chars = [], 0
+            last_emit = now
+
+    if buffer:
+        yield "".join(buffer)
+
+
+async def batch_stream_writes(stream, batch_writes):
+    """
+    Hold tool writes back for the whole of a streamed LLM response.
+
+    The chat UI consumes the stream in a background task, and tool calls run
+    while it is iterated, so the batch has to span the iteration itself
+    rather than the call that starts it. The batch closes when the stream
+    ends, fails or is cancelled, publishing the turn's writes once.
+
+    Args:
+        stream: Async iterator of response chunks (e.g. from stream_async())
+        batch_writes: Context manager factory from the snapshot updater
+                      (snapshot_updater.batch_writes)
+
+    Yields:
+        The stream's chunks, unchanged
+    """
+    with batch_writes():
+        async for chunk in stream:
+            yield chunk
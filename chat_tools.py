@@ -18,22 +18,72 @@ Session format:
     }
 }
 """
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from typing import List, Dict, Optional, Any
+import asyncio
 import calendar
 
 from assignment_logic import (
     extract_ink_info,
     find_ink_by_name,
-    find_ink_by_macro_cluster_id,
+    build_identifier_lookup,
     get_ink_identifier,
+    get_ink_search_index,
+    get_search_comments,
+    index_assignments_by_month,
+    update_month_index,
     normalize_apostrophes,
     search_inks as search_inks_pure,
     move_ink_assignment,
+    bulk_move_ink_assignments,
     shuffle_month_assignments,
-    assignable_inks,
 )
 
 
+# calendar.month_name runs strftime on every lookup; the names don't change
+# while the app runs, so index a plain tuple instead (_MONTH_NAMES[0] == "")
+_MONTH_NAMES = tuple(calendar.month_name)
+
+# Membership instead of a chained comparison: also rejects a non-int month
+# (e.g. "3" from a tool call) instead of raising TypeError
+_VALID_MONTHS = frozenset(range(1, 13))
+
+
+@lru_cache(maxsize=8)
+def _year_month_lengths(year: int) -> tuple:
+    """Return the number of days in each month of a year (January first)."""
+    return tuple(calendar.monthrange(year, month)[1] for month in range(1, 13))
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Return the number of days in a month (1-12)."""
+    return _year_month_lengths(year)[month - 1]
+
+
+def as_async_tool(func):
+    """
+    Wrap a tool function as a coroutine function for stream_async().
+
+    The body still runs on the event loop rather than in a worker thread:
+    tools set Shiny reactive values and share the snapshot, neither of which
+    is thread-safe. Yielding once before the call lets already-received
+    stream output go out ahead of the tool's CPU work.
+
+    Args:
+        func: Tool function returned by create_tool_functions()
+
+    Returns:
+        Async function with the same name, docstring and signature
+    """
+    @wraps(func)
+    async def async_tool(*args, **kwargs):
+        await asyncio.sleep(0)
+        return func(*args, **kwargs)
+
+    return async_tool
+
+
 def create_tool_functions(ink_data_reactive, selected_year_reactive,
                           session_assignments_reactive, api_assignments_reactive,
                           session_themes_reactive=None):
@@ -50,8 +100,15 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
     Returns:
         Tuple of (tool_functions_list, snapshot_updater_function)
         Call the snapshot_updater before each stream_async() call.
+        snapshot_updater.batch_writes() is a context manager that holds tool
+        writes back from the reactive values until it exits, so a turn that
+        runs several write tools publishes each changed value once.
     """
-    # Snapshot storage for async-safe access
+    # Snapshot storage for async-safe access. The session/api/themes reactive
+    # values follow a copy-on-write rule: neither the app nor these tools ever
+    # mutate a dict that has been set on them (every change builds a new dict
+    # and calls .set()). The snapshot can therefore hold those same objects,
+    # both when refreshed and after a tool writes, without copying.
     _snapshot = {
         "inks": [],
         "year": 2026,
@@ -60,45 +117,197 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         "themes": {}
     }
 
+    # Open batch depth and the snapshot keys written since the outermost
+    # batch opened; those keys are ahead of their reactive values
+    _batch = {"depth": 0, "pending": set()}
+
     def update_snapshot():
         """Update snapshot from reactive values. Call before stream_async()."""
         _snapshot["inks"] = ink_data_reactive.get()
         _snapshot["year"] = selected_year_reactive.get()
-        _snapshot["session"] = session_assignments_reactive.get().copy()
-        _snapshot["api"] = api_assignments_reactive.get().copy()
-        if session_themes_reactive is not None:
-            _snapshot["themes"] = session_themes_reactive.get().copy()
+        # Unpublished batch writes are newer than the reactive values
+        if "session" not in _batch["pending"]:
+            _snapshot["session"] = session_assignments_reactive.get()
+        _snapshot["api"] = api_assignments_reactive.get()
+        if session_themes_reactive is not None and "themes" not in _batch["pending"]:
+            _snapshot["themes"] = session_themes_reactive.get()
+
+    def _publish(key: str, value: Dict):
+        """Store a tool write in the snapshot; set the reactive now unless batching."""
+        _snapshot[key] = value
+        if _batch["depth"]:
+            _batch["pending"].add(key)
+        elif key == "session":
+            session_assignments_reactive.set(value)
+        else:
+            session_themes_reactive.set(value)
+
+    @contextmanager
+    def batch_writes():
+        """
+        Defer reactive updates from tool writes until the outermost batch exits.
+
+        Tools keep reading and writing the snapshot as usual, so later calls
+        in the batch see earlier writes. On exit (including on error or
+        cancellation) each changed value is set once, with its final dict.
+        """
+        _batch["depth"] += 1
+        try:
+            yield
+        finally:
+            _batch["depth"] -= 1
+            if not _batch["depth"]:
+                pending, _batch["pending"] = _batch["pending"], set()
+                if "session" in pending:
+                    session_assignments_reactive.set(_snapshot["session"])
+                if "themes" in pending:
+                    session_themes_reactive.set(_snapshot["themes"])
+
+    update_snapshot.batch_writes = batch_writes
+
+    # Reverse indices derived from the snapshot's session/api dicts. Because
+    # those dicts are never mutated in place, holding the source objects and
+    # comparing identity is enough to know when to rebuild; several tool calls
+    # in one LLM turn share a single build.
+    _derived = {"session": None, "api": None, "api_ids": set()}
+
+    def _assignment_indices() -> Dict[str, Any]:
+        """
+        Reverse indices for the current snapshot (shared, do not mutate).
+
+        Returns a dict with:
+            assigned: identifiers in the merged view (API shadows session)
+            api_ids: identifiers with an API assignment
+            session_to_date: identifier -> session date
+        """
+        session, api = _snapshot["session"], _snapshot["api"]
+        if _derived["session"] is not session or _derived["api"] is not api:
+            # Tool writes only replace the session; keep the API set then
+            api_ids = _derived["api_ids"] if _derived["api"] is api else set(api.values())
+            assigned = set(api_ids)
+            # Session entries on API dates are shadowed in the merged view
+            if api:
+                assigned.update(mid for date_str, mid in session.items() if date_str not in api)
+            else:
+                assigned.update(session.values())
+            _derived.update(
+                session=session,
+                api=api,
+                assigned=assigned,
+                api_ids=api_ids,
+                session_to_date={macro_id: date for date, macro_id in session.items()},
+            )
+        return _derived
+
+    def _assigned_identifiers():
+        """Identifiers in the merged view, without building the merged dict."""
+        return _assignment_indices()["assigned"]
+
+    # (identifier, extract_ink_info()) per non-archived ink, indexed relative
+    # to the assignable inks; rebuilt when the ink list is replaced
+    _listing_cache = {"inks": None, "entries": ()}
+
+    def _ink_listing() -> tuple:
+        """Projected assignable inks for list_all_inks (shared, copy before changing)."""
+        inks = _snapshot["inks"]
+        if _listing_cache["inks"] is not inks:
+            index = get_ink_search_index(inks)
+            _listing_cache.update(inks=inks, entries=tuple(
+                (index.identifiers[pos], extract_ink_info(inks[pos], idx))
+                for idx, pos in enumerate(index.active_positions)
+            ))
+        return _listing_cache["entries"]
+
+    def _resolve_month(month, year: Optional[int]) -> tuple:
+        """
+        Apply the default year and validate the month for month-scoped tools.
+
+        Returns:
+            (year, None) when valid, or (year, error_response) for a bad month
+        """
+        if year is None:
+            year = _snapshot["year"]
+        if month not in _VALID_MONTHS:
+            return year, {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        return year, None
+
+    # Identifier -> (index, ink) for the snapshot's ink list; ink lists are
+    # replaced rather than mutated, so it is rebuilt on identity change
+    _ink_lookup_cache = {"inks": None, "lookup": {}}
+
+    def _ink_lookup() -> Dict[str, tuple]:
+        """Resolve identifiers like find_ink_by_identifier() without a scan per call (do not mutate)."""
+        inks = _snapshot["inks"]
+        if _ink_lookup_cache["inks"] is not inks:
+            _ink_lookup_cache.update(inks=inks, lookup=build_identifier_lookup(inks))
+        return _ink_lookup_cache["lookup"]
+
+    # (year, month) buckets per source dict, rebuilt on identity change like
+    # the indices above; session writes leave the API buckets in place
+    _month_buckets = {}
+
+    def _set_session(new_session: Dict[str, str]):
+        """
+        Publish a tool's new session dict to the snapshot and (unless batching) the app.
+
+        If the old session's month buckets are cached they are patched for
+        just the dates that differ (found with a C-level items() diff)
+        instead of being rebuilt from scratch on the next month lookup.
+        """
+        old_session = _snapshot["session"]
+        _publish("session", new_session)
+        cached = _month_buckets.get("session")
+        if cached is not None and cached[0] is old_session:
+            changed = {date_str for date_str, _ in old_session.items() ^ new_session.items()}
+            _month_buckets["session"] = (new_session, update_month_index(cached[1], new_session, changed))
+
+    def _ink_fields(idx: int, ink: Dict) -> Dict[str, Any]:
+        """Ink details added to failed move results returned to the model."""
+        return {
+            "ink_idx": idx,
+            "ink_brand": ink.get("brand_name", "Unknown"),
+            "ink_name": ink.get("name", "Unknown")
+        }
 
-    def _get_merged_assignments():
-        """Get merged view of API + session assignments. API takes precedence."""
-        return {**_snapshot["session"], **_snapshot["api"]}
+    def _month_dates(source: str, year: int, month: int) -> Dict[str, str]:
+        """Dates -> identifiers of the "session" or "api" snapshot dict in one month (do not mutate)."""
+        assignments = _snapshot[source]
+        cached = _month_buckets.get(source)
+        if cached is None or cached[0] is not assignments:
+            cached = _month_buckets[source] = (assignments, index_assignments_by_month(assignments))
+        return cached[1].get((year, month), {})
 
-    def list_all_inks() -> Dict[str, Any]:
+    def list_all_inks(limit: Optional[int] = None) -> Dict[str, Any]:
         """
         List all inks in the collection with their basic information.
 
         Returns a summary of all available inks including brand, name, color tags,
         and whether they're already assigned for the current year. Archived inks
         are excluded since they aren't candidates for new assignments.
+
+        Args:
+            limit: Optional maximum number of inks to return (default: all).
+                   total_inks still counts the whole collection.
         """
+        if limit is not None and (type(limit) is not int or limit < 1):
+            return {"success": False, "message": f"Invalid limit: {limit}. Must be a positive integer."}
+
         inks = _snapshot["inks"]
 
         if not inks:
             return {"success": False, "message": "No inks available in collection"}
 
-        inks = assignable_inks(inks)
+        # Ink fields only change with the ink list, so the per-ink projection
+        # is built once per list; each call copies it and adds the flag
+        entries = _ink_listing()
+        assigned_macro_ids = _assigned_identifiers()
 
-        merged = _get_merged_assignments()
-        assigned_macro_ids = set(merged.values())
-
-        ink_list = []
-        for idx, ink in enumerate(inks):
-            ink_info = extract_ink_info(ink, idx)
-            ink_id = get_ink_identifier(ink) or ""
-            ink_info["already_assigned"] = ink_id in assigned_macro_ids
-            ink_list.append(ink_info)
+        ink_list = [
+            {**ink_info, "already_assigned": identifier in assigned_macro_ids}
+            for identifier, ink_info in (entries if limit is None else entries[:limit])
+        ]
 
-        return {"success": True, "total_inks": len(inks), "inks": ink_list}
+        return {"success": True, "total_inks": len(entries), "inks": ink_list}
 
     def search_inks(query: Optional[str] = None, color: Optional[str] = None,
                     brand: Optional[str] = None) -> Dict[str, Any]:
@@ -118,16 +327,11 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         if not inks:
             return {"success": False, "message": "No inks available in collection"}
 
-        # Get base matches from pure function
-        matches = search_inks_pure(inks, year, query, color, brand)
-
-        # Update assignment status based on merged assignments
-        merged = _get_merged_assignments()
-        assigned_macro_ids = set(merged.values())
-
-        for match in matches:
-            ink_id = get_ink_identifier(inks[match["index"]]) or ""
-            match["already_assigned"] = ink_id in assigned_macro_ids
+        # Assignment status comes from the merged session + API view rather
+        # than the inks' saved comments
+        matches = search_inks_pure(
+            inks, year, query, color, brand, assigned_identifiers=_assigned_identifiers()
+        )
 
         return {"success": True, "matches_found": len(matches), "matches": matches}
 
@@ -141,44 +345,44 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
 
         Returns information about which inks are assigned to which dates in that month.
         """
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
         inks = _snapshot["inks"]
         if not inks:
             return {"success": False, "message": "No inks available in collection"}
 
-        merged = _get_merged_assignments()
-        api = _snapshot["api"]
-        days_in_month = calendar.monthrange(year, month)[1]
+        days_in_month = _days_in_month(year, month)
 
-        # Filter to this month
+        # Merged view of this month only (API takes precedence)
+        api_month = _month_dates("api", year, month)
+        month_assignments = {**_month_dates("session", year, month), **api_month}
+        # Empty months (most of them when walking a sparse year) return without
+        # building the collection-wide identifier lookup
+        ink_lookup = _ink_lookup() if month_assignments else {}
         assignments = []
-        for date_str, macro_cluster_id in merged.items():
-            if date_str.startswith(f"{year}-{month:02d}-"):
-                day = int(date_str.split("-")[2])
-                result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
-                if result:
-                    idx, ink = result
-                    assignments.append({
-                        "date": date_str,
-                        "day": day,
-                        "macro_cluster_id": macro_cluster_id,
-                        "ink_index": idx,
-                        "brand": ink.get("brand_name", "Unknown"),
-                        "name": ink.get("name", "Unknown"),
-                        "protected": date_str in api  # From API = protected
-                    })
+        for date_str, macro_cluster_id in month_assignments.items():
+            day = int(date_str[8:10])
+            result = ink_lookup.get(macro_cluster_id)
+            if result:
+                idx, ink = result
+                assignments.append({
+                    "date": date_str,
+                    "day": day,
+                    "macro_cluster_id": macro_cluster_id,
+                    "ink_index": idx,
+                    "brand": ink.get("brand_name", "Unknown"),
+                    "name": ink.get("name", "Unknown"),
+                    "protected": date_str in api_month  # From API = protected
+                })
 
         assignments.sort(key=lambda x: x["day"])
 
         return {
             "success": True,
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year,
             "days_in_month": days_in_month,
             "assigned_days": len(assignments),
@@ -231,11 +435,10 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         )
 
         if not move_result.success:
-            return move_result.to_dict()
+            # Error results carry only the identifier; name the ink for the model
+            return {**move_result.to_dict(), **_ink_fields(idx, ink)}
 
-        # Update reactive state and snapshot
-        session_assignments_reactive.set(new_session)
-        _snapshot["session"] = new_session.copy()
+        _set_session(new_session)
 
         return {
             "success": True,
@@ -262,25 +465,23 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         Distributes the inks across available days in the month. Will NOT modify
         dates that have API assignments (protected).
         """
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
         inks = _snapshot["inks"]
         if not inks:
             return {"success": False, "message": "No inks available in collection"}
 
-        days_in_month = calendar.monthrange(year, month)[1]
-        merged = _get_merged_assignments()
+        days_in_month = _days_in_month(year, month)
 
-        # Find available days (not in merged assignments)
-        occupied_days = set()
-        for date_str in merged.keys():
-            if date_str.startswith(f"{year}-{month:02d}-"):
-                day = int(date_str.split("-")[2])
-                occupied_days.add(day)
+        # Find available days (not in merged assignments); the set dedups
+        # dates held by both, so no merged dict is needed
+        occupied_days = {
+            int(date_str[8:10])
+            for dates in (_month_dates("session", year, month), _month_dates("api", year, month))
+            for date_str in dates
+        }
 
         available_days = [d for d in range(1, days_in_month + 1) if d not in occupied_days]
 
@@ -292,9 +493,9 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
             }
 
         successful, failed, already_assigned = [], [], []
-        session = _snapshot["session"].copy()
-        assigned_macro_ids = set(merged.values())
 
+        # Resolve inks to (from_date, to_date, id) ops, then apply them in one batch
+        ops, pending = [], []
         for i, ink_id in enumerate(ink_identifiers):
             if i >= len(available_days):
                 break
@@ -311,7 +512,19 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
                 failed.append({"ink_identifier": ink_id, "reason": "No identifier"})
                 continue
 
-            if macro_cluster_id in assigned_macro_ids:
+            day = available_days[i]
+            date_str = f"{year}-{month:02d}-{day:02d}"
+            ops.append((None, date_str, macro_cluster_id))
+            pending.append((ink_id, idx, ink, macro_cluster_id, date_str, day))
+
+        # Dates come from the month's own day list, so skip re-validating them.
+        # When every lookup failed there is nothing to apply.
+        session, move_results = bulk_move_ink_assignments(
+            _snapshot["session"], _snapshot["api"], ops, validate_dates=False
+        ) if ops else (_snapshot["session"], [])
+
+        for (ink_id, idx, ink, macro_cluster_id, date_str, day), move_result in zip(pending, move_results):
+            if move_result.data.get("already_assigned"):
                 already_assigned.append({
                     "ink_identifier": ink_id,
                     "macro_cluster_id": macro_cluster_id,
@@ -319,32 +532,26 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
                     "brand": ink.get("brand_name"),
                     "name": ink.get("name")
                 })
-                continue
-
-            day = available_days[i]
-            date_str = f"{year}-{month:02d}-{day:02d}"
-
-            session[date_str] = macro_cluster_id
-            assigned_macro_ids.add(macro_cluster_id)
-
-            successful.append({
-                "macro_cluster_id": macro_cluster_id,
-                "ink_index": idx,
-                "brand": ink.get("brand_name"),
-                "name": ink.get("name"),
-                "date": date_str,
-                "day": day
-            })
+            elif not move_result.success:
+                failed.append({"ink_identifier": ink_id, "reason": move_result.message})
+            else:
+                successful.append({
+                    "macro_cluster_id": macro_cluster_id,
+                    "ink_index": idx,
+                    "brand": ink.get("brand_name"),
+                    "name": ink.get("name"),
+                    "date": date_str,
+                    "day": day
+                })
 
         if successful:
-            session_assignments_reactive.set(session)
-            _snapshot["session"] = session.copy()
+            _set_session(session)
 
         return {
             "success": len(successful) > 0,
-            "message": f"Bulk assignment to {calendar.month_name[month]} {year} complete",
+            "message": f"Bulk assignment to {_MONTH_NAMES[month]} {year} complete",
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year,
             "successful_assignments": len(successful),
             "failed_assignments": len(failed),
@@ -374,11 +581,14 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         )
 
         if not move_result.success:
-            return move_result.to_dict()
+            response = move_result.to_dict()
+            # A protected date still names the API ink that holds it
+            found = _ink_lookup().get(_snapshot["api"].get(date_str))
+            if found:
+                response.update(_ink_fields(*found))
+            return response
 
-        # Update reactive state and snapshot
-        session_assignments_reactive.set(new_session)
-        _snapshot["session"] = new_session.copy()
+        _set_session(new_session)
 
         return {
             "success": True,
@@ -398,57 +608,50 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
 
         Will NOT remove API assignments (protected). Only clears session assignments.
         """
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
-
-        inks = _snapshot["inks"]
-        session = _snapshot["session"]
-        api = _snapshot["api"]
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
+        ink_lookup = _ink_lookup()
         removed = []
         protected = []
-        new_session = session.copy()
-
-        month_prefix = f"{year}-{month:02d}-"
 
         # Check API assignments for protected count
-        for date_str, macro_cluster_id in api.items():
-            if date_str.startswith(month_prefix):
-                result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
-                if result:
-                    _, ink = result
-                    protected.append({
-                        "date": date_str,
-                        "brand": ink.get("brand_name"),
-                        "name": ink.get("name"),
-                        "reason": "Protected (from API)"
-                    })
-
-        # Remove session assignments for this month
-        for date_str, macro_cluster_id in list(session.items()):
-            if date_str.startswith(month_prefix):
-                result = find_ink_by_macro_cluster_id(macro_cluster_id, inks)
-                ink = result[1] if result else {}
-                removed.append({
+        for date_str, macro_cluster_id in _month_dates("api", year, month).items():
+            result = ink_lookup.get(macro_cluster_id)
+            if result:
+                _, ink = result
+                protected.append({
                     "date": date_str,
-                    "day": int(date_str.split("-")[2]),
                     "brand": ink.get("brand_name"),
-                    "name": ink.get("name")
+                    "name": ink.get("name"),
+                    "reason": "Protected (from API)"
                 })
-                del new_session[date_str]
+
+        # Remove session assignments for this month
+        session_month = _month_dates("session", year, month)
+        for date_str, macro_cluster_id in session_month.items():
+            result = ink_lookup.get(macro_cluster_id)
+            ink = result[1] if result else {}
+            removed.append({
+                "date": date_str,
+                "day": int(date_str[8:10]),
+                "brand": ink.get("brand_name"),
+                "name": ink.get("name")
+            })
 
         if removed:
-            session_assignments_reactive.set(new_session)
-            _snapshot["session"] = new_session.copy()
+            # C-level copy, then drop just this month's (<= 31) dates
+            new_session = _snapshot["session"].copy()
+            for date_str in session_month:
+                del new_session[date_str]
+            _set_session(new_session)
 
         return {
             "success": len(removed) > 0 or len(protected) == 0,
-            "message": f"Cleared session assignments for {calendar.month_name[month]} {year}",
+            "message": f"Cleared session assignments for {_MONTH_NAMES[month]} {year}",
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year,
             "removed_count": len(removed),
             "protected_count": len(protected),
@@ -472,41 +675,30 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         if not inks:
             return {"success": False, "message": "No inks available in collection"}
 
-        merged = _get_merged_assignments()
-        api = _snapshot["api"]
-
-        monthly_counts = {month: {"total": 0, "api": 0, "session": 0} for month in range(1, 13)}
+        month_lengths = _year_month_lengths(year)
         total_assigned = 0
-
-        for date_str, ink_idx in merged.items():
-            try:
-                parts = date_str.split("-")
-                if int(parts[0]) == year:
-                    month = int(parts[1])
-                    monthly_counts[month]["total"] += 1
-                    if date_str in api:
-                        monthly_counts[month]["api"] += 1
-                    else:
-                        monthly_counts[month]["session"] += 1
-                    total_assigned += 1
-            except (ValueError, IndexError):
-                pass
-
         monthly_summary = []
         for month in range(1, 13):
-            days_in_month = calendar.monthrange(year, month)[1]
-            counts = monthly_counts[month]
+            days_in_month = month_lengths[month - 1]
+            # Session entries on API dates are shadowed in the merged view
+            api_month = _month_dates("api", year, month)
+            api_count = len(api_month)
+            session_count = sum(
+                1 for date_str in _month_dates("session", year, month) if date_str not in api_month
+            )
+            month_total = api_count + session_count
+            total_assigned += month_total
             monthly_summary.append({
                 "month": month,
-                "month_name": calendar.month_name[month],
+                "month_name": _MONTH_NAMES[month],
                 "days_in_month": days_in_month,
-                "assigned_days": counts["total"],
-                "api_assignments": counts["api"],
-                "session_assignments": counts["session"],
-                "unassigned_days": days_in_month - counts["total"]
+                "assigned_days": month_total,
+                "api_assignments": api_count,
+                "session_assignments": session_count,
+                "unassigned_days": days_in_month - month_total
             })
 
-        total_days = sum(calendar.monthrange(year, m)[1] for m in range(1, 13))
+        total_days = sum(month_lengths)
 
         return {
             "success": True,
@@ -552,48 +744,57 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
 
         # Archived inks remain in the dataset for display only; they are not
         # candidates for assignment / reshuffling so they're filtered here.
-        inks = assignable_inks(inks)
-
-        api = _snapshot["api"]
-        session = _snapshot["session"]
-
-        # Build reverse lookups: macro_cluster_id -> date
-        api_assigned_macro_ids = set(api.values())
-        session_macro_id_to_date = {macro_id: date for date, macro_id in session.items()}
-
-        def matches_filters(ink: dict) -> bool:
-            """Check if ink matches all provided filters."""
-            if query:
-                # Normalize apostrophes for LLM compatibility (curly vs ASCII quotes)
-                query_normalized = normalize_apostrophes(query).lower()
-                name_match = query_normalized in normalize_apostrophes(ink.get("name", "")).lower()
-                brand_match = query_normalized in normalize_apostrophes(ink.get("brand_name", "")).lower()
-                tags = ink.get("cluster_tags", [])
-                tag_match = any(query_normalized in tag.lower() for tag in tags)
-                comment = ink.get("private_comment", "")
-                comment_match = query_normalized in comment.lower() if comment else False
-
-                if not (name_match or brand_match or tag_match or comment_match):
-                    return False
-
-            if color:
-                tags = ink.get("cluster_tags", [])
-                if not any(color.lower() in tag.lower() for tag in tags):
-                    return False
-
-            if brand:
-                brand_normalized = normalize_apostrophes(brand).lower()
-                ink_brand = normalize_apostrophes(ink.get("brand_name", "")).lower()
-                if brand_normalized not in ink_brand:
-                    return False
+        # Positions into the full list are kept so the shared search index
+        # (normalized names/brands, lowercased tags and comments) can be read per ink.
+        search_index = get_ink_search_index(inks)
+        positions = search_index.active_positions
+
+        # Reverse lookups (macro_cluster_id -> date), shared across tool calls
+        indices = _assignment_indices()
+        api_assigned_macro_ids = indices["api_ids"]
+        session_macro_id_to_date = indices["session_to_date"]
+
+        # Normalize filters once rather than per ink (apostrophes for LLM
+        # compatibility: curly vs ASCII quotes)
+        query_normalized = normalize_apostrophes(query).lower() if query else None
+        color_lower = color.lower() if color else None
+        brand_normalized = normalize_apostrophes(brand).lower() if brand else None
+
+        # Index columns as plain locals for the per-ink checks below
+        names, brands = search_index.names, search_index.brands
+        color_tags = search_index.color_tags
+        comments = get_search_comments(search_index) if query_normalized else ()
+        identifiers = search_index.identifiers
+        has_filters = bool(query_normalized or color_lower or brand_normalized)
+
+        def matches_filters(pos: int) -> bool:
+            """Check if the ink at position pos in the full list matches all provided filters."""
+            # Cheapest rejections first: one brand substring, then the tags,
+            # then the query across every field
+            if brand_normalized and brand_normalized not in brands[pos]:
+                return False
+
+            tags_lower = color_tags[pos]
+            if color_lower and not any(color_lower in tag for tag in tags_lower):
+                return False
+
+            if query_normalized:
+                # Stop at the first field that matches
+                return (
+                    query_normalized in names[pos]
+                    or query_normalized in brands[pos]
+                    or any(query_normalized in tag for tag in tags_lower)
+                    or query_normalized in comments[pos]
+                )
 
             return True
 
         available_inks = []
         counts = {"unassigned": 0, "session_assigned": 0, "api_assigned": 0}
 
-        for idx, ink in enumerate(inks):
-            macro_cluster_id = get_ink_identifier(ink) or ""
+        for idx, pos in enumerate(positions):
+            ink = inks[pos]
+            macro_cluster_id = identifiers[pos]
 
             # Categorize the ink
             if macro_cluster_id in api_assigned_macro_ids:
@@ -611,7 +812,9 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
                 status = "unassigned"
                 current_date = None
 
-            if not matches_filters(ink):
+            # Keep counting the whole collection for the summary, but stop
+            # filtering and building results once the limit is reached
+            if len(available_inks) >= limit or (has_filters and not matches_filters(pos)):
                 continue
 
             ink_info = extract_ink_info(ink, idx)
@@ -621,13 +824,10 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
 
             available_inks.append(ink_info)
 
-            if len(available_inks) >= limit:
-                break
-
         return {
             "success": True,
             "collection_summary": {
-                "total_inks": len(inks),
+                "total_inks": len(positions),
                 "unassigned": counts["unassigned"],
                 "session_assigned": counts["session_assigned"],
                 "api_assigned_immovable": counts["api_assigned"]
@@ -668,20 +868,20 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         session = _snapshot["session"]
         api = _snapshot["api"]
 
+        # Hand over the cached month bucket so only this month's dates are scanned
         new_session, result = shuffle_month_assignments(
             session=session,
             api=api,
             year=year,
             month=month,
             inks=inks,
+            month_session=_month_dates("session", year, month),
         )
 
         if not result.success:
             return result.to_dict()
 
-        # Update reactive state and snapshot
-        session_assignments_reactive.set(new_session)
-        _snapshot["session"] = new_session.copy()
+        _set_session(new_session)
 
         response = result.to_dict()
         response["note"] = "These are session assignments. Use Save Session to persist."
@@ -707,32 +907,30 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         if session_themes_reactive is None:
             return {"success": False, "message": "Theme storage not available"}
 
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
         if not theme or not theme.strip():
             return {"success": False, "message": "Theme name cannot be empty"}
 
         month_key = f"{year}-{month:02d}"
-        themes = _snapshot["themes"].copy()
-        themes[month_key] = {
+        theme_entry = {
             "theme": theme.strip(),
             "description": description.strip() if description else ""
         }
-        session_themes_reactive.set(themes)
-        _snapshot["themes"] = themes.copy()
+        themes = _snapshot["themes"].copy()
+        themes[month_key] = theme_entry
+        _publish("themes", themes)
 
         return {
             "success": True,
-            "message": f"Set theme for {calendar.month_name[month]} {year}",
+            "message": f"Set theme for {_MONTH_NAMES[month]} {year}",
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year,
-            "theme": theme.strip(),
-            "description": description.strip() if description else "",
+            "theme": theme_entry["theme"],
+            "description": theme_entry["description"],
             "note": "Theme saved to session. Use Save Session to persist."
         }
 
@@ -747,11 +945,9 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         Returns:
             Theme information if set, or indication that no theme exists.
         """
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
         month_key = f"{year}-{month:02d}"
 
@@ -762,7 +958,7 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
                 return {
                     "success": True,
                     "month": month,
-                    "month_name": calendar.month_name[month],
+                    "month_name": _MONTH_NAMES[month],
                     "year": year,
                     "theme": theme_data.get("theme", ""),
                     "description": theme_data.get("description", ""),
@@ -772,7 +968,7 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         return {
             "success": True,
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year,
             "theme": None,
             "description": None,
@@ -793,32 +989,30 @@ def create_tool_functions(ink_data_reactive, selected_year_reactive,
         if session_themes_reactive is None:
             return {"success": False, "message": "Theme storage not available"}
 
-        if year is None:
-            year = _snapshot["year"]
-
-        if not 1 <= month <= 12:
-            return {"success": False, "message": f"Invalid month: {month}. Must be 1-12."}
+        year, error = _resolve_month(month, year)
+        if error:
+            return error
 
         month_key = f"{year}-{month:02d}"
-        themes = _snapshot["themes"].copy()
 
-        if month_key not in themes:
+        # Check before copying: nothing to write when no theme is set
+        if month_key not in _snapshot["themes"]:
             return {
                 "success": True,
-                "message": f"No theme was set for {calendar.month_name[month]} {year}",
+                "message": f"No theme was set for {_MONTH_NAMES[month]} {year}",
                 "month": month,
                 "year": year
             }
 
+        themes = _snapshot["themes"].copy()
         del themes[month_key]
-        session_themes_reactive.set(themes)
-        _snapshot["themes"] = themes.copy()
+        _publish("themes", themes)
 
         return {
             "success": True,
-            "message": f"Cleared theme for {calendar.month_name[month]} {year}",
+            "message": f"Cleared theme for {_MONTH_NAMES[month]} {year}",
             "month": month,
-            "month_name": calendar.month_name[month],
+            "month_name": _MONTH_NAMES[month],
             "year": year
         }
 
@@ -1,14 +1,56 @@
 """
 Ink data caching to avoid repeated API calls
 """
+import asyncio
 import json
 import os
+import sys
 from typing import List, Dict, Optional
 from datetime import datetime
 
+try:
+    # The cache holds the whole collection; orjson parses and serializes it
+    # in C. The stdlib fallback produces and reads the same file.
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_bytes(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps_bytes(data) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
 
 CACHE_FILE = "ink_cache.json"
 
+# Ink fields whose values repeat across a collection (a few dozen brands
+# cover hundreds of inks). The parser builds a new string for every value,
+# so these are interned once per parse to share one object per distinct value.
+_REPEATED_FIELDS = ("brand_name", "simplified_brand_name", "line_name", "maker", "kind")
+
+
+def _intern_repeated_strings(inks: List[Dict]) -> None:
+    """Intern repeated ink field values and color tags in place (freshly parsed data only)."""
+    intern = sys.intern
+    for ink in inks:
+        for field in _REPEATED_FIELDS:
+            value = ink.get(field)
+            if type(value) is str:
+                ink[field] = intern(value)
+        tags = ink.get("cluster_tags")
+        if tags:
+            ink["cluster_tags"] = [intern(tag) if type(tag) is str else tag for tag in tags]
+
+
+# Last parsed cache, keyed on the path, inode, mtime and size of the file it
+# came from (saves swap in a new file, so the inode changes on every save),
+# so startup's load and the cache status line share one parse. Callers treat
+# the returned data as read-only, like the rest of the app's ink data.
+_cache_memo: Optional[tuple] = None
+
 
 def save_inks_to_cache(inks: List[Dict]) -> None:
     """
@@ -23,26 +65,56 @@ def save_inks_to_cache(inks: List[Dict]) -> None:
         "inks": inks
     }
 
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache_data, f, indent=2)
+    # Serialize up front and issue one write (json.dump streams many small
+    # writes), then swap the file in so readers never see a partial cache
+    payload = _json_dumps_bytes(cache_data)
+    tmp_file = f"{CACHE_FILE}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_file, CACHE_FILE)
+
+
+async def save_inks_to_cache_async(inks: List[Dict]) -> None:
+    """
+    Save fetched inks to disk cache without blocking the event loop.
+
+    Args:
+        inks: List of ink dictionaries
+    """
+    await asyncio.to_thread(save_inks_to_cache, inks)
 
 
 def load_inks_from_cache() -> Optional[Dict]:
     """
     Load inks from disk cache.
 
+    Repeat loads of an unchanged file return the previously parsed data.
+
     Returns:
         Dictionary with timestamp, ink_count, and inks list if cache exists, None otherwise
     """
-    if not os.path.exists(CACHE_FILE):
+    global _cache_memo
+    try:
+        st = os.stat(CACHE_FILE)
+    except OSError:
         return None
 
+    key = (CACHE_FILE, st.st_ino, st.st_mtime_ns, st.st_size)
+    if _cache_memo is not None and _cache_memo[0] == key:
+        return _cache_memo[1]
+
     try:
-        with open(CACHE_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(CACHE_FILE, "rb") as f:
+            data = _json_loads(f.read())
+    except (ValueError, OSError):
         return None
 
+    if isinstance(data, dict) and isinstance(data.get("inks"), list):
+        _intern_repeated_strings(data["inks"])
+
+    _cache_memo = (key, data)
+    return data
+
 
 def get_cache_info() -> Optional[str]:
     """
@@ -1,6 +1,7 @@
 """
 LLM-powered ink organizer using chatlas
 """
+from collections import Counter
 from typing import List, Dict, Optional
 import json
 from chatlas import ChatAnthropic, ChatOpenAI
@@ -91,14 +92,11 @@ def format_ink_for_llm(ink: Dict, idx: int) -> str:
 
 def format_all_inks_for_llm(inks: List[Dict]) -> str:
     """Format all inks into a comprehensive summary for the LLM."""
-    ink_list = '\n\n'.join([format_ink_for_llm(ink, idx) for idx, ink in enumerate(inks)])
+    ink_list = '\n\n'.join(format_ink_for_llm(ink, idx) for idx, ink in enumerate(inks))
 
     # Add summary statistics
     total = len(inks)
-    colors = {}
-    for ink in inks:
-        for tag in ink.get('cluster_tags', []):
-            colors[tag] = colors.get(tag, 0) + 1
+    colors = Counter(tag for ink in inks for tag in ink.get('cluster_tags', []))
 
     summary = f"""
 # Ink Collection Summary
@@ -106,7 +104,7 @@ def format_all_inks_for_llm(inks: List[Dict]) -> str:
 Total Inks: {total}
 
 Color Distribution:
-{chr(10).join([f"  - {color}: {count} inks" for color, count in sorted(colors.items(), key=lambda x: -x[1])[:15]])}
+{chr(10).join(f"  - {color}: {count} inks" for color, count in colors.most_common(15))}
 
 # Complete Ink List
 
@@ -4,6 +4,7 @@ Tests for API client pagination
 import pytest
 from unittest.mock import Mock, patch
 from api_client import fetch_all_collected_inks, flatten_ink_data
+from assignment_logic import find_ink_by_name, search_inks
 
 
 def test_flatten_ink_data():
@@ -51,7 +52,7 @@ def test_flatten_ink_data_missing_attributes():
     assert flattened["color"] == ""
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_single_page(mock_get):
     """Test fetching when all inks fit on one page"""
     # Mock response
@@ -103,7 +104,7 @@ def test_fetch_all_collected_inks_single_page(mock_get):
     assert inks[1]["name"] == "Black"
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_multiple_pages(mock_get):
     """Test fetching across multiple pages"""
     # Mock responses for 2 pages
@@ -169,7 +170,94 @@ def test_fetch_all_collected_inks_multiple_pages(mock_get):
     assert inks[1]["name"] == "Yama-dori"
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
+def test_fetch_all_collected_inks_keeps_page_order_when_concurrent(mock_get):
+    """Pages fetched concurrently should still be returned in page order"""
+    def page_response(page_number):
+        response = Mock()
+        response.json.return_value = {
+            "data": [
+                {
+                    "id": str(page_number),
+                    "type": "collected_ink",
+                    "attributes": {"brand_name": "Brand", "ink_name": f"Ink {page_number}"}
+                }
+            ],
+            "meta": {
+                "pagination": {
+                    "total_pages": 4,
+                    "current_page": page_number,
+                    "next_page": page_number + 1 if page_number < 4 else None
+                }
+            }
+        }
+        response.raise_for_status = Mock()
+        return response
+
+    mock_get.side_effect = lambda url, headers, params: page_response(params["page[number]"])
+
+    inks = fetch_all_collected_inks("test_token")
+
+    assert mock_get.call_count == 4
+    assert [ink["name"] for ink in inks] == ["Ink 1", "Ink 2", "Ink 3", "Ink 4"]
+
+
+@patch('api_client._session.get')
+def test_fetch_all_collected_inks_keeps_cluster_tags_values(mock_get):
+    """Tag lists are kept as lists and a null cluster_tags stays None, which search tolerates"""
+    response = Mock()
+    response.json.return_value = {
+        "data": [
+            {"id": "1", "type": "collected_ink",
+             "attributes": {"brand_name": "Diamine", "ink_name": "Eclipse", "cluster_tags": ["blue", "dark"]}},
+            {"id": "2", "type": "collected_ink",
+             "attributes": {"brand_name": "Pilot", "ink_name": "Kon-peki", "cluster_tags": None}},
+        ],
+        "meta": {"pagination": {"total_pages": 1, "current_page": 1, "next_page": None}}
+    }
+    mock_get.return_value = response
+
+    inks = fetch_all_collected_inks("test_token")
+
+    assert [ink["cluster_tags"] for ink in inks] == [["blue", "dark"], None]
+    assert find_ink_by_name("Kon-peki", inks)[0] == 1
+    assert [r["name"] for r in search_inks(inks, 2026, color="blue")] == ["Eclipse"]
+
+
+@patch('api_client.time.sleep')
+@patch('api_client._session.get')
+def test_fetch_all_collected_inks_retries_rate_limited_page(mock_get, mock_sleep):
+    """A 429 on a page is retried after its Retry-After delay"""
+    rate_limited = Mock(status_code=429, headers={"Retry-After": "3"})
+    ok = Mock(status_code=200)
+    ok.json.return_value = {
+        "data": [{"id": "1", "type": "collected_ink", "attributes": {"ink_name": "Kon-peki"}}],
+        "meta": {"pagination": {"total_pages": 1, "current_page": 1, "next_page": None}}
+    }
+    mock_get.side_effect = [rate_limited, ok]
+
+    inks = fetch_all_collected_inks("test_token")
+
+    assert [ink["name"] for ink in inks] == ["Kon-peki"]
+    mock_sleep.assert_called_once_with(3.0)
+
+
+@patch('api_client.time.sleep')
+@patch('api_client._session.get')
+def test_fetch_all_collected_inks_gives_up_after_retries(mock_get, mock_sleep):
+    """A page that stays rate limited raises after the last attempt"""
+    rate_limited = Mock(status_code=429, headers={})
+    rate_limited.raise_for_status.side_effect = RuntimeError("429")
+    mock_get.return_value = rate_limited
+
+    with pytest.raises(RuntimeError):
+        fetch_all_collected_inks("test_token")
+
+    assert mock_get.call_count == 3
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2]
+
+
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_empty(mock_get):
     """Test fetching when user has no inks"""
     mock_response = Mock()
@@ -193,7 +281,7 @@ def test_fetch_all_collected_inks_empty(mock_get):
     assert inks == []
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_authentication_header(mock_get):
     """Test that authentication header is set correctly"""
     mock_response = Mock()
@@ -212,7 +300,7 @@ def test_fetch_all_collected_inks_authentication_header(mock_get):
     assert call_kwargs["headers"]["Authorization"] == "Bearer my_secret_token"
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_pagination_params(mock_get):
     """Test that pagination parameters are sent correctly"""
     mock_response = Mock()
@@ -232,7 +320,7 @@ def test_fetch_all_collected_inks_pagination_params(mock_get):
     assert call_kwargs["params"]["page[size]"] == 100
 
 
-@patch('api_client.requests.get')
+@patch('api_client._session.get')
 def test_fetch_all_collected_inks_includes_archived(mock_get):
     """Archived inks must be returned from the API fetch.
 
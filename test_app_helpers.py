@@ -12,6 +12,7 @@ import os
 from app import ink_swatch_svg
 from app_helpers import (
     parse_session_data,
+    build_session_data,
     get_month_theme,
     ThemeInfo,
     prepare_save_data,
@@ -19,12 +20,15 @@ from app_helpers import (
     prepare_post_save_updates,
     PostSaveUpdates,
     get_month_dates,
+    format_date_label,
     make_button_id,
     detect_new_click,
+    find_session_date,
     prepare_cell_data,
     prepare_month_cells,
     CellData,
     get_chat_system_prompt,
+    CHAT_SYSTEM_PROMPT_STATIC,
 )
 
 
@@ -143,6 +147,42 @@ class TestSessionFormatParsing:
         assert assignments == {"2026-01-01": 0}
         assert themes == {}
 
+    def test_versioned_format(self):
+        """Test parsing the versioned format written by build_session_data."""
+        data = build_session_data(
+            {"2026-01-01": "macro:1"},
+            {"2026-01": {"theme": "Winter", "description": ""}}
+        )
+        assert data["version"] == 2
+        assignments, themes = parse_session_data(data)
+
+        assert assignments == {"2026-01-01": "macro:1"}
+        assert themes == {"2026-01": {"theme": "Winter", "description": ""}}
+
+    def test_raw_bytes_input(self):
+        """Test that raw file bytes are parsed for every format."""
+        versioned = json.dumps(build_session_data({"2026-01-01": "macro:1"}, {})).encode("utf-8")
+        assert parse_session_data(versioned) == ({"2026-01-01": "macro:1"}, {})
+
+        flat = json.dumps({"2026-02-14": "macro:4"}).encode("utf-8")
+        assert parse_session_data(flat) == ({"2026-02-14": "macro:4"}, {})
+
+    def test_versioned_format_missing_sections(self):
+        """Test a versioned file missing assignments or themes loads as empty."""
+        assert parse_session_data({"version": 2, "themes": {}}) == ({}, {})
+        assert parse_session_data({"version": 2, "assignments": {"2026-01-01": "macro:1"}}) == (
+            {"2026-01-01": "macro:1"}, {}
+        )
+
+    def test_non_object_payload_raises_value_error(self):
+        """Test that payloads that aren't session objects raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_session_data(b"[1, 2, 3]")
+        with pytest.raises(ValueError):
+            parse_session_data({"version": 2, "assignments": [], "themes": {}})
+        with pytest.raises(ValueError):
+            parse_session_data(b"not valid json")
+
     def test_malformed_json_handling(self):
         """Test that malformed JSON raises appropriate error."""
         with pytest.raises(json.JSONDecodeError):
@@ -370,6 +410,27 @@ class TestGetMonthTheme:
         assert result.theme == "API Theme"
         assert result.source == "api"
 
+    def test_api_theme_reused_for_same_comment(self):
+        """Repeated renders of an unchanged comment share one ThemeInfo."""
+        inks = [{"macro_cluster_id": "macro_0", "private_comment": '{"swatch2026":{"theme":"Reused","theme_description":"Desc"}}'}]
+        daily = {"2026-01-01": "macro:macro_0"}
+
+        first = get_month_theme(2026, 1, {}, inks, daily)
+        second = get_month_theme(2026, 1, {}, [dict(inks[0])], daily)
+
+        assert first == ThemeInfo("Reused", "Desc", "api")
+        assert second is first
+
+    def test_loaded_theme_names_are_interned(self):
+        """Theme names repeated across months share one string after load."""
+        raw = json.dumps(build_session_data({}, {
+            "2026-01": {"theme": "Seasonal Blues", "description": ""},
+            "2026-02": {"theme": "Seasonal Blues", "description": ""},
+        })).encode("utf-8")
+        _, themes = parse_session_data(raw)
+
+        assert themes["2026-01"]["theme"] is themes["2026-02"]["theme"]
+
 
 # =============================================================================
 # Tests for prepare_post_save_updates()
@@ -475,6 +536,12 @@ class TestDateUtilities:
         assert make_button_id("save", "2026-12-25") == "save_2026_12_25"
         assert make_button_id("assign", "2026-02-14") == "assign_2026_02_14"
 
+    def test_format_date_label(self):
+        """Date labels use the row format by default and accept others."""
+        assert format_date_label("2026-03-05") == "Mar 05, 2026"
+        assert format_date_label("2026-03-05", "%B %d, %Y") == "March 05, 2026"
+        assert format_date_label("2026-12-25", "%b %d") == "Dec 25"
+
     def test_detect_new_click_true(self):
         """Should detect new click when current > prev."""
         assert detect_new_click(1, 0) is True
@@ -486,6 +553,18 @@ class TestDateUtilities:
         assert detect_new_click(3, 3) is False
         assert detect_new_click(2, 5) is False
 
+    def test_find_session_date(self):
+        """Should return the session date holding the ink."""
+        session = {"2026-01-01": "macro:1", "2026-01-02": "macro:2"}
+        assert find_session_date(session, {}, "macro:2") == "2026-01-02"
+        assert find_session_date(session, {}, "macro:3") is None
+
+    def test_find_session_date_skips_api_dates(self):
+        """Dates that are API-protected are not session assignments."""
+        session = {"2026-01-01": "macro:1"}
+        api = {"2026-01-01": "macro:1"}
+        assert find_session_date(session, api, "macro:1") is None
+
 
 # =============================================================================
 # Tests for cell data preparation
@@ -570,6 +649,14 @@ class TestChatSystemPrompt:
         assert "PROTECTION RULES" in prompt
         assert "PROACTIVE GAP FILLING" in prompt
 
+    def test_prompt_static_part_is_stable_prefix(self):
+        """Static instructions should lead the prompt regardless of inputs."""
+        prompt_a = get_chat_system_prompt(100, 2026)
+        prompt_b = get_chat_system_prompt(42, 2027)
+        assert prompt_a.startswith(CHAT_SYSTEM_PROMPT_STATIC)
+        assert prompt_b.startswith(CHAT_SYSTEM_PROMPT_STATIC)
+        assert "42 inks" in prompt_b[len(CHAT_SYSTEM_PROMPT_STATIC):]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -6,6 +6,9 @@ import json
 from assignment_logic import (
     parse_swatch_date_from_comment,
     get_month_summary,
+    group_assignments_by_month,
+    index_assignments_by_month,
+    update_month_index,
     parse_comment_json,
     has_assignment,
     find_ink_by_name,
@@ -13,7 +16,10 @@ from assignment_logic import (
     get_swatch_data,
     parse_theme_from_comment,
     create_explicit_assignments_only,
+    build_swatch_index,
+    update_explicit_assignments,
     move_ink_assignment,
+    bulk_move_ink_assignments,
     swap_ink_assignments,
     shuffle_month_assignments,
     MoveResult,
@@ -22,6 +28,10 @@ from assignment_logic import (
     get_ink_identifier,
     parse_ink_identifier,
     find_ink_by_identifier,
+    build_identifier_lookup,
+    get_ink_search_index,
+    get_search_comments,
+    build_identifier_to_date,
     assignable_inks,
 )
 
@@ -83,6 +93,76 @@ def test_get_month_summary_wrong_year():
     assert january_inks[0] == 1
 
 
+def test_group_assignments_by_month():
+    """Test grouping a year's assignments by month in one pass"""
+    assignments = {
+        "2025-01-31": 0,
+        "2025-02-01": 1,
+        "2025-02-14": 2,
+        "2024-02-14": 3,  # Wrong year
+        "2025-12-25": 4,
+    }
+
+    by_month = group_assignments_by_month(assignments, 2025)
+
+    assert set(by_month) == set(range(1, 13))
+    assert by_month[1] == [0]
+    assert by_month[2] == [1, 2]
+    assert by_month[3] == []
+    assert by_month[12] == [4]
+    for month in range(1, 13):
+        assert by_month[month] == get_month_summary(assignments, 2025, month)
+
+
+def test_group_assignments_by_month_ignores_malformed_months():
+    """Malformed month fields are skipped rather than raising"""
+    assignments = {"2025-xx-01": 0, "2025-13-01": 1, "2025-03-01": 2, "2025-": 3}
+
+    by_month = group_assignments_by_month(assignments, 2025)
+
+    assert by_month[3] == [2]
+    assert sum(len(v) for v in by_month.values()) == 1
+
+
+def test_index_assignments_by_month():
+    """Assignments are bucketed by (year, month); malformed keys are skipped"""
+    assignments = {
+        "2025-02-14": "a",
+        "2025-02-01": "b",
+        "2024-02-14": "c",
+        "2025-12-25": "d",
+        "2025-13-01": "e",
+        "2025-xx-01": "f",
+        "2025-": "g",
+    }
+
+    buckets = index_assignments_by_month(assignments)
+
+    assert buckets == {
+        (2025, 2): {"2025-02-14": "a", "2025-02-01": "b"},
+        (2024, 2): {"2024-02-14": "c"},
+        (2025, 12): {"2025-12-25": "d"},
+    }
+    for month in range(1, 13):
+        assert list(buckets.get((2025, month), {}).values()) == get_month_summary(assignments, 2025, month)
+
+
+def test_update_month_index_matches_full_rebuild():
+    """Patching changed dates gives the same index and shares untouched months"""
+    old = {"2025-01-05": "a", "2025-02-01": "b", "2025-02-02": "c", "2025-03-09": "d"}
+    new = {"2025-01-05": "a", "2025-02-01": "x", "2025-04-01": "c", "2025-03-09": "d"}
+    buckets = index_assignments_by_month(old)
+
+    updated = update_month_index(buckets, new, {"2025-02-01", "2025-02-02", "2025-04-01"})
+
+    assert updated == index_assignments_by_month(new)
+    assert updated[(2025, 1)] is buckets[(2025, 1)]
+    assert buckets == index_assignments_by_month(old)
+
+    cleared = update_month_index(updated, {"2025-01-05": "a"}, {"2025-02-01", "2025-03-09", "2025-04-01"})
+    assert cleared == {(2025, 1): {"2025-01-05": "a"}}
+
+
 def test_parse_swatch_date_from_comment_valid():
     """Test parsing valid swatch date from comment (new format with theme)"""
     comment = '{"swatch2026": {"theme": "All samples", "theme_description": "New inks for a new year", "date": "2026-01-15"}}'
@@ -138,6 +218,13 @@ def test_parse_swatch_date_from_comment_new_format_invalid_date():
     assert date_str is None
 
 
+@pytest.mark.parametrize("bad_date", ["2026-02-30", "2025-01-15", "2026-1-5", "2026-01-15T00:00", 20260115])
+def test_parse_swatch_date_from_comment_rejects_non_dates(bad_date):
+    """Impossible, other-year, unpadded and non-string dates return None"""
+    comment = json.dumps({"swatch2026": {"date": bad_date}})
+    assert parse_swatch_date_from_comment(comment, 2026) is None
+
+
 # =============================================================================
 # Tests for new pure helper functions
 # =============================================================================
@@ -159,6 +246,14 @@ def test_parse_comment_json_invalid():
     assert parse_comment_json("not json") == {}
 
 
+def test_parse_comment_json_non_object_text():
+    """Test free text and non-object JSON are rejected; leading whitespace is fine"""
+    assert parse_comment_json("   ") == {}
+    assert parse_comment_json("Great shading, {sheen} too") == {}
+    assert parse_comment_json("[1, 2]") == {}
+    assert parse_comment_json('  \n {"a": 1}') == {"a": 1}
+
+
 # =============================================================================
 # Tests for ink identifier functions
 # =============================================================================
@@ -272,6 +367,33 @@ class TestFindInkByIdentifier:
         assert result is None
 
 
+class TestBuildIdentifierLookup:
+    """Tests for build_identifier_lookup function."""
+
+    def test_matches_find_ink_by_identifier(self):
+        """Lookup should resolve identifiers the same as a linear search."""
+        inks = [
+            {"id": "111", "macro_cluster_id": "abc", "name": "Bottle"},
+            {"id": "222", "macro_cluster_id": "abc", "name": "Sample"},
+            {"id": "333", "name": "No macro"},
+        ]
+        lookup = build_identifier_lookup(inks)
+        for identifier in ["macro:abc", "id:111", "id:222", "id:333"]:
+            assert lookup[identifier] == find_ink_by_identifier(identifier, inks)
+
+    def test_first_ink_wins(self):
+        """Duplicate macro_cluster_ids should resolve to the first ink."""
+        inks = [
+            {"id": "1", "macro_cluster_id": "abc"},
+            {"id": "2", "macro_cluster_id": "abc"},
+        ]
+        assert build_identifier_lookup(inks)["macro:abc"][0] == 0
+
+    def test_empty_inks(self):
+        """Empty ink list should produce an empty lookup."""
+        assert build_identifier_lookup([]) == {}
+
+
 def test_has_assignment_true():
     """Test has_assignment returns True when date exists"""
     ink = {"private_comment": '{"swatch2025": {"date": "2025-01-15"}}'}
@@ -428,6 +550,172 @@ def test_search_inks_by_brand():
     assert results[0]["brand"] == "Pilot"
 
 
+def test_null_cluster_tags_do_not_break_lookups():
+    """An ink with "cluster_tags": null is still found and searchable"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Blue Velvet", "cluster_tags": None, "private_comment": ""},
+        {"brand_name": "Pilot", "name": "Kon-peki", "cluster_tags": ["blue"], "private_comment": ""},
+    ]
+    assert find_ink_by_name("Blue Velvet", inks)[0] == 0
+    assert [r["name"] for r in search_inks(inks, 2025, query="velvet")] == ["Blue Velvet"]
+    assert [r["name"] for r in search_inks(inks, 2025, color="blue")] == ["Kon-peki"]
+
+
+def test_search_inks_assigned_identifiers_override_comments():
+    """Test that a supplied identifier set decides already_assigned"""
+    inks = [
+        {"macro_cluster_id": "a", "brand_name": "Diamine", "name": "Oxblood", "cluster_tags": [],
+         "private_comment": '{"swatch2025": {"date": "2025-01-01"}}'},
+        {"macro_cluster_id": "b", "brand_name": "Diamine", "name": "Eclipse", "cluster_tags": [], "private_comment": ""},
+    ]
+    default = search_inks(inks, 2025)
+    assert [m["already_assigned"] for m in default] == [True, False]
+
+    merged = search_inks(inks, 2025, assigned_identifiers={"macro:b"})
+    assert [m["already_assigned"] for m in merged] == [False, True]
+
+
+def test_search_inks_combined_filters_must_all_match():
+    """Test that query, color and brand filters are ANDed together"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Blue Velvet", "cluster_tags": ["Blue"], "private_comment": ""},
+        {"brand_name": "Diamine", "name": "Red Dragon", "cluster_tags": ["Red"], "private_comment": ""},
+        {"brand_name": "Pilot", "name": "Blue Sky", "cluster_tags": ["Blue"], "private_comment": ""},
+    ]
+    results = search_inks(inks, 2025, query="blue", color="BLUE", brand="diamine")
+    assert [r["name"] for r in results] == ["Blue Velvet"]
+    assert search_inks(inks, 2025, query="dragon", color="blue") == []
+
+
+def test_ink_search_index_reused_for_same_list_and_rebuilt_for_new_list():
+    """Search index is cached per ink list object and rebuilt when the list is replaced"""
+    inks = [{"brand_name": "Sailor", "name": "Yama\u2019dori", "cluster_tags": ["Teal"]}]
+    index = get_ink_search_index(inks)
+    assert index.full_names == ("sailor yama'dori",)
+    assert index.color_tags == (frozenset({"teal"}),)
+    assert get_ink_search_index(inks) is index
+    assert index.active_positions == (0,)
+    assert index.identifiers == ("",)
+
+    replaced = [{**inks[0], "name": "Tokiwa-matsu"}]
+    assert get_ink_search_index(replaced).names == ("tokiwa-matsu",)
+
+
+def test_ink_search_index_carries_over_unchanged_inks():
+    """A structurally shared replacement list reuses entries for unchanged inks"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Oxblood", "cluster_tags": ["Red"]},
+        {"brand_name": "Sailor", "name": "Jentle Blue", "cluster_tags": ["Blue"]},
+    ]
+    index = get_ink_search_index(inks)
+
+    updated = list(inks)
+    updated[1] = {**inks[1], "name": "Souten"}
+    new_index = get_ink_search_index(updated)
+
+    assert new_index.names == ("oxblood", "souten")
+    assert new_index.full_names == ("diamine oxblood", "sailor souten")
+    assert new_index.names[0] is index.names[0]
+    assert find_ink_by_name("souten", updated)[0] == 1
+
+
+def test_search_comments_built_on_first_use():
+    """Lowercased comments are only built when first read, then reused"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Oxblood", "private_comment": "Great Sheen"},
+        {"brand_name": "Sailor", "name": "Souten", "private_comment": "plain"},
+        {"brand_name": "Pilot", "name": "Kon-peki"},
+    ]
+    index = get_ink_search_index(inks)
+    assert index.comments == []
+
+    comments = get_search_comments(index)
+    assert comments == ["great sheen", "plain", ""]
+    assert comments[1] is inks[1]["private_comment"]
+    assert get_search_comments(index) is comments
+
+
+def test_ink_search_index_keeps_indices_for_interleaved_lists():
+    """Two collections searched in turn keep their own cached indices"""
+    first = [{"brand_name": "Diamine", "name": "Oxblood"}]
+    second = [{"brand_name": "Sailor", "name": "Souten"}]
+    first_index = get_ink_search_index(first)
+    second_index = get_ink_search_index(second)
+
+    assert get_ink_search_index(first) is first_index
+    assert get_ink_search_index(second) is second_index
+
+
+def test_ink_search_index_cache_is_bounded():
+    """Old lists' indices are evicted once the cache is full"""
+    lists = [[{"brand_name": "Brand", "name": f"Ink {n}"}] for n in range(20)]
+    indices = [get_ink_search_index(inks) for inks in lists]
+
+    assert get_ink_search_index(lists[-1]) is indices[-1]
+    assert get_ink_search_index(lists[0]) is not indices[0]
+
+
+def test_ink_search_index_active_positions_follow_archiving():
+    """Archiving an ink in a replacement list drops it from active_positions"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Oxblood"},
+        {"brand_name": "Sailor", "name": "Souten"},
+    ]
+    assert get_ink_search_index(inks).active_positions == (0, 1)
+
+    updated = [inks[0], {**inks[1], "archived": True}]
+    assert get_ink_search_index(updated).active_positions == (0,)
+    assert [r["name"] for r in search_inks(updated, 2026)] == ["Oxblood"]
+
+
+def test_find_ink_by_name_substring_prefers_shortest_then_first():
+    """Substring matches resolve to the shortest name, first ink on ties"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Blue Velvet Deluxe"},
+        {"brand_name": "Sailor", "name": "Blue Black"},
+        {"brand_name": "Pilot", "name": "Blue Black"},
+        {"brand_name": "Blue Brand", "name": "Teal"},
+    ]
+    assert find_ink_by_name("blue bl", inks)[0] == 1
+    assert find_ink_by_name("blue", inks)[0] == 3
+    assert find_ink_by_name("velvet", inks)[0] == 0
+
+
+def test_find_ink_by_name_memoizes_substring_lookups_per_list():
+    """Substring fallbacks (hits and misses) are memoized on the list's index"""
+    inks = [{"brand_name": "Sailor", "name": "Jentle Blue"}]
+    assert find_ink_by_name("jentle", inks)[0] == 0
+    assert find_ink_by_name("nothing", inks) is None
+    assert get_ink_search_index(inks).substring_matches == {"jentle": 0, "nothing": None}
+
+    replaced = [{"brand_name": "Diamine", "name": "Nothing Blue"}, inks[0]]
+    assert find_ink_by_name("nothing", replaced)[0] == 0
+    assert find_ink_by_name("jentle", replaced)[0] == 1
+
+
+def test_find_ink_by_name_substring_memo_is_bounded(monkeypatch):
+    """The oldest memoized query is dropped once the memo is full"""
+    import assignment_logic
+    monkeypatch.setattr(assignment_logic, "_SUBSTRING_MEMO_SIZE", 2)
+    inks = [{"brand_name": "Sailor", "name": "Jentle Blue"}]
+
+    for query in ("jentle", "blue", "sailor j"):
+        find_ink_by_name(query, inks)
+
+    assert get_ink_search_index(inks).substring_matches == {"blue": 0, "sailor j": 0}
+
+
+def test_find_ink_by_name_exact_match_prefers_first_ink():
+    """Exact matches resolve to the first ink with that name or full name"""
+    inks = [
+        {"brand_name": "Diamine", "name": "Oxblood"},
+        {"brand_name": "Other", "name": "Diamine Oxblood"},
+        {"brand_name": "Sailor", "name": "Oxblood"},
+    ]
+    assert find_ink_by_name("diamine oxblood", inks)[0] == 0
+    assert find_ink_by_name("Oxblood", inks)[0] == 0
+
+
 # =============================================================================
 # Tests for get_swatch_data
 # =============================================================================
@@ -446,6 +734,15 @@ def test_get_swatch_data_not_a_dict():
     assert result is None
 
 
+def test_string_swatch_value_ignored_by_all_readers():
+    """Every reader goes through the same swatch lookup, so a bare string value is rejected everywhere"""
+    comment = '{"swatch2026": "2026-01-15"}'
+    assert parse_swatch_date_from_comment(comment, 2026) is None
+    assert parse_theme_from_comment(comment, 2026) is None
+    assert has_assignment({"private_comment": comment}, 2026) is False
+    assert create_explicit_assignments_only([{"macro_cluster_id": "a", "private_comment": comment}], 2026) == {}
+
+
 def test_get_swatch_data_missing_key():
     """Test missing swatch key"""
     comment = '{"other": "value"}'
@@ -459,6 +756,33 @@ def test_get_swatch_data_invalid_json():
     assert result is None
 
 
+def test_get_swatch_data_result_mutation_does_not_leak():
+    """Mutating a returned swatch dict must not affect later lookups"""
+    comment = '{"swatch2026": {"date": "2026-04-01"}}'
+    first = get_swatch_data(comment, 2026)
+    first["date"] = "2026-12-31"
+    assert get_swatch_data(comment, 2026) == {"date": "2026-04-01"}
+    assert parse_swatch_date_from_comment(comment, 2026) == "2026-04-01"
+
+
+def test_get_swatch_data_decodes_multi_year_comment_once(monkeypatch):
+    """Looking up several years in one comment parses the JSON once"""
+    import assignment_logic
+    calls = []
+    real_loads = assignment_logic._json_loads
+    monkeypatch.setattr(assignment_logic, "_json_loads", lambda c: calls.append(c) or real_loads(c))
+
+    comment = '{"swatch2025": {"date": "2025-07-04"}, "swatch2026": {"date": "2026-07-04"}, "n": 1}'
+    assert get_swatch_data(comment, 2025) == {"date": "2025-07-04"}
+    assert get_swatch_data(comment, 2026) == {"date": "2026-07-04"}
+    assert len(calls) == 1
+
+    # The public parser still hands out a fresh dict callers may edit
+    parsed = parse_comment_json(comment)
+    parsed["swatch2026"] = {"date": "2026-01-01"}
+    assert get_swatch_data(comment, 2026) == {"date": "2026-07-04"}
+
+
 # =============================================================================
 # Tests for parse_theme_from_comment
 # =============================================================================
@@ -498,6 +822,22 @@ def test_parse_theme_from_comment_no_theme_fields():
     assert result is None
 
 
+# =============================================================================
+# Tests for build_swatch_index
+# =============================================================================
+
+def test_build_swatch_index_parallel_to_inks():
+    """Test one entry per ink, None where the year has no swatch data"""
+    inks = [
+        {"private_comment": '{"swatch2026": {"date": "2026-03-01"}}'},
+        {"private_comment": '{"swatch2025": {"date": "2025-03-01"}}'},
+        {"private_comment": None},
+        {},
+        {"private_comment": "swatch2026 but not json"},
+    ]
+    assert build_swatch_index(inks, 2026) == [{"date": "2026-03-01"}, None, None, None, None]
+
+
 # =============================================================================
 # Tests for create_explicit_assignments_only
 # =============================================================================
@@ -569,6 +909,55 @@ def test_create_explicit_assignments_ink_with_neither_skipped():
     assert result == {"2026-01-15": "macro:abc123"}  # second ink skipped
 
 
+def test_create_explicit_assignments_skips_invalid_and_other_year_dates():
+    """Impossible dates, other years, and non-string dates are ignored."""
+    inks = [
+        {"macro_cluster_id": "bad_day", "private_comment": '{"swatch2026": {"date": "2026-02-30"}}'},
+        {"macro_cluster_id": "other_year", "private_comment": '{"swatch2026": {"date": "2025-01-15"}}'},
+        {"macro_cluster_id": "not_str", "private_comment": '{"swatch2026": {"date": ["2026-01-15"]}}'},
+        {"macro_cluster_id": "good", "private_comment": '{"swatch2026": {"date": "2026-03-01"}}'},
+    ]
+    result = create_explicit_assignments_only(inks, 2026)
+    assert result == {"2026-03-01": "macro:good"}
+
+
+class TestUpdateExplicitAssignments:
+    """update_explicit_assignments should always match a full rebuild."""
+
+    @staticmethod
+    def _comment(date):
+        return f'{{"swatch2026": {{"date": "{date}"}}}}' if date else ""
+
+    def _check(self, dates, ink_idx, new_date):
+        before = [{"macro_cluster_id": f"ink_{i}", "private_comment": self._comment(d)} for i, d in enumerate(dates)]
+        prev = create_explicit_assignments_only(before, 2026)
+        after = list(before)
+        after[ink_idx] = {**before[ink_idx], "private_comment": self._comment(new_date)}
+        result = update_explicit_assignments(
+            prev, after, ink_idx, before[ink_idx]["private_comment"], after[ink_idx]["private_comment"], 2026
+        )
+        assert result == create_explicit_assignments_only(after, 2026)
+        return prev, result
+
+    def test_new_free_date_is_added(self):
+        """Gaining an unclaimed date patches just that entry"""
+        prev, result = self._check(["2026-01-01", None], 1, "2026-01-02")
+        assert result == {**prev, "2026-01-02": "macro:ink_1"}
+
+    def test_unchanged_date_returns_prev(self):
+        """No date change for the year leaves assignments untouched"""
+        prev, result = self._check(["2026-01-01", "2026-01-02"], 1, "2026-01-02")
+        assert result is prev
+
+    def test_vacated_date_goes_to_shadowed_ink(self):
+        """Moving off a shared date hands it to the other ink"""
+        self._check(["2026-01-01", "2026-01-01"], 0, "2026-01-05")
+
+    def test_contested_date_keeps_first_ink(self):
+        """An earlier ink claiming a taken date wins it"""
+        self._check([None, "2026-01-03"], 0, "2026-01-03")
+
+
 # =============================================================================
 # Tests for MoveResult
 # =============================================================================
@@ -633,6 +1022,20 @@ class TestMoveInkAssignmentValidation:
         assert result.success is False
         assert "Invalid to_date format" in result.message
 
+    def test_impossible_calendar_date_rejected(self):
+        """Well-formed but non-existent dates are rejected"""
+        new_session, result = move_ink_assignment({}, {}, None, "2026-02-30", macro_cluster_id="macro:ink_0")
+        assert result.success is False
+        assert "Invalid to_date format" in result.message
+
+    @pytest.mark.parametrize("unpadded", ["2026-1-15", "2026-01-5", "2026-1-5"])
+    def test_unpadded_date_rejected(self, unpadded):
+        """Only zero-padded dates are accepted, unlike strptime"""
+        new_session, result = move_ink_assignment({}, {}, None, unpadded, macro_cluster_id="macro:ink_0")
+        assert result.success is False
+        assert "Invalid to_date format" in result.message
+        assert new_session == {}
+
 
 class TestMoveInkAssignmentAssign:
     """Tests for move_ink_assignment assign operation (from_date=None)"""
@@ -664,6 +1067,25 @@ class TestMoveInkAssignmentAssign:
         assert "already assigned" in result.message.lower()
         assert result.data.get("assigned_date") == "2026-01-10"
 
+    def test_assign_already_assigned_with_reverse_index(self):
+        """Precomputed reverse index gives the same answer as scanning"""
+        session = {"2026-01-10": "macro:ink_0"}
+        api = {"2026-01-12": "macro:ink_1"}
+        index = build_identifier_to_date(session, api)
+        assert index == {"macro:ink_0": "2026-01-10", "macro:ink_1": "2026-01-12"}
+
+        _, result = move_ink_assignment(
+            session, api, None, "2026-01-15", macro_cluster_id="macro:ink_1", identifier_to_date=index
+        )
+        assert result.success is False
+        assert result.data.get("assigned_date") == "2026-01-12"
+
+        new_session, result = move_ink_assignment(
+            session, api, None, "2026-01-15", macro_cluster_id="macro:ink_2", identifier_to_date=index
+        )
+        assert result.success is True
+        assert new_session["2026-01-15"] == "macro:ink_2"
+
     def test_assign_with_displacement(self):
         """Test assign overwrites existing session assignment"""
         session = {"2026-01-15": "macro:ink_5"}  # existing assignment
@@ -691,6 +1113,16 @@ class TestMoveInkAssignmentAssign:
         assert result.data.get("ink_brand") == "Diamine"
         assert result.data.get("ink_name") == "Blue Velvet"
 
+    def test_rejected_assign_carries_identifier_only(self):
+        """Test error results skip the ink details lookup"""
+        api = {"2026-01-15": "macro:ink_1"}
+        inks = [{"macro_cluster_id": "ink_0", "brand_name": "Diamine", "name": "Blue Velvet"}]
+        _, result = move_ink_assignment({}, api, None, "2026-01-15", macro_cluster_id="macro:ink_0", inks=inks)
+        assert result.success is False
+        assert result.data["protected"] is True
+        assert result.data["macro_cluster_id"] == "macro:ink_0"
+        assert "ink_brand" not in result.data
+
 
 class TestMoveInkAssignmentUnassign:
     """Tests for move_ink_assignment unassign operation (to_date=None)"""
@@ -866,6 +1298,88 @@ class TestBuildSwatchCommentJson:
         assert data["swatch2026"]["date"] == "2026-01-15"
 
 
+# =============================================================================
+# Tests for bulk_move_ink_assignments
+# =============================================================================
+
+class TestBulkMoveInkAssignments:
+    """Tests for applying several mutations in one batch"""
+
+    def test_ops_apply_in_order_without_touching_input(self):
+        """Later ops see earlier results; the input session is not mutated"""
+        session = {"2026-01-01": "macro:ink_0"}
+        api = {"2026-01-05": "macro:ink_9"}
+        ops = [
+            (None, "2026-01-02", "macro:ink_1"),
+            ("2026-01-01", "2026-01-03", None),
+            (None, "2026-01-04", "macro:ink_0"),
+            (None, "2026-01-06", "macro:ink_9"),
+            (None, "2026-01-05", "macro:ink_2"),
+        ]
+        new_session, results = bulk_move_ink_assignments(session, api, ops)
+
+        assert [r.success for r in results] == [True, True, False, False, False]
+        assert results[2].data["assigned_date"] == "2026-01-03"
+        assert results[3].data["assigned_date"] == "2026-01-05"
+        assert results[4].data["protected"] is True
+        assert new_session == {"2026-01-02": "macro:ink_1", "2026-01-03": "macro:ink_0"}
+        assert session == {"2026-01-01": "macro:ink_0"}
+
+    def test_unassigned_and_displaced_inks_become_available(self):
+        """Inks removed or displaced earlier in the batch can be assigned again"""
+        session = {"2026-01-01": "macro:ink_0", "2026-01-02": "macro:ink_1"}
+        ops = [
+            ("2026-01-01", None, None),
+            (None, "2026-01-02", "macro:ink_0"),
+            (None, "2026-01-03", "macro:ink_1"),
+        ]
+        new_session, results = bulk_move_ink_assignments(session, {}, ops)
+
+        assert all(r.success for r in results)
+        assert new_session == {"2026-01-02": "macro:ink_0", "2026-01-03": "macro:ink_1"}
+
+    @pytest.mark.parametrize("first_op", [
+        ("2026-01-01", None, None),
+        (None, "2026-01-01", "macro:ink_1"),
+    ], ids=["unassigned", "displaced"])
+    def test_ink_leaving_session_date_keeps_its_api_date(self, first_op):
+        """An ink still holding an API date stays assigned, as with step-by-step moves"""
+        session = {"2026-01-01": "macro:ink_0"}
+        api = {"2026-02-01": "macro:ink_0"}
+        ops = [first_op, (None, "2026-01-05", "macro:ink_0")]
+        new_session, results = bulk_move_ink_assignments(session, api, ops)
+
+        step_session, first = move_ink_assignment(session, api, *first_op)
+        _, second = move_ink_assignment(step_session, api, *ops[1])
+        assert [r.success for r in results] == [first.success, second.success] == [True, False]
+        assert results[1].data["assigned_date"] == "2026-02-01"
+        assert new_session == step_session
+
+    def test_skipping_date_validation_keeps_protection(self):
+        """Trusted batches skip format checks but still respect API dates"""
+        api = {"2026-01-05": "macro:ink_9"}
+        ops = [
+            (None, "2026-01-05", "macro:ink_1"),
+            (None, "2026-01-06", "macro:ink_9"),
+            (None, "2026-01-07", "macro:ink_2"),
+        ]
+        new_session, results = bulk_move_ink_assignments({}, api, ops, validate_dates=False)
+
+        assert [r.success for r in results] == [False, False, True]
+        assert results[0].data["protected"] is True
+        assert new_session == {"2026-01-07": "macro:ink_2"}
+
+    def test_all_failed_ops_return_input_session(self):
+        """A batch with no successful op hands back the input without copying it"""
+        session = {"2026-01-01": "macro:ink_0"}
+        api = {"2026-01-05": "macro:ink_9"}
+        ops = [(None, "2026-01-05", "macro:ink_1"), (None, "2026-01-02", "macro:ink_0")]
+        new_session, results = bulk_move_ink_assignments(session, api, ops)
+
+        assert not any(r.success for r in results)
+        assert new_session is session
+
+
 # =============================================================================
 # Tests for swap_ink_assignments
 # =============================================================================
@@ -992,6 +1506,24 @@ class TestShuffleMonthAssignments:
         # Dates are preserved
         assert set(new_session.keys()) == set(session.keys())
 
+    def test_shuffle_with_month_bucket_matches_full_scan(self):
+        """A pre-bucketed month gives the same result as scanning the whole session"""
+        import random
+        session = {
+            "2026-02-28": "macro:ink_9",
+            "2026-03-01": "macro:ink_0",
+            "2026-03-10": "macro:ink_1",
+            "2026-03-20": "macro:ink_2",
+        }
+        api = {"2026-03-20": "macro:ink_8"}
+        bucket = index_assignments_by_month(session)[(2026, 3)]
+
+        full = shuffle_month_assignments(session, api, 2026, 3, rng=random.Random(7))
+        bucketed = shuffle_month_assignments(session, api, 2026, 3, rng=random.Random(7), month_session=bucket)
+
+        assert bucketed[0] == full[0]
+        assert bucketed[1].data["count"] == 2
+
     def test_shuffle_invalid_month_zero(self):
         """Test shuffle fails with month=0"""
         session = {"2026-01-01": "macro:ink_0"}
@@ -3,9 +3,10 @@ Tests for ink cache functionality.
 
 Uses pytest fixtures to test in a temp directory, keeping the real cache safe.
 """
+import asyncio
 import pytest
 import os
-from ink_cache import save_inks_to_cache, load_inks_from_cache, get_cache_info, clear_cache
+from ink_cache import save_inks_to_cache, save_inks_to_cache_async, load_inks_from_cache, get_cache_info, clear_cache
 import ink_cache
 
 
@@ -38,12 +39,59 @@ def test_save_and_load_cache(temp_cache, test_inks):
     assert cache["inks"][1]["name"] == "Test Ink 2"
 
 
+def test_save_cache_async(temp_cache, test_inks):
+    """Async save should write the same cache and leave no temp file behind."""
+    asyncio.run(save_inks_to_cache_async(test_inks))
+
+    cache = load_inks_from_cache()
+    assert cache is not None
+    assert cache["ink_count"] == 2
+    assert cache["inks"][0]["name"] == "Test Ink 1"
+    assert not os.path.exists(f"{temp_cache}.tmp")
+
+
 def test_load_nonexistent_cache(temp_cache):
     """Test loading when no cache exists."""
     cache = load_inks_from_cache()
     assert cache is None
 
 
+def test_load_cache_reuses_parse_until_file_changes(temp_cache, test_inks):
+    """Unchanged cache files are parsed once; a new save is picked up."""
+    save_inks_to_cache(test_inks)
+    first = load_inks_from_cache()
+    assert load_inks_from_cache() is first
+
+    save_inks_to_cache(test_inks[:1])
+    reloaded = load_inks_from_cache()
+    assert reloaded is not first
+    assert reloaded["ink_count"] == 1
+
+
+def test_load_corrupt_cache_returns_none(temp_cache):
+    """A cache file that isn't valid JSON loads as no cache."""
+    temp_cache.write_text("{not json")
+    assert load_inks_from_cache() is None
+
+
+def test_cache_round_trips_non_ascii(temp_cache):
+    """Non-ASCII ink names survive a save and load."""
+    save_inks_to_cache([{"name": "Yama\u2019dori", "brand_name": "Sailor"}])
+    assert load_inks_from_cache()["inks"][0]["name"] == "Yama\u2019dori"
+
+
+def test_load_shares_repeated_strings(temp_cache):
+    """Repeated brands and color tags load as one shared string object each."""
+    save_inks_to_cache([
+        {"name": "Oxblood", "brand_name": "Diamine", "cluster_tags": ["red"]},
+        {"name": "Red Dragon", "brand_name": "Diamine", "cluster_tags": ["red", "dark"]},
+    ])
+    first, second = load_inks_from_cache()["inks"]
+    assert first["brand_name"] is second["brand_name"]
+    assert first["cluster_tags"][0] is second["cluster_tags"][0]
+    assert second == {"name": "Red Dragon", "brand_name": "Diamine", "cluster_tags": ["red", "dark"]}
+
+
 def test_get_cache_info(temp_cache, test_inks):
     """Test getting human-readable cache info."""
     # No cache yet
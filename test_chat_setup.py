@@ -4,10 +4,13 @@ Tests for chat initialization helpers.
 These tests verify that initialize_chat_session correctly sets up
 the LLM chat with tools and context.
 """
+import asyncio
+from contextlib import contextmanager
+
 import pytest
 from unittest.mock import Mock, patch
 
-from chat_setup import initialize_chat_session
+from chat_setup import initialize_chat_session, coalesce_stream, batch_stream_writes
 
 
 # =============================================================================
@@ -154,9 +157,9 @@ class TestInitializeChatSession:
             session_themes_reactive=mock_reactive_values["session_themes"],
         )
 
-        assert mock_chat.register_tool.call_count == 2
-        mock_chat.register_tool.assert_any_call(mock_tool1)
-        mock_chat.register_tool.assert_any_call(mock_tool2)
+        # Tools are registered wrapped as coroutines around the original function
+        registered = [c.args[0] for c in mock_chat.register_tool.call_args_list]
+        assert [tool.__wrapped__ for tool in registered] == [mock_tool1, mock_tool2]
 
     @patch("chat_setup.create_llm_chat")
     @patch("chat_setup.create_tool_functions")
@@ -214,6 +217,36 @@ class TestInitializeChatSession:
             mock_reactive_values["session_themes"],
         )
 
+    @patch("chat_setup.create_llm_chat")
+    @patch("chat_setup.create_tool_functions")
+    def test_registers_tools_as_coroutines(
+        self, mock_create_tools, mock_create_chat, sample_inks, mock_reactive_values
+    ):
+        """Tools are registered as async wrappers around the tool functions."""
+        def list_all_inks():
+            """List inks."""
+            return {"success": True}
+
+        mock_chat = Mock()
+        mock_create_chat.return_value = mock_chat
+        mock_create_tools.return_value = ([list_all_inks], Mock())
+
+        initialize_chat_session(
+            inks=sample_inks,
+            year=2026,
+            provider="openai",
+            ink_data_reactive=mock_reactive_values["ink_data"],
+            selected_year_reactive=mock_reactive_values["selected_year"],
+            session_assignments_reactive=mock_reactive_values["session_assignments"],
+            api_assignments_reactive=mock_reactive_values["api_assignments"],
+            session_themes_reactive=mock_reactive_values["session_themes"],
+        )
+
+        registered = mock_chat.register_tool.call_args[0][0]
+        assert asyncio.iscoroutinefunction(registered)
+        assert registered.__name__ == "list_all_inks"
+        assert asyncio.run(registered()) == {"success": True}
+
     @patch("chat_setup.create_llm_chat")
     def test_returns_none_on_chat_creation_error(
         self, mock_create_chat, sample_inks, mock_reactive_values
@@ -339,5 +372,85 @@ class TestProviderSupport:
         assert call_args[0][0] == "google"
 
 
+
+# =============================================================================
+# Tests for coalesce_stream()
+# =============================================================================
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+def _collect(stream):
+    async def run():
+        return [chunk async for chunk in stream]
+    return asyncio.run(run())
+
+
+class TestCoalesceStream:
+    """Tests for streamed response coalescing."""
+
+    def test_joins_text_chunks(self):
+        """Text chunks within the interval should be emitted together."""
+        stream = coalesce_stream(_iterate(["Hel", "lo", " world"]), max_interval=60)
+        assert _collect(stream) == ["Hello world"]
+
+    def test_flushes_at_size_limit(self):
+        """Buffer should flush once it reaches max_chars."""
+        stream = coalesce_stream(_iterate(["ab", "cd", "e"]), max_chars=4, max_interval=60)
+        assert _collect(stream) == ["abcd", "e"]
+
+    def test_non_text_content_passes_through_in_order(self):
+        """Non-text content should flush pending text and keep its position."""
+        tool_call = object()
+        stream = coalesce_stream(_iterate(["a", "b", tool_call, "c"]), max_interval=60)
+        assert _collect(stream) == ["ab", tool_call, "c"]
+
+    def test_empty_stream(self):
+        """Empty stream should yield nothing."""
+        assert _collect(coalesce_stream(_iterate([]))) == []
+
+
+class TestBatchStreamWrites:
+    """Tests for holding tool writes for the length of a stream."""
+
+    def _recorder(self):
+        events = []
+
+        @contextmanager
+        def batch_writes():
+            events.append("open")
+            try:
+                yield
+            finally:
+                events.append("close")
+        return events, batch_writes
+
+    def test_batch_spans_iteration(self):
+        """The batch opens at the first chunk and closes after the last."""
+        events, batch_writes = self._recorder()
+
+        async def stream():
+            events.append("tool")
+            yield "a"
+            yield "b"
+
+        assert _collect(batch_stream_writes(stream(), batch_writes)) == ["a", "b"]
+        assert events == ["open", "tool", "close"]
+
+    def test_batch_closes_when_consumer_stops(self):
+        """Closing the stream early (e.g. on cancel) still closes the batch."""
+        events, batch_writes = self._recorder()
+
+        async def run():
+            stream = batch_stream_writes(_iterate(["a", "b"]), batch_writes)
+            assert await stream.__anext__() == "a"
+            await stream.aclose()
+
+        asyncio.run(run())
+        assert events == ["open", "close"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -4,9 +4,12 @@ Comprehensive tests for chat_tools.py - Tool functions for LLM chat.
 These tests verify the 12 tool functions that interact with ink assignments
 through reactive state management.
 """
+import asyncio
+import inspect
+
 import pytest
 from conftest import MockReactive
-from chat_tools import create_tool_functions
+from chat_tools import as_async_tool, create_tool_functions
 
 
 # =============================================================================
@@ -99,6 +102,74 @@ class TestListAllInks:
         assert ink_0["already_assigned"] is True  # Session
         assert ink_1["already_assigned"] is True  # API
 
+    def test_archived_inks_excluded_and_indices_compacted(self):
+        """Archived inks are left out; indices count only the listed inks."""
+        inks = [
+            {"macro_cluster_id": "m0", "brand_name": "Diamine", "name": "Oxblood"},
+            {"macro_cluster_id": "m1", "brand_name": "Diamine", "name": "Old", "archived": True},
+            {"macro_cluster_id": "m2", "brand_name": "Sailor", "name": "Souten"},
+        ]
+        tools, _, _, _ = setup_tools(inks=inks, session={"2026-01-01": "macro:m2"})
+        result = tools["list_all_inks"]()
+
+        assert result["total_inks"] == 2
+        assert [(i["index"], i["name"], i["already_assigned"]) for i in result["inks"]] == [
+            (0, "Oxblood", False),
+            (1, "Souten", True),
+        ]
+
+    def test_returned_entries_are_independent_between_calls(self, sample_inks):
+        """Changing a returned ink entry does not leak into later listings."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        first = tools["list_all_inks"]()
+        first["inks"][0]["name"] = "Changed"
+
+        assert tools["list_all_inks"]()["inks"][0]["name"] == "Blue Velvet"
+
+    def test_limit_truncates_list_but_not_total(self, sample_inks):
+        """limit caps the returned inks; total_inks still counts them all."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        result = tools["list_all_inks"](limit=2)
+
+        assert [i["index"] for i in result["inks"]] == [0, 1]
+        assert result["total_inks"] == 5
+
+    @pytest.mark.parametrize("limit", [0, -1, 2.5, "3", True])
+    def test_invalid_limit_rejected(self, sample_inks, limit):
+        """Non-positive or non-integer limits are rejected rather than slicing."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        result = tools["list_all_inks"](limit=limit)
+
+        assert result["success"] is False
+        assert "Invalid limit" in result["message"]
+
+    def test_session_entry_shadowed_by_api(self, sample_inks):
+        """A session ink on an API-held date is not counted as assigned."""
+        tools, _, _, _ = setup_tools(
+            inks=sample_inks,
+            session={"2026-01-01": "macro:macro_0"},
+            api={"2026-01-01": "macro:macro_1"}
+        )
+        result = tools["list_all_inks"]()
+
+        ink_0 = next(i for i in result["inks"] if i["index"] == 0)
+        ink_1 = next(i for i in result["inks"] if i["index"] == 1)
+
+        assert ink_0["already_assigned"] is False
+        assert ink_1["already_assigned"] is True
+
+    def test_reflects_assignment_made_by_earlier_tool(self, sample_inks):
+        """Assigned lookups are rebuilt after a tool writes new assignments."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        before = tools["list_all_inks"]()
+        assert not any(i["already_assigned"] for i in before["inks"])
+
+        tools["assign_ink_to_date"](ink_identifier="Blue Velvet", date_str="2026-01-01")
+        after = tools["list_all_inks"]()
+
+        ink_0 = next(i for i in after["inks"] if i["index"] == 0)
+        assert ink_0["already_assigned"] is True
+
 
 # =============================================================================
 # Tests for search_inks()
@@ -173,6 +244,21 @@ class TestGetMonthAssignments:
         assert result["success"] is False
         assert "Invalid month" in result["message"]
 
+    def test_empty_month_skips_ink_lookup(self, sample_inks, monkeypatch):
+        """An empty month is answered without building the identifier lookup."""
+        import chat_tools
+
+        def fail(inks):
+            raise AssertionError("lookup built for an empty month")
+
+        tools, _, _, _ = setup_tools(inks=sample_inks, session={"2026-03-01": "macro:macro_0"})
+        monkeypatch.setattr(chat_tools, "build_identifier_lookup", fail)
+        result = tools["get_month_assignments"](month=2, year=2026)
+
+        assert result["success"] is True
+        assert result["assigned_days"] == 0
+        assert result["unassigned_days"] == 28
+
     def test_invalid_month_13(self, sample_inks):
         """Test with invalid month 13."""
         tools, _, _, _ = setup_tools(inks=sample_inks)
@@ -181,6 +267,14 @@ class TestGetMonthAssignments:
         assert result["success"] is False
         assert "Invalid month" in result["message"]
 
+    @pytest.mark.parametrize("tool", ["get_month_assignments", "clear_month_assignments", "get_month_theme"])
+    def test_non_integer_month_rejected(self, sample_inks, tool):
+        """A month passed as a string gets the invalid-month error, not an exception."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        result = tools[tool](month="3")
+
+        assert result == {"success": False, "message": "Invalid month: 3. Must be 1-12."}
+
     def test_valid_month_no_assignments(self, sample_inks):
         """Test valid month with no assignments."""
         tools, _, _, _ = setup_tools(inks=sample_inks)
@@ -216,6 +310,21 @@ class TestGetMonthAssignments:
         assert len(result["assignments"]) == 1
         assert result["assignments"][0]["protected"] is False
 
+    def test_ink_details_follow_replaced_collection(self, sample_inks):
+        """Ink details come from the current ink list after it is replaced."""
+        ink_data = MockReactive(sample_inks)
+        tools_list, update_snapshot = create_tool_functions(
+            ink_data, MockReactive(2026), MockReactive({"2026-03-01": "macro:macro_0"}),
+            MockReactive({}), MockReactive({})
+        )
+        get_month = next(f for f in tools_list if f.__name__ == "get_month_assignments")
+        update_snapshot()
+        assert get_month(month=3)["assignments"][0]["name"] == "Blue Velvet"
+
+        ink_data.set([{**sample_inks[0], "name": "Blue Velvet II"}] + sample_inks[1:])
+        update_snapshot()
+        assert get_month(month=3)["assignments"][0]["name"] == "Blue Velvet II"
+
     def test_leap_year_february(self, sample_inks):
         """Test February in a leap year (2024)."""
         tools, _, _, _ = setup_tools(inks=sample_inks, year=2024)
@@ -246,6 +355,20 @@ class TestAssignInkToDate:
         # Verify reactive state was updated
         assert session_reactive.get()["2026-01-01"] == "macro:macro_0"
 
+    def test_month_views_follow_moves_between_months(self, sample_inks):
+        """Month lookups stay in sync when an assignment moves between months."""
+        tools, _, _, _ = setup_tools(inks=sample_inks, session={"2026-03-01": "macro:macro_0"})
+        assert tools["get_month_assignments"](month=3)["assigned_days"] == 1
+
+        tools["unassign_ink_from_date"](date_str="2026-03-01")
+        tools["assign_ink_to_date"](ink_identifier="Blue Velvet", date_str="2026-04-10")
+
+        assert tools["get_month_assignments"](month=3)["assigned_days"] == 0
+        april = tools["get_month_assignments"](month=4)
+        assert [a["date"] for a in april["assignments"]] == ["2026-04-10"]
+        summary = tools["get_current_assignments_summary"]()
+        assert [m["session_assignments"] for m in summary["monthly_summary"]][2:4] == [0, 1]
+
     def test_api_protected_date(self, sample_inks):
         """Test that API-protected dates cannot be assigned."""
         tools, _, _, _ = setup_tools(
@@ -271,6 +394,10 @@ class TestAssignInkToDate:
         )
 
         assert result["success"] is False
+        assert result["already_assigned"] is True
+        # The model is told which ink was rejected
+        assert result["ink_brand"] == "Diamine"
+        assert result["ink_name"] == "Blue Velvet"
 
     def test_ink_not_found(self, sample_inks):
         """Test with ink that doesn't exist."""
@@ -469,6 +596,7 @@ class TestUnassignInkFromDate:
         result = tools["unassign_ink_from_date"](date_str="2026-01-15")
 
         assert result["success"] is False
+        assert result["ink_name"] == "Iroshizuku Kon-peki"
 
     def test_no_session_assignment(self, sample_inks):
         """Test unassigning date with no session assignment."""
@@ -550,6 +678,21 @@ class TestClearMonthAssignments:
         assert result["removed_count"] == 2
         assert result["protected_count"] == 1
 
+    def test_month_view_updated_after_clear(self, sample_inks):
+        """Month lookups after a clear see the new session state."""
+        tools, _, _, _ = setup_tools(
+            inks=sample_inks,
+            session={"2026-03-01": "macro:macro_0", "2026-04-01": "macro:macro_2"},
+            api={"2026-03-10": "macro:macro_1"}
+        )
+        assert tools["get_month_assignments"](month=3)["assigned_days"] == 2
+
+        tools["clear_month_assignments"](month=3)
+
+        march = tools["get_month_assignments"](month=3)
+        assert [a["date"] for a in march["assignments"]] == ["2026-03-10"]
+        assert tools["get_month_assignments"](month=4)["assigned_days"] == 1
+
 
 # =============================================================================
 # Tests for get_current_assignments_summary()
@@ -592,6 +735,19 @@ class TestGetCurrentAssignmentsSummary:
         assert jan["session_assignments"] == 1
         assert jan["assigned_days"] == 2
 
+    def test_session_entry_shadowed_by_api_counted_once(self, sample_inks):
+        """A session entry on an API date counts as one API assignment."""
+        tools, _, _, _ = setup_tools(
+            inks=sample_inks,
+            session={"2026-01-15": "macro:macro_0", "2025-01-02": "macro:macro_2"},
+            api={"2026-01-15": "macro:macro_1"}
+        )
+        result = tools["get_current_assignments_summary"]()
+
+        jan = result["monthly_summary"][0]
+        assert (jan["api_assignments"], jan["session_assignments"], jan["assigned_days"]) == (1, 0, 1)
+        assert result["total_assigned_days"] == 1
+
     def test_leap_year(self, sample_inks):
         """Test leap year has correct total days."""
         tools, _, _, _ = setup_tools(inks=sample_inks, year=2024)
@@ -695,6 +851,19 @@ class TestFindAvailableInksForTheme:
         assert result["success"] is True
         assert result["matches_returned"] == 2
 
+    def test_null_cluster_tags(self, sample_inks):
+        """An ink whose cluster_tags is null should not break theme search."""
+        inks = [dict(sample_inks[0], cluster_tags=None)] + sample_inks[1:]
+        tools, _, _, _ = setup_tools(inks=inks)
+
+        result = tools["find_available_inks_for_theme"](query="Velvet")
+        assert result["success"] is True
+        assert result["matches_returned"] == 1
+
+        result = tools["find_available_inks_for_theme"](color="blue")
+        assert result["success"] is True
+        assert result["matches_returned"] == 1  # Kon-peki only
+
     def test_limit_parameter(self, sample_inks):
         """Test limit parameter."""
         tools, _, _, _ = setup_tools(inks=sample_inks)
@@ -717,6 +886,43 @@ class TestFindAvailableInksForTheme:
         assert summary["session_assigned"] == 1
         assert summary["api_assigned_immovable"] == 1
 
+    def test_collection_summary_counts_past_limit(self, sample_inks):
+        """Summary counts cover the whole collection even when limit is hit."""
+        tools, _, _, _ = setup_tools(
+            inks=sample_inks,
+            session={"2026-01-01": "macro:macro_3"},
+            api={"2026-01-15": "macro:macro_4"}
+        )
+        result = tools["find_available_inks_for_theme"](limit=1)
+
+        assert result["matches_returned"] == 1
+        summary = result["collection_summary"]
+        assert (summary["unassigned"], summary["session_assigned"], summary["api_assigned_immovable"]) == (3, 1, 1)
+
+    def test_archived_skipped_and_filters_normalized(self):
+        """Archived inks are skipped; brand and tag filters ignore case and curly quotes."""
+        inks = [
+            {"macro_cluster_id": "m0", "brand_name": "Van Dieman\u2019s", "name": "Old", "cluster_tags": ["Teal"], "archived": True},
+            {"macro_cluster_id": "m1", "brand_name": "Van Dieman's", "name": "Tide", "cluster_tags": ["Dark Teal"]},
+            {"macro_cluster_id": "m2", "brand_name": "Diamine", "name": "Marine", "cluster_tags": ["Teal"]},
+        ]
+        tools, _, _, _ = setup_tools(inks=inks)
+        result = tools["find_available_inks_for_theme"](brand="van dieman\u2019s", color="TEAL")
+
+        assert result["collection_summary"]["total_inks"] == 2
+        assert [i["name"] for i in result["available_inks"]] == ["Tide"]
+
+    def test_query_matches_private_comment_case_insensitively(self):
+        """Query text found only in private_comment still matches, ignoring case."""
+        inks = [
+            {"macro_cluster_id": "m0", "brand_name": "Diamine", "name": "Marine", "cluster_tags": [], "private_comment": "Great for Autumn letters"},
+            {"macro_cluster_id": "m1", "brand_name": "Diamine", "name": "Oxblood", "cluster_tags": [], "private_comment": None},
+        ]
+        tools, _, _, _ = setup_tools(inks=inks)
+        result = tools["find_available_inks_for_theme"](query="AUTUMN")
+
+        assert [i["name"] for i in result["available_inks"]] == ["Marine"]
+
 
 # =============================================================================
 # Tests for set_month_theme()
@@ -859,6 +1065,14 @@ class TestClearMonthTheme:
         assert result["success"] is True
         assert "No theme was set" in result["message"]
 
+    def test_nonexistent_theme_leaves_themes_untouched(self, sample_inks):
+        """Clearing a month with no theme does not write a new themes dict."""
+        themes = {"2026-02": {"theme": "Blues", "description": ""}}
+        tools, _, _, themes_reactive = setup_tools(inks=sample_inks, themes=themes)
+        tools["clear_month_theme"](month=1)
+
+        assert themes_reactive.get() is themes
+
     def test_clear_existing_theme(self, sample_inks):
         """Test clearing existing theme."""
         tools, _, _, themes_reactive = setup_tools(
@@ -1009,5 +1223,113 @@ class TestShuffleMonth:
         assert "session" in result["note"].lower()
 
 
+# =============================================================================
+# Tests for as_async_tool()
+# =============================================================================
+
+class TestAsAsyncTool:
+    """Tests for the coroutine wrapper used when registering tools."""
+
+    def test_preserves_tool_metadata(self, sample_inks):
+        """Name, docstring and signature are what the LLM schema is built from."""
+        tools, _, _, _ = setup_tools(inks=sample_inks)
+        wrapped = as_async_tool(tools["search_inks"])
+
+        assert inspect.iscoroutinefunction(wrapped)
+        assert wrapped.__name__ == "search_inks"
+        assert wrapped.__doc__ == tools["search_inks"].__doc__
+        assert inspect.signature(wrapped) == inspect.signature(tools["search_inks"])
+
+    def test_awaiting_runs_tool_and_updates_state(self, sample_inks):
+        """Awaiting the wrapper runs the tool body against the same state."""
+        tools, _, session_reactive, _ = setup_tools(inks=sample_inks)
+        assign = as_async_tool(tools["assign_ink_to_date"])
+
+        result = asyncio.run(assign(ink_identifier="Blue Velvet", date_str="2026-01-01"))
+
+        assert result["success"] is True
+        assert session_reactive.get() == {"2026-01-01": "macro:macro_0"}
+
+
+# =============================================================================
+# Tests for batch_writes()
+# =============================================================================
+
+class CountingReactive(MockReactive):
+    """MockReactive that records every value it is set to."""
+
+    def __init__(self, initial_value):
+        super().__init__(initial_value)
+        self.history = []
+
+    def set(self, value):
+        self.history.append(value)
+        super().set(value)
+
+
+class TestBatchWrites:
+    """Tests for deferring reactive updates across several tool calls."""
+
+    def _setup(self, inks):
+        session_reactive = CountingReactive({})
+        themes_reactive = CountingReactive({})
+        tools_list, update_snapshot = create_tool_functions(
+            MockReactive(inks), MockReactive(2026), session_reactive, MockReactive({}), themes_reactive
+        )
+        update_snapshot()
+        return {f.__name__: f for f in tools_list}, update_snapshot, session_reactive, themes_reactive
+
+    def test_writes_publish_once_on_exit(self, sample_inks):
+        """Several writes set each reactive once, with the final state."""
+        tools, update_snapshot, session_reactive, themes_reactive = self._setup(sample_inks)
+
+        with update_snapshot.batch_writes():
+            tools["assign_ink_to_date"]("Blue Velvet", "2026-01-01")
+            tools["assign_ink_to_date"]("Oxblood", "2026-01-02")
+            tools["unassign_ink_from_date"]("2026-01-01")
+            tools["set_month_theme"](1, "Reds", year=2026)
+            # Later calls in the batch see earlier writes
+            assert tools["get_month_assignments"](1, 2026)["assigned_days"] == 1
+            assert session_reactive.history == []
+            assert themes_reactive.history == []
+
+        assert session_reactive.history == [{"2026-01-02": "macro:macro_4"}]
+        assert list(themes_reactive.history[0]) == ["2026-01"]
+        assert len(themes_reactive.history) == 1
+
+    def test_nested_batches_publish_at_outermost_exit(self, sample_inks):
+        """Only the outermost batch publishes."""
+        tools, update_snapshot, session_reactive, _ = self._setup(sample_inks)
+
+        with update_snapshot.batch_writes():
+            with update_snapshot.batch_writes():
+                tools["assign_ink_to_date"]("Blue Velvet", "2026-01-01")
+            assert session_reactive.history == []
+
+        assert len(session_reactive.history) == 1
+
+    def test_error_still_publishes_and_snapshot_refresh_keeps_writes(self, sample_inks):
+        """Pending writes survive a snapshot refresh and are published on error."""
+        tools, update_snapshot, session_reactive, _ = self._setup(sample_inks)
+
+        with pytest.raises(RuntimeError):
+            with update_snapshot.batch_writes():
+                tools["assign_ink_to_date"]("Blue Velvet", "2026-01-01")
+                update_snapshot()
+                raise RuntimeError("stream cancelled")
+
+        assert session_reactive.history == [{"2026-01-01": "macro:macro_0"}]
+
+    def test_batch_without_writes_sets_nothing(self, sample_inks):
+        """Read-only turns leave the reactive values untouched."""
+        tools, update_snapshot, session_reactive, themes_reactive = self._setup(sample_inks)
+
+        with update_snapshot.batch_writes():
+            tools["search_inks"]("blue")
+
+        assert session_reactive.history == []
+        assert themes_reactive.history == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -469,6 +469,25 @@ class TestRenderInkCollectionView:
         html = str(result)
         assert "ink_date_0" in html  # Date picker for first ink
 
+    def test_status_filter_uses_assignment_source(self, sample_inks):
+        """Status filter keeps only inks whose date comes from that source."""
+        session = {"2026-01-15": "macro:macro_0"}
+        api = {"2026-01-16": "macro:macro_1"}
+        result = render_ink_collection_view(
+            inks=sample_inks,
+            daily_assignments={**session, **api},
+            session_assignments=session,
+            api_assignments=api,
+            year=2026,
+            search_query="",
+            status_filter=["session"],
+            ink_swatch_fn=mock_ink_swatch_fn
+        )
+        html = str(result)
+        assert "ink_save_0" in html
+        assert "ink_api_delete_1" not in html
+        assert "ink_date_2" not in html
+
 
 # =============================================================================
 # Tests for render_month_assignment_summary()
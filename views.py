@@ -5,11 +5,16 @@ These functions take data as parameters and return Shiny UI elements.
 They contain no reactive logic - that stays in app.py.
 """
 from datetime import datetime
-from calendar import monthrange
+from calendar import day_abbr, month_abbr, monthrange
 from shiny import ui
 
-from app_helpers import get_month_dates, make_button_id, prepare_month_cells
-from assignment_logic import find_ink_by_macro_cluster_id, normalize_apostrophes, parse_ink_identifier
+from app_helpers import format_date_label, get_month_dates, make_button_id, prepare_month_cells
+from assignment_logic import (
+    build_identifier_lookup,
+    group_assignments_by_month,
+    normalize_apostrophes,
+    parse_ink_identifier,
+)
 
 
 # =============================================================================
@@ -47,6 +52,36 @@ FPC_LINK_SVG = '''<svg xmlns="http://www.w3.org/2000/svg" width="12" height="12"
 # FPC base URL for cluster pages
 FPC_CLUSTER_URL = "https://www.fountainpencompanion.com/inks"
 
+# Static list view markup, emitted as pre-joined HTML instead of nested tag objects
+LIST_HEADER_HTML = (
+    '<div class="list-header-row">'
+    '<div class="list-col-date">Date</div>'
+    '<div class="list-col-color">Color</div>'
+    '<div class="list-col-brand">Brand</div>'
+    '<div class="list-col-name">Name</div>'
+    '<div class="list-col-actions">Actions</div>'
+    '</div>'
+)
+
+LIST_UNASSIGNED_CELLS_HTML = (
+    '<div class="list-swatch-col"></div>'
+    '<div class="list-brand-col"></div>'
+    '<div class="list-unassigned-name-col">'
+    '<span class="list-unassigned-text">Unassigned</span>'
+    '</div>'
+)
+
+LIST_DATE_COL_TEMPLATE = '<div class="list-date-col"><strong>{label}</strong></div>'
+
+# Static calendar markup shared across renders
+CALENDAR_HEADER_HTML = (
+    '<div class="calendar-header">'
+    + "".join(f'<div class="calendar-weekday">{day}</div>' for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+    + '</div>'
+)
+
+CALENDAR_EMPTY_CELL = ui.HTML('<div class="calendar-cell-empty"></div>')
+
 
 # =============================================================================
 # Calendar View
@@ -79,26 +114,23 @@ def render_calendar_view(
     if not inks:
         return ui.p("No inks loaded. Please fetch your collection first.")
 
-    num_days = monthrange(year, month)[1]
     first_weekday = datetime(year, month, 1).weekday()
 
-    # Build calendar grid
-    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-
     # Header row
-    header = ui.div(
-        *[ui.div(day, class_="calendar-weekday") for day in weekdays],
-        class_="calendar-header"
-    )
+    header = ui.HTML(CALENDAR_HEADER_HTML)
 
     # Calendar days - empty divs for grid cells before first day
-    cells = [ui.div(class_="calendar-cell-empty") for _ in range(first_weekday)]
+    cells = [CALENDAR_EMPTY_CELL] * first_weekday
+
+    # Resolve identifiers through one lookup per render rather than scanning
+    # the ink list for each assigned day
+    ink_lookup = build_identifier_lookup(inks)
 
-    for day in range(1, num_days + 1):
-        date_str = f"{year}-{month:02d}-{day:02d}"
+    # Cached date strings keep their computed hash across renders
+    for day, date_str in enumerate(get_month_dates(year, month), start=1):
         macro_cluster_id = daily_assignments.get(date_str)
 
-        result = find_ink_by_macro_cluster_id(macro_cluster_id, inks) if macro_cluster_id else None
+        result = ink_lookup.get(macro_cluster_id) if macro_cluster_id else None
         if result:
             ink_idx, ink = result
             cell_content = _render_calendar_cell_with_ink(
@@ -117,8 +149,7 @@ def render_calendar_view(
         cells.append(cell_content)
 
     # Fill remaining cells with empty divs
-    while len(cells) % 7 != 0:
-        cells.append(ui.div(class_="calendar-cell-empty"))
+    cells.extend([CALENDAR_EMPTY_CELL] * (-len(cells) % 7))
 
     calendar_grid = ui.div(*cells, class_="calendar-grid")
 
@@ -246,33 +277,30 @@ def render_list_view(
         return ui.p("No inks loaded. Please fetch your collection first.")
 
     # Table header
-    header_row = ui.div(
-        ui.div("Date", class_="list-col-date"),
-        ui.div("Color", class_="list-col-color"),
-        ui.div("Brand", class_="list-col-brand"),
-        ui.div("Name", class_="list-col-name"),
-        ui.div("Actions", class_="list-col-actions"),
-        class_="list-header-row"
-    )
+    header_row = ui.HTML(LIST_HEADER_HTML)
 
     rows = []
-    num_days = monthrange(year, month)[1]
 
-    for day in range(1, num_days + 1):
-        date_str = f"{year}-{month:02d}-{day:02d}"
-        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    # Cached date strings keep their computed hash across renders; labels are
+    # built from year/month/day directly rather than via strptime/strftime
+    month_label = month_abbr[month]
+    # Resolve identifiers through one lookup per render rather than scanning
+    # the ink list for each assigned day
+    ink_lookup = build_identifier_lookup(inks)
+    # Weekdays follow from the month's first weekday, so empty rows are built
+    # from the date string and day alone; only ink rows need a datetime
+    first_weekday = monthrange(year, month)[0]
+    for day, date_str in enumerate(get_month_dates(year, month), start=1):
         macro_cluster_id = daily_assignments.get(date_str)
 
-        date_col = ui.div(
-            ui.strong(date_obj.strftime("%a, %b %d")),
-            class_="list-date-col"
-        )
+        label = f"{day_abbr[(first_weekday + day - 1) % 7]}, {month_label} {day:02d}"
+        date_col = ui.HTML(LIST_DATE_COL_TEMPLATE.format(label=label))
 
-        result = find_ink_by_macro_cluster_id(macro_cluster_id, inks) if macro_cluster_id else None
+        result = ink_lookup.get(macro_cluster_id) if macro_cluster_id else None
         if result:
             _, ink = result
             row = _render_list_row_with_ink(
-                date_str, date_obj, date_col,
+                date_str, datetime(year, month, day), date_col,
                 ink, macro_cluster_id,
                 session_assignments, api_assignments,
                 ink_swatch_fn
@@ -347,7 +375,7 @@ def _render_list_row_with_ink(
     elif is_api:
         trash_icon = ui.HTML(TRASH_ICON_SVG)
         action_col = ui.div(
-            ui.span(date_obj.strftime("%b %d, %Y"), class_="api-date-display"),
+            ui.span(format_date_label(date_str), class_="api-date-display"),
             ui.span("swatched", class_="api-badge"),
             ui.input_action_button(
                 make_button_id("api_delete", date_str),
@@ -383,12 +411,7 @@ def _render_list_row_unassigned(date_str: str, date_col):
 
     return ui.div(
         date_col,
-        ui.div(class_="list-swatch-col"),
-        ui.div(class_="list-brand-col"),
-        ui.div(
-            ui.span("Unassigned", class_="list-unassigned-text"),
-            class_="list-unassigned-name-col"
-        ),
+        ui.HTML(LIST_UNASSIGNED_CELLS_HTML),
         ui.div(assign_button, class_="list-actions-col"),
         class_="list-row-unassigned"
     )
@@ -434,16 +457,12 @@ def render_ink_collection_view(
     # Build reverse lookup: macro_cluster_id -> assigned_date
     macro_id_to_date = {macro_id: date_str for date_str, macro_id in daily_assignments.items()}
 
-    # Build session macro_id lookup (session-only, not API)
-    session_macro_ids = set()
-    for date_str, macro_id in session_assignments.items():
-        if date_str not in api_assignments:
-            session_macro_ids.add(macro_id)
-
     # Filter inks by search query and status
     # Normalize apostrophes for consistency with LLM-generated queries
     query_lower = normalize_apostrophes(search_query).lower() if search_query else ""
     filtered_indices = []
+    # (identifier, assigned date) per kept ink, reused by the sort and rows
+    ink_state = {}
     for idx, ink in enumerate(inks):
         # Search filter
         if query_lower:
@@ -459,22 +478,22 @@ def render_ink_collection_view(
             ink_identifier = f"id:{ink.get('id', '')}"
 
         current_date = macro_id_to_date.get(ink_identifier)
-        is_session = ink_identifier in session_macro_ids
-        is_api = current_date and current_date in api_assignments
 
-        # Determine status category
-        if is_api:
+        # Determine status category; the merged view already says which
+        # side holds the date, so no separate session id set is needed
+        if current_date is None:
+            status = "unassigned"
+        elif current_date in api_assignments:
             status = "api"
-        elif is_session:
-            status = "session"
         else:
-            status = "unassigned"
+            status = "session"
 
         # Apply status filter
         if status not in status_filter:
             continue
 
         filtered_indices.append(idx)
+        ink_state[idx] = (ink_identifier, current_date)
 
     # Sort filtered indices
     def get_sort_key(idx: int):
@@ -488,11 +507,7 @@ def render_ink_collection_view(
             return ink.get("name", "").lower()
         elif sort_field == "date":
             # Get assigned date for this ink
-            if ink.get("macro_cluster_id"):
-                ink_id = f"macro:{ink['macro_cluster_id']}"
-            else:
-                ink_id = f"id:{ink.get('id', '')}"
-            assigned_date = macro_id_to_date.get(ink_id, "")
+            assigned_date = ink_state[idx][1]
             # Unassigned inks sort last (or first if desc)
             return assigned_date if assigned_date else ("9999" if sort_direction == "asc" else "0000")
         return ""
@@ -529,11 +544,7 @@ def render_ink_collection_view(
     rows = []
     for idx in filtered_indices:
         ink = inks[idx]
-        if ink.get("macro_cluster_id"):
-            ink_identifier = f"macro:{ink['macro_cluster_id']}"
-        else:
-            ink_identifier = f"id:{ink.get('id', '')}"
-        current_date = macro_id_to_date.get(ink_identifier)
+        ink_identifier, current_date = ink_state[idx]
         is_api_assigned = current_date and current_date in api_assignments
 
         row = _render_ink_collection_row(
@@ -584,7 +595,6 @@ def _render_ink_collection_row(
     # Actions and Date columns
     if is_api_assigned:
         # API assigned - trash button only
-        date_obj = datetime.strptime(current_date, "%Y-%m-%d")
         trash_icon = ui.HTML(TRASH_ICON_SVG)
         actions_col = ui.div(
             ui.input_action_button(
@@ -596,13 +606,12 @@ def _render_ink_collection_row(
             class_="ink-actions-col"
         )
         date_col = ui.div(
-            ui.span(date_obj.strftime("%b %d, %Y"), class_="ink-date-display"),
+            ui.span(format_date_label(current_date), class_="ink-date-display"),
             class_="ink-date-col"
         )
         row_class = "ink-row ink-row-api"
     elif current_date:
         # Session assigned - assign/unassign buttons
-        date_obj = datetime.strptime(current_date, "%Y-%m-%d")
         actions_col = ui.div(
             ui.input_action_button(
                 f"ink_save_{idx}",
@@ -619,7 +628,7 @@ def _render_ink_collection_row(
             class_="ink-actions-col"
         )
         date_col = ui.div(
-            ui.input_date(f"ink_date_{idx}", "", value=date_obj.date()),
+            ui.input_date(f"ink_date_{idx}", "", value=current_date),
             class_="ink-date-col"
         )
         row_class = "ink-row ink-row-session"
@@ -662,8 +671,6 @@ def render_month_assignment_summary(
     Returns:
         Shiny UI element with summary table
     """
-    from assignment_logic import get_month_summary
-
     if not inks:
         return ui.p("No inks loaded.")
 
@@ -682,9 +689,11 @@ def render_month_assignment_summary(
         "July", "August", "September", "October", "November", "December"
     ]
 
+    # One pass over the assignments instead of rescanning them for each month
+    by_month = group_assignments_by_month(daily_assignments, year)
+
     for month_num in range(1, 13):
-        # get_month_summary returns list of ink indices for that month
-        ink_indices = get_month_summary(daily_assignments, year, month_num)
+        ink_indices = by_month[month_num]
         assigned = len(ink_indices)
         total = monthrange(year, month_num)[1]
         coverage = f"{(assigned / total * 100):.0f}%" if total > 0 else "0%"